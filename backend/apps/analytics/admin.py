@@ -9,6 +9,7 @@ from .models import BlogView, DailyAnalytics, MonthlyAnalytics, ContactSubmissio
 @admin.register(BlogView)
 class BlogViewAdmin(admin.ModelAdmin):
     list_display = ['blog', 'user', 'device_type', 'browser', 'viewed_at']
+    list_select_related = ['blog', 'user']
     list_filter = ['device_type', 'browser', 'operating_system', 'viewed_at']
     search_fields = ['blog__title', 'user__username', 'ip_address']
     date_hierarchy = 'viewed_at'
@@ -0,0 +1,25 @@
+"""
+Microbenchmarks for analytics.
+User-Agent parsing done for every tracked blog view.
+"""
+
+from apps.core import load_data
+from apps.core.microbench import benchmark
+
+from .tasks import parse_user_agent
+
+BOT_AGENTS = [
+    'Mozilla/5.0 (compatible; Googlebot/2.1; +http://www.google.com/bot.html)',
+    'curl/8.4.0',
+    '',
+]
+
+
+@benchmark('analytics.parse_user_agent', cases=('browsers', 'bots'))
+def parse_agents(kind):
+    agents = [agent for _, agent, *_ in load_data.USER_AGENTS] if kind == 'browsers' else BOT_AGENTS
+
+    def parse_all():
+        for agent in agents:
+            parse_user_agent(agent)
+    return parse_all
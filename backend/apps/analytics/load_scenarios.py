@@ -0,0 +1,17 @@
+"""
+Load-test scenarios for analytics.
+Admin dashboards.
+"""
+
+from apps.core.load_test import scenario
+
+
+@scenario(weight=2)
+async def admin_dashboard(session):
+    if not await session.ensure_login('admin'):
+        return
+    await session.get('/api/analytics/dashboard/', 'analytics:dashboard')
+    await session.get('/api/analytics/daily/', 'analytics:daily')
+    await session.get('/api/analytics/views/', 'analytics:views', params={'page': session.rng.randint(1, 3)})
+    await session.get('/api/users/admin/stats/', 'users:admin-stats')
+    await session.get('/api/analytics/admin/contacts/stats/', 'analytics:contact-stats')
@@ -11,9 +11,49 @@ from django.conf import settings
 from datetime import timedelta
 import logging
 
+from apps.core.db_router import replica_reads
+
 logger = logging.getLogger(__name__)
 
 
+def parse_user_agent(user_agent):
+    """Rough (device_type, browser, operating_system) from a User-Agent string."""
+    device_type = 'desktop'
+    browser = ''
+    operating_system = ''
+    
+    if user_agent:
+        ua_lower = user_agent.lower()
+        if 'mobile' in ua_lower or 'android' in ua_lower or 'iphone' in ua_lower:
+            device_type = 'mobile'
+        elif 'tablet' in ua_lower or 'ipad' in ua_lower:
+            device_type = 'tablet'
+        
+        # Simple browser detection
+        if 'chrome' in ua_lower:
+            browser = 'Chrome'
+        elif 'firefox' in ua_lower:
+            browser = 'Firefox'
+        elif 'safari' in ua_lower:
+            browser = 'Safari'
+        elif 'edge' in ua_lower:
+            browser = 'Edge'
+        
+        # Simple OS detection
+        if 'windows' in ua_lower:
+            operating_system = 'Windows'
+        elif 'mac' in ua_lower:
+            operating_system = 'MacOS'
+        elif 'linux' in ua_lower:
+            operating_system = 'Linux'
+        elif 'android' in ua_lower:
+            operating_system = 'Android'
+        elif 'ios' in ua_lower or 'iphone' in ua_lower:
+            operating_system = 'iOS'
+    
+    return device_type, browser, operating_system
+
+
 @shared_task(bind=True, max_retries=3)
 def track_blog_view(self, blog_id, user_id=None, ip_address=None, user_agent=''):
     """
@@ -26,39 +66,7 @@ def track_blog_view(self, blog_id, user_id=None, ip_address=None, user_agent='')
         
         blog = Blog.objects.get(id=blog_id)
         
-        # Parse user agent for device info
-        device_type = 'desktop'
-        browser = ''
-        operating_system = ''
-        
-        if user_agent:
-            ua_lower = user_agent.lower()
-            if 'mobile' in ua_lower or 'android' in ua_lower or 'iphone' in ua_lower:
-                device_type = 'mobile'
-            elif 'tablet' in ua_lower or 'ipad' in ua_lower:
-                device_type = 'tablet'
-            
-            # Simple browser detection
-            if 'chrome' in ua_lower:
-                browser = 'Chrome'
-            elif 'firefox' in ua_lower:
-                browser = 'Firefox'
-            elif 'safari' in ua_lower:
-                browser = 'Safari'
-            elif 'edge' in ua_lower:
-                browser = 'Edge'
-            
-            # Simple OS detection
-            if 'windows' in ua_lower:
-                operating_system = 'Windows'
-            elif 'mac' in ua_lower:
-                operating_system = 'MacOS'
-            elif 'linux' in ua_lower:
-                operating_system = 'Linux'
-            elif 'android' in ua_lower:
-                operating_system = 'Android'
-            elif 'ios' in ua_lower or 'iphone' in ua_lower:
-                operating_system = 'iOS'
+        device_type, browser, operating_system = parse_user_agent(user_agent)
         
         BlogView.objects.create(
             blog=blog,
@@ -78,11 +86,34 @@ def track_blog_view(self, blog_id, user_id=None, ip_address=None, user_agent='')
         self.retry(exc=exc, countdown=60)
 
 
+def record_blog_views(views):
+    """
+    Serialized-writer handler: BlogView rows for the SQLite write queue.
+    Each view is a dict of track_blog_view's arguments.
+    """
+    from apps.analytics.models import BlogView
+    
+    rows = []
+    for view in views:
+        device_type, browser, operating_system = parse_user_agent(view['user_agent'])
+        rows.append(BlogView(
+            blog_id=view['blog_id'],
+            user_id=view['user_id'],
+            ip_address=view['ip_address'],
+            user_agent=view['user_agent'],
+            device_type=device_type,
+            browser=browser,
+            operating_system=operating_system,
+        ))
+    BlogView.objects.bulk_create(rows)
+
+
 @shared_task
+@replica_reads()
 def generate_daily_analytics():
     """
     Generate daily analytics aggregation.
-    Run via Celery Beat at midnight.
+    Run via Celery Beat at midnight. Aggregates are read from a replica.
     """
     try:
         from apps.analytics.models import DailyAnalytics, BlogView
@@ -180,6 +211,7 @@ def cleanup_old_analytics():
 
 
 @shared_task
+@replica_reads()
 def send_weekly_engagement_report():
     """
     Send weekly engagement report to admins.
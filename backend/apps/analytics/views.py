@@ -33,6 +33,7 @@ class ContactSubmitView(generics.CreateAPIView):
     """
     permission_classes = [AllowAny]
     serializer_class = ContactSubmissionCreateSerializer
+    throttle_scope = 'contact'
     
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
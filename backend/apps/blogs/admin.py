@@ -11,6 +11,10 @@ class CategoryAdmin(admin.ModelAdmin):
     list_display = ['name', 'slug', 'blog_count', 'created_at']
     search_fields = ['name', 'description']
     prepopulated_fields = {'slug': ('name',)}
+    
+    def get_queryset(self, request):
+        # blog_count reads the annotation instead of querying per row
+        return Category.objects.with_blog_counts()
 
 
 @admin.register(Tag)
@@ -23,6 +27,7 @@ class TagAdmin(admin.ModelAdmin):
 @admin.register(Blog)
 class BlogAdmin(admin.ModelAdmin):
     list_display = ['title', 'author', 'category', 'status', 'is_featured', 'view_count', 'published_at']
+    list_select_related = ['author', 'category']
     list_filter = ['status', 'is_featured', 'category', 'created_at', 'published_at']
     search_fields = ['title', 'excerpt', 'content', 'author__username', 'author__email']
     prepopulated_fields = {'slug': ('title',)}
@@ -5,3 +5,6 @@ class BlogsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.blogs'
     verbose_name = 'Blog Management'
+
+    def ready(self):
+        import apps.blogs.signals  # noqa
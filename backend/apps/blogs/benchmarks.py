@@ -0,0 +1,129 @@
+"""
+Microbenchmarks for blogs.
+Content sanitizing, slug generation, the nested blog serializers and
+JSON rendering of a list page.
+"""
+
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+from django.utils.text import slugify
+from rest_framework.renderers import JSONRenderer
+
+from apps.core.microbench import COMMENT_SIZES, CORPUS_SIZES, benchmark, comment_text, post_html
+from apps.core.renderers import FastJSONRenderer
+from apps.users.models import User
+
+from .models import Blog, BlogComment, BlogStatus, Category, Tag, sanitize_blog_content, sanitize_comment_content
+from .serializers import AdminBlogSerializer, BlogCommentSerializer, BlogListSerializer, BlogPublicListSerializer
+
+TITLES = {
+    'ascii': 'How We Cut p99 Latency in Half: Lessons From 10 Years of Query Tuning',
+    'unicode': 'Café Naïveté: Ünïcödé Títles — Ça Marche Très Bien, Señor Ñandú',
+}
+FIXED_TIME = datetime(2024, 1, 15, 12, 0, tzinfo=timezone.utc)
+
+
+@benchmark('blogs.sanitize_content', cases=CORPUS_SIZES)
+def sanitize_content(size):
+    html = post_html(size)
+    return lambda: sanitize_blog_content(html)
+
+
+@benchmark('blogs.sanitize_comment', cases=COMMENT_SIZES)
+def sanitize_comment(size):
+    text = comment_text(size)
+    return lambda: sanitize_comment_content(text)
+
+
+@benchmark('blogs.slugify', cases=TITLES)
+def slugify_title(kind):
+    title = TITLES[kind]
+    return lambda: slugify(title)
+
+
+# ============================================================
+# Serializers (unsaved instances with prefetched relations)
+# ============================================================
+
+def _prefetched(model, objs):
+    queryset = model.objects.all()
+    queryset._result_cache = list(objs)
+    queryset._prefetch_done = True
+    return queryset
+
+
+def _author(index):
+    return User(id=index, username=f'author{index}', first_name='Ada', last_name='Lovelace',
+                position='Software Engineer')
+
+
+def _blog(index, content, comments=()):
+    tags = [Tag(id=tag_id, name=f'tag{tag_id}', slug=f'tag{tag_id}') for tag_id in range(1, 4)]
+    blog = Blog(
+        id=index, title=TITLES['ascii'], slug=f'post-{index}', excerpt=content[:300],
+        content=content, author=_author(index), status=BlogStatus.PUBLISHED, view_count=index * 7,
+        # CategorySerializer.blog_count is a query per row, so posts stay uncategorized here
+        category=None, created_at=FIXED_TIME, updated_at=FIXED_TIME, published_at=FIXED_TIME,
+    )
+    blog._prefetched_objects_cache = {
+        'tags': _prefetched(Tag, tags),
+        'comments': _prefetched(BlogComment, comments),
+    }
+    return blog
+
+
+@benchmark('blogs.serialize_public_list', cases=(10, 100))
+def serialize_public_list(rows):
+    blogs = [_blog(index, post_html('small')) for index in range(1, rows + 1)]
+    return lambda: BlogPublicListSerializer(blogs, many=True).data
+
+
+@benchmark('blogs.serialize_admin_blog', cases=CORPUS_SIZES)
+def serialize_admin_blog(size):
+    blog = _blog(1, post_html(size))
+    return lambda: AdminBlogSerializer(blog).data
+
+
+@benchmark('blogs.serialize_comments', cases=(20,))
+def serialize_comments(count):
+    comments = []
+    for index in range(1, count + 1):
+        comment = BlogComment(id=index, blog_id=1, author=_author(index), content=comment_text('typical'),
+                              created_at=FIXED_TIME, updated_at=FIXED_TIME)
+        # Leaf comments: replies would be fetched with a fresh query
+        comment._prefetched_objects_cache = {'replies': _prefetched(BlogComment, [])}
+        comments.append(comment)
+    return lambda: BlogCommentSerializer(comments, many=True).data
+
+
+# ============================================================
+# JSON rendering
+# ============================================================
+
+RENDERERS = {'stdlib': JSONRenderer, 'fast': FastJSONRenderer}
+
+
+class _ListSerializer(BlogListSerializer):
+    # comment_count is a query per row; only the payload shape matters here
+    def get_comment_count(self, obj):
+        return obj.id % 13
+
+
+@benchmark('blogs.render_list_page', cases=RENDERERS)
+def render_list_page(renderer):
+    category = Category(id=1, name='Engineering', slug='engineering', description='Posts about building things',
+                        created_at=FIXED_TIME)
+    category.published_blog_count = 100
+    blogs = [_blog(index, post_html('small')) for index in range(1, 101)]
+    for blog in blogs:
+        blog.category = category
+    # A 100-item page as PageNumberPagination returns it; only encoding is timed
+    page = OrderedDict([
+        ('count', 5000),
+        ('next', 'http://localhost:8000/api/blogs/?page=2'),
+        ('previous', None),
+        ('results', _ListSerializer(blogs, many=True).data),
+    ])
+    render = RENDERERS[renderer]().render
+    return lambda: render(page, 'application/json', {})
@@ -0,0 +1,109 @@
+"""
+Blog detail read model.
+Builds BlogDocument rows from BlogDetailSerializer and works out which
+documents a change affects, so the detail view can serve a published
+blog with a single lookup.
+"""
+
+import logging
+
+from django.db import transaction
+from django.db.models import Q
+
+from .models import Blog, BlogComment, BlogDocument, BlogStatus
+from .serializers import RELATED_BLOGS, BlogDetailSerializer
+
+logger = logging.getLogger(__name__)
+
+
+def build_blog_documents(blog_ids):
+    """
+    Rebuild the documents for blog_ids and return {blog_id: payload}.
+    Blogs that are missing or no longer published lose their document.
+    The blogs are read with everything the serializer shows prefetched
+    (Blog.objects.for_detail()), so the query count does not depend on
+    the number of comments, and the documents are written in one upsert.
+    """
+    blogs = Blog.objects.for_detail().filter(id__in=blog_ids, status=BlogStatus.PUBLISHED)
+    
+    # Built without a request, so media URLs stay relative
+    documents = [
+        BlogDocument(blog=blog, slug=blog.slug, payload=BlogDetailSerializer(blog).data)
+        for blog in blogs
+    ]
+    stale = set(blog_ids) - {document.blog_id for document in documents}
+    with transaction.atomic():
+        if documents:
+            # A renamed blog may have freed its slug for another one
+            conflicts = Q()
+            for document in documents:
+                conflicts |= Q(slug=document.slug) & ~Q(blog_id=document.blog_id)
+            BlogDocument.objects.filter(conflicts).delete()
+            BlogDocument.objects.bulk_create(
+                documents,
+                update_conflicts=True,
+                unique_fields=['blog'],
+                update_fields=['slug', 'payload', 'built_at'],
+            )
+        if stale:
+            BlogDocument.objects.filter(blog_id__in=stale).delete()
+    return {document.blog_id: document.payload for document in documents}
+
+
+def related_candidates(category_id):
+    """
+    The published blogs that can appear in related_blogs for a blog in
+    category_id (None: uncategorized, which draws from every category).
+    Each blog lists the first RELATED_BLOGS of these other than itself, so
+    only the first RELATED_BLOGS + 1 are ever shown.
+    """
+    blogs = Blog.objects.filter(status=BlogStatus.PUBLISHED)
+    if category_id is not None:
+        blogs = blogs.filter(category_id=category_id)
+    return set(blogs.values_list('id', flat=True)[:RELATED_BLOGS + 1])
+
+
+def with_related(blog_ids):
+    """
+    blog_ids plus the published blogs whose related_blogs show one of them.
+    Blogs outside the first few of their category appear in no other
+    document, so changing them rebuilds nothing else.
+    """
+    blog_ids = set(blog_ids)
+    affected = set(blog_ids)
+    category_ids = set(Blog.objects.filter(
+        id__in=blog_ids,
+        category__isnull=False
+    ).values_list('category_id', flat=True))
+    published = Blog.objects.filter(status=BlogStatus.PUBLISHED)
+    for category_id in category_ids:
+        if related_candidates(category_id) & blog_ids:
+            affected.update(published.filter(category_id=category_id).values_list('id', flat=True))
+    if blog_ids and related_candidates(None) & blog_ids:
+        affected.update(published.filter(category__isnull=True).values_list('id', flat=True))
+    return affected
+
+
+def blogs_embedding_user(user_id):
+    """Blogs whose documents show this user as author or commenter."""
+    authored = Blog.objects.filter(author_id=user_id).values_list('id', flat=True)
+    commented = BlogComment.objects.filter(author_id=user_id).values_list('blog_id', flat=True)
+    return with_related(set(authored)) | set(commented)
+
+
+def schedule_rebuild(blog_ids):
+    """Rebuild the documents for blog_ids in the background once the transaction commits."""
+    blog_ids = sorted(set(blog_ids))
+    if not blog_ids:
+        return
+    
+    def enqueue():
+        from .tasks import rebuild_blog_documents
+        try:
+            rebuild_blog_documents.delay(blog_ids)
+        except Exception as exc:
+            # No broker (e.g. local development): rebuild in-process
+            logger.warning(f'Could not queue rebuild of {len(blog_ids)} blog documents: {exc}')
+            build_blog_documents(blog_ids)
+    
+    transaction.on_commit(enqueue)
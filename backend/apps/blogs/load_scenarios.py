@@ -0,0 +1,71 @@
+"""
+Load-test scenarios for blogs.
+Anonymous browsing, popular detail reads, search and comment posting.
+"""
+
+import math
+
+from django.conf import settings
+
+from apps.core import load_data
+from apps.core.load_test import pick_ranked, scenario, setup
+
+POPULAR_BLOGS = 2000
+
+
+@setup
+def blog_context(context):
+    from .models import Blog, BlogStatus, Category
+
+    published = Blog.objects.filter(status=BlogStatus.PUBLISHED)
+    # Most viewed first, so pick_ranked() concentrates reads on the head
+    context['blog_slugs'] = list(
+        published.order_by('-view_count', 'id').values_list('slug', flat=True)[:POPULAR_BLOGS]
+    )
+    context['blog_pages'] = max(1, math.ceil(published.count() / settings.REST_FRAMEWORK['PAGE_SIZE']))
+    context['category_slugs'] = list(Category.objects.values_list('slug', flat=True))
+
+
+@scenario(weight=30)
+async def browse_blogs(session):
+    rng = session.rng
+    if session.context['category_slugs'] and rng.random() < 0.3:
+        params = {'category__slug': rng.choice(session.context['category_slugs'])}
+    else:
+        # Most visitors stay on the first pages
+        params = {'page': min(int(rng.expovariate(0.7)) + 1, session.context['blog_pages'])}
+    await session.get('/api/blogs/', 'blogs:list', params=params)
+
+
+@scenario(weight=40)
+async def read_blog(session):
+    slugs = session.context['blog_slugs']
+    if not slugs:
+        return
+    slug = pick_ranked(session.rng, slugs, session.context['seed'])
+    await session.get(f'/api/blogs/{slug}/', 'blogs:detail')
+
+
+@scenario(weight=10)
+async def search_blogs(session):
+    await session.get('/api/blogs/', 'blogs:search', params={'q': session.rng.choice(load_data.WORDS)})
+
+
+@scenario(weight=5)
+async def landing_page(session):
+    await session.get('/api/blogs/featured/', 'blogs:featured')
+    await session.get('/api/blogs/tags/', 'blogs:tags')
+
+
+@scenario(weight=3)
+async def post_comment(session):
+    slugs = session.context['blog_slugs']
+    if not slugs or not await session.ensure_login('customer'):
+        return
+    slug = pick_ranked(session.rng, slugs, session.context['seed'])
+    response = await session.post(f'/api/blogs/{slug}/comments/', 'blogs:comment', json_body={
+        'content': load_data.sentence(session.rng, 5, 30),
+    })
+    if response is not None and response.status == 429:
+        # Comment throttles are per user; come back as someone else
+        session.logout()
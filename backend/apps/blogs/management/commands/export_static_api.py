@@ -0,0 +1,161 @@
+"""
+Export the public blog API as static, precompressed JSON.
+Usage: python manage.py export_static_api [--output static_api] [--base-url https://example.com] [--workers 4] [--full]
+
+Writes /api/blogs/ (every page), /api/blogs/<slug>/ for each published
+blog, and the featured, category and tag lists under --output. Later
+runs only re-render blogs changed since the previous export (their row
+or detail document updated) and remove unpublished ones; list pages are
+re-rendered but only rewritten when their content changed. Set
+SERVE_STATIC_API=True to serve the snapshot in place of the live
+endpoints (apps.blogs.middleware.StaticAPIMiddleware); it looks files up
+per request, so a running server picks up each export without a restart.
+Requests with a query string are left to the live views.
+"""
+
+import json
+import os
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.blogs import static_export
+from apps.blogs.models import Blog, BlogStatus
+from apps.core.db import reset_worker_connections
+
+STATE_FILE = '.export-state.json'
+
+
+class Command(BaseCommand):
+    help = 'Render the public blog API into precompressed static JSON files.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', default=settings.STATIC_API_ROOT, help='Export directory')
+        parser.add_argument('--base-url', default='http://localhost:8000',
+                            help='Origin used for absolute links and media URLs')
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+        parser.add_argument('--chunk-size', type=int, default=100, help='Blogs per worker task')
+        parser.add_argument('--full', action='store_true', help='Re-render every blog')
+
+    def handle(self, *args, **options):
+        output = Path(options['output'])
+        base_url = options['base_url'].rstrip('/')
+        state = self._read_state(output, options['full'])
+        started_at = timezone.now()
+        started = time.perf_counter()
+
+        published = set(Blog.objects.filter(status=BlogStatus.PUBLISHED).values_list('slug', flat=True))
+        changed = self._changed_blogs(state)
+        chunk = options['chunk_size']
+        detail_tasks = [
+            (static_export.export_blog_details, changed[start:start + chunk], str(output), base_url)
+            for start in range(0, len(changed), chunk)
+        ]
+        first_pages = [
+            (static_export.export_list_page, path, 1, str(output), base_url)
+            for path in static_export.LIST_PATHS
+        ]
+
+        page_counts = {}
+        with self._executor(options['workers']) as submit:
+            detail_futures = [submit(*task) for task in detail_tasks]
+            page_futures = [submit(*task) for task in first_pages]
+            written = 0
+            # Later pages can only be queued once the first page gives the count
+            for path, future in zip(static_export.LIST_PATHS, page_futures[:len(first_pages)]):
+                page_counts[path], count = self._result(future)
+                written += count
+                page_futures.extend(
+                    submit(static_export.export_list_page, path, page, str(output), base_url)
+                    for page in range(2, page_counts[path] + 1)
+                )
+            for future in page_futures[len(first_pages):]:
+                written += self._result(future)[1]
+            for future in detail_futures:
+                written += sum(count for _, count in self._result(future))
+
+        removed = [slug for slug in state.get('slugs', []) if slug not in published]
+        for slug in removed:
+            static_export.remove_json(output, f'/api/blogs/{slug}/')
+        # Lists shrink when blogs are unpublished
+        for path, old_count in state.get('pages', {}).items():
+            for page in range(page_counts.get(path, 0) + 1, old_count + 1):
+                static_export.remove_json(output, static_export.page_path(path, page))
+
+        self._write_state(output, {
+            'exported_at': started_at.isoformat(),
+            'base_url': base_url,
+            'slugs': sorted(published),
+            'pages': page_counts,
+        })
+        elapsed = time.perf_counter() - started
+        if static_export.brotli is None:
+            self.stderr.write(self.style.WARNING('brotli is not installed; only .gz files were written.'))
+        self.stdout.write(self.style.SUCCESS(
+            f'Exported to {output} in {elapsed:.1f}s: {len(changed)} blogs re-rendered, '
+            f'{len(removed)} removed, {written} files written.'
+        ))
+
+    # ------------------------------------------------------------
+    # Incremental state
+    # ------------------------------------------------------------
+
+    def _read_state(self, output, full):
+        if full:
+            return {}
+        try:
+            return json.loads((output / STATE_FILE).read_text())
+        except FileNotFoundError:
+            return {}
+
+    def _write_state(self, output, state):
+        static_export.write_file(output / STATE_FILE, json.dumps(state, indent=2).encode())
+
+    def _changed_blogs(self, state):
+        """Ids of published blogs to re-render: all on a first or --full export."""
+        blogs = Blog.objects.filter(status=BlogStatus.PUBLISHED)
+        if state.get('exported_at'):
+            since = datetime.fromisoformat(state['exported_at'])
+            # Comments and author edits rebuild the detail document without touching the blog row
+            blogs = blogs.filter(
+                Q(updated_at__gte=since) | Q(document__built_at__gte=since) | Q(document__isnull=True)
+            )
+        return list(blogs.order_by('id').values_list('id', flat=True))
+
+    # ------------------------------------------------------------
+    # Execution
+    # ------------------------------------------------------------
+
+    @contextmanager
+    def _executor(self, workers):
+        """Yields submit(func, *args) -> future, backed by a process pool unless workers is 1."""
+        if workers <= 1:
+            yield _run_inline
+            return
+        # Workers must not share the parent's database connections
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=workers, initializer=reset_worker_connections) as pool:
+            yield pool.submit
+
+    def _result(self, future):
+        try:
+            return future.result()
+        except static_export.ExportError as exc:
+            raise CommandError(str(exc))
+
+
+def _run_inline(func, *args):
+    future = Future()
+    try:
+        future.set_result(func(*args))
+    except Exception as exc:
+        future.set_exception(exc)
+    return future
@@ -0,0 +1,27 @@
+"""
+Rebuild the blog detail read model.
+Usage: python manage.py rebuild_blog_documents [--batch-size 200]
+
+Builds a document for every published blog and drops documents of blogs
+that are no longer published; run after deploying or restoring data.
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.blogs.documents import build_blog_documents
+from apps.blogs.models import Blog, BlogDocument, BlogStatus
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the pre-rendered detail documents of all published blogs.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=200)
+
+    def handle(self, *args, **options):
+        blog_ids = list(Blog.objects.filter(status=BlogStatus.PUBLISHED).values_list('id', flat=True))
+        stale = BlogDocument.objects.exclude(blog_id__in=blog_ids).delete()[0]
+        built = 0
+        for start in range(0, len(blog_ids), options['batch_size']):
+            built += len(build_blog_documents(blog_ids[start:start + options['batch_size']]))
+        self.stdout.write(self.style.SUCCESS(f'Built {built} blog documents, removed {stale} stale ones.'))
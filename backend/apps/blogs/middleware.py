@@ -0,0 +1,75 @@
+"""
+Middleware for Blog app.
+Serves the export_static_api snapshot in place of the live public blog
+endpoints when SERVE_STATIC_API is on.
+"""
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from whitenoise.base import WhiteNoise
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from .static_export import INDEX_FILE, LIST_PATHS
+
+PREFIX = LIST_PATHS[0]
+
+
+class StaticAPIMiddleware:
+    """
+    Answer GET and HEAD for /api/blogs/... from STATIC_API_ROOT, with the
+    .br/.gz variant the client accepts. Files are looked up (stat) per
+    request rather than indexed at startup, so a re-export is picked up
+    without a restart: rewritten files get their new Content-Length,
+    removed ones fall through to the live view. Requests with a query
+    string (?page=, ?q=, filters) always go to the live view, since the
+    snapshot only holds the unfiltered pages. Detail pages served from
+    the snapshot never reach PublicBlogDetailView: clients count them with
+    POST /api/blogs/<slug>/view/.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+        self.files = WhiteNoise(
+            None,
+            autorefresh=True,
+            max_age=settings.PUBLIC_CACHE_MAX_AGE,
+            index_file=INDEX_FILE,
+        )
+        # The snapshot is laid out by full URL path (api/blogs/...)
+        self.files.add_files(settings.STATIC_API_ROOT)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.serve(request) or self.get_response(request)
+
+    async def __acall__(self, request):
+        response = None
+        if self.in_snapshot(request):
+            # Stats and opens files
+            response = await sync_to_async(self.serve, thread_sensitive=False)(request)
+        return response or await self.get_response(request)
+
+    def in_snapshot(self, request):
+        return (
+            request.method in ('GET', 'HEAD')
+            and not request.META.get('QUERY_STRING')
+            and request.path_info.startswith(PREFIX)
+        )
+
+    def serve(self, request):
+        """The snapshot's response for request, or None."""
+        if not self.in_snapshot(request):
+            return None
+        static_file = self.files.find_file(request.path_info)
+        if static_file is None:
+            return None
+        try:
+            return WhiteNoiseMiddleware.serve(static_file, request)
+        except FileNotFoundError:
+            return None  # Removed by an export since the lookup
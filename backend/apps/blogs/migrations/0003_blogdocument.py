@@ -0,0 +1,28 @@
+# Generated by Django 5.0.1 on 2026-10-19 10:29
+
+import django.core.serializers.json
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blogs', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BlogDocument',
+            fields=[
+                ('blog', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='document', serialize=False, to='blogs.blog')),
+                ('slug', models.SlugField(max_length=255, unique=True)),
+                ('payload', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('built_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Blog Document',
+                'verbose_name_plural': 'Blog Documents',
+            },
+        ),
+    ]
@@ -3,13 +3,42 @@ Blog models for Project SPD.
 Handles blog posts, categories, and tags.
 """
 
+from collections import Counter
+
 from django.db import models
 from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
 from django.utils import timezone
 from django.utils.text import slugify
 import bleach
 
 
+BLOG_ALLOWED_TAGS = [
+    'p', 'br', 'strong', 'em', 'u', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+    'ul', 'ol', 'li', 'a', 'img', 'blockquote', 'code', 'pre', 'table',
+    'thead', 'tbody', 'tr', 'th', 'td', 'span', 'div',
+]
+BLOG_ALLOWED_ATTRIBUTES = {
+    'a': ['href', 'title', 'target'],
+    'img': ['src', 'alt', 'title', 'width', 'height'],
+    'span': ['class', 'style'],
+    'div': ['class', 'style'],
+    'table': ['class'],
+    'td': ['colspan', 'rowspan'],
+    'th': ['colspan', 'rowspan'],
+}
+
+
+def sanitize_blog_content(content):
+    """Strip blog HTML down to the allowed tags and attributes."""
+    return bleach.clean(content, tags=BLOG_ALLOWED_TAGS, attributes=BLOG_ALLOWED_ATTRIBUTES)
+
+
+def sanitize_comment_content(content):
+    """Comments are plain text; strip all markup."""
+    return bleach.clean(content, tags=[], strip=True)
+
+
 class BlogStatus(models.TextChoices):
     """Blog post status choices."""
     DRAFT = 'draft', 'Draft'
@@ -17,6 +46,19 @@ class BlogStatus(models.TextChoices):
     ARCHIVED = 'archived', 'Archived'
 
 
+class CategoryManager(models.Manager):
+    """Manager for Category model."""
+    
+    def with_blog_counts(self):
+        """
+        Return categories annotated with their published blog count.
+        Lets serializers read blog_count without a query per category.
+        """
+        return self.get_queryset().annotate(
+            published_blog_count=models.Count('blogs', filter=models.Q(blogs__status=BlogStatus.PUBLISHED))
+        )
+
+
 class Category(models.Model):
     """Blog category model."""
     
@@ -28,6 +70,8 @@ class Category(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = CategoryManager()
+    
     class Meta:
         verbose_name = 'Category'
         verbose_name_plural = 'Categories'
@@ -44,6 +88,9 @@ class Category(models.Model):
     @property
     def blog_count(self):
         """Get count of published blogs in this category."""
+        # Lists annotate the count instead of querying per category
+        if hasattr(self, 'published_blog_count'):
+            return self.published_blog_count
         return self.blogs.filter(status=BlogStatus.PUBLISHED).count()
 
 
@@ -70,6 +117,40 @@ class Tag(models.Model):
         super().save(*args, **kwargs)
 
 
+class BlogManager(models.Manager):
+    """Manager for Blog model."""
+    
+    def with_comment_counts(self):
+        """
+        Return blogs annotated with approved and total comment counts, and
+        their category prefetched with its blog count: what the list
+        serializers read, without a query per row.
+        """
+        return self.get_queryset().annotate(
+            approved_comment_count=models.Count(
+                'comments', filter=models.Q(comments__is_approved=True), distinct=True
+            ),
+            total_comment_count=models.Count('comments', distinct=True),
+        ).prefetch_related(
+            models.Prefetch('category', queryset=Category.objects.with_blog_counts()),
+        )
+    
+    def for_detail(self):
+        """
+        Return blogs with everything BlogDetailSerializer reads except
+        related_blogs: author and category joined, tags and the approved
+        comments (with their authors) prefetched as approved_comments.
+        """
+        return self.get_queryset().select_related('author', 'category').prefetch_related(
+            'tags',
+            models.Prefetch(
+                'comments',
+                queryset=BlogComment.objects.filter(is_approved=True).select_related('author'),
+                to_attr='approved_comments',
+            ),
+        )
+
+
 class Blog(models.Model):
     """
     Blog post model.
@@ -120,6 +201,8 @@ class Blog(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     published_at = models.DateTimeField(null=True, blank=True)
     
+    objects = BlogManager()
+    
     class Meta:
         verbose_name = 'Blog Post'
         verbose_name_plural = 'Blog Posts'
@@ -151,21 +234,7 @@ class Blog(models.Model):
             self.published_at = timezone.now()
         
         # Sanitize content
-        self.content = bleach.clean(
-            self.content,
-            tags=['p', 'br', 'strong', 'em', 'u', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
-                  'ul', 'ol', 'li', 'a', 'img', 'blockquote', 'code', 'pre', 'table',
-                  'thead', 'tbody', 'tr', 'th', 'td', 'span', 'div'],
-            attributes={
-                'a': ['href', 'title', 'target'],
-                'img': ['src', 'alt', 'title', 'width', 'height'],
-                'span': ['class', 'style'],
-                'div': ['class', 'style'],
-                'table': ['class'],
-                'td': ['colspan', 'rowspan'],
-                'th': ['colspan', 'rowspan'],
-            }
-        )
+        self.content = sanitize_blog_content(self.content)
         
         super().save(*args, **kwargs)
     
@@ -186,6 +255,39 @@ class Blog(models.Model):
         return list(self.tags.values_list('name', flat=True))
 
 
+def apply_view_counts(blog_ids):
+    """Serialized-writer handler: one view per occurrence of each blog id."""
+    for blog_id, count in Counter(blog_ids).items():
+        Blog.objects.filter(id=blog_id).update(view_count=models.F('view_count') + count)
+
+
+class BlogDocument(models.Model):
+    """
+    Read model for the public blog detail page.
+    Holds the pre-rendered detail payload of a published blog, rebuilt in
+    the background whenever the blog or anything it embeds changes (see
+    documents.py). view_count in the payload is stale; the live count is
+    read alongside it.
+    """
+    
+    blog = models.OneToOneField(
+        Blog,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='document'
+    )
+    slug = models.SlugField(max_length=255, unique=True)
+    payload = models.JSONField(encoder=DjangoJSONEncoder)
+    built_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = 'Blog Document'
+        verbose_name_plural = 'Blog Documents'
+    
+    def __str__(self):
+        return self.slug
+
+
 class BlogComment(models.Model):
     """
     Blog comment model.
@@ -227,5 +329,5 @@ class BlogComment(models.Model):
     
     def save(self, *args, **kwargs):
         # Sanitize content
-        self.content = bleach.clean(self.content, tags=[], strip=True)
+        self.content = sanitize_comment_content(self.content)
         super().save(*args, **kwargs)
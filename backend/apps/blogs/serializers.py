@@ -3,16 +3,25 @@ Serializers for Blog app.
 Handles blog posts, categories, tags, and comments.
 """
 
+from collections import defaultdict
+
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+
+from apps.core.fieldsets import SparseFieldsMixin
 from .models import Blog, Category, Tag, BlogComment, BlogStatus
 
 User = get_user_model()
 
+# Blogs shown in BlogDetailSerializer.related_blogs
+RELATED_BLOGS = 4
+
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for Category model."""
     
+    field_dependencies = {'blog_count': []}
+    
     blog_count = serializers.IntegerField(read_only=True)
     
     class Meta:
@@ -21,7 +30,7 @@ class CategorySerializer(serializers.ModelSerializer):
         read_only_fields = ['slug', 'created_at']
 
 
-class TagSerializer(serializers.ModelSerializer):
+class TagSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for Tag model."""
     
     class Meta:
@@ -30,9 +39,11 @@ class TagSerializer(serializers.ModelSerializer):
         read_only_fields = ['slug']
 
 
-class BlogAuthorSerializer(serializers.ModelSerializer):
+class BlogAuthorSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Minimal serializer for blog author info."""
     
+    field_dependencies = {'full_name': ['first_name', 'last_name']}
+    
     full_name = serializers.CharField(read_only=True)
     
     class Meta:
@@ -56,6 +67,9 @@ class BlogCommentSerializer(serializers.ModelSerializer):
     
     def get_replies(self, obj):
         """Get nested replies for a comment."""
+        # Attached by BlogDetailSerializer from the blog's prefetched comments
+        if hasattr(obj, 'approved_replies'):
+            return BlogCommentSerializer(obj.approved_replies, many=True).data
         if obj.replies.exists():
             return BlogCommentSerializer(
                 obj.replies.filter(is_approved=True),
@@ -64,9 +78,12 @@ class BlogCommentSerializer(serializers.ModelSerializer):
         return []
 
 
-class BlogListSerializer(serializers.ModelSerializer):
+class BlogListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for blog list view - minimal data."""
     
+    expandable_fields = ['author', 'category', 'tags']
+    field_dependencies = {'reading_time': ['content'], 'comment_count': []}
+    
     author = BlogAuthorSerializer(read_only=True)
     category = CategorySerializer(read_only=True)
     tags = TagSerializer(many=True, read_only=True)
@@ -84,12 +101,17 @@ class BlogListSerializer(serializers.ModelSerializer):
     
     def get_comment_count(self, obj):
         """Get count of approved comments."""
+        # Lists annotate the count instead of querying per blog
+        if hasattr(obj, 'approved_comment_count'):
+            return obj.approved_comment_count
         return obj.comments.filter(is_approved=True).count()
 
 
-class BlogDetailSerializer(serializers.ModelSerializer):
+class BlogDetailSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for blog detail view - full data."""
     
+    expandable_fields = ['author', 'category', 'tags', 'comments', 'related_blogs']
+    
     author = BlogAuthorSerializer(read_only=True)
     category = CategorySerializer(read_only=True)
     tags = TagSerializer(many=True, read_only=True)
@@ -110,6 +132,14 @@ class BlogDetailSerializer(serializers.ModelSerializer):
     
     def get_comments(self, obj):
         """Get top-level approved comments."""
+        if hasattr(obj, 'approved_comments'):
+            # Blog.objects.for_detail(): build the reply tree from the prefetched comments
+            replies = defaultdict(list)
+            for comment in obj.approved_comments:
+                replies[comment.parent_id].append(comment)
+            for comment in obj.approved_comments:
+                comment.approved_replies = replies[comment.id]
+            return BlogCommentSerializer(replies[None], many=True).data
         top_level_comments = obj.comments.filter(
             is_approved=True,
             parent__isnull=True
@@ -118,18 +148,22 @@ class BlogDetailSerializer(serializers.ModelSerializer):
     
     def get_comment_count(self, obj):
         """Get count of approved comments."""
+        if hasattr(obj, 'approved_comments'):
+            return len(obj.approved_comments)
         return obj.comments.filter(is_approved=True).count()
     
     def get_related_blogs(self, obj):
         """Get related blogs based on category and tags."""
-        related = Blog.objects.filter(
+        related = Blog.objects.with_comment_counts().filter(
             status=BlogStatus.PUBLISHED
-        ).exclude(id=obj.id)
+        ).exclude(id=obj.id).select_related('author').prefetch_related('tags')
+        # The counts' GROUP BY drops Meta.ordering; documents.related_candidates() relies on it
+        related = related.order_by(*Blog._meta.ordering)
         
         if obj.category:
             related = related.filter(category=obj.category)
         
-        related = related[:4]
+        related = related[:RELATED_BLOGS]
         return BlogListSerializer(related, many=True).data
 
 
@@ -209,9 +243,12 @@ class BlogCreateSerializer(serializers.ModelSerializer):
         return instance
 
 
-class BlogPublicListSerializer(serializers.ModelSerializer):
+class BlogPublicListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for public blog list - limited fields."""
     
+    expandable_fields = ['author', 'tags']
+    field_dependencies = {'reading_time': ['content']}
+    
     author = BlogAuthorSerializer(read_only=True)
     category_name = serializers.CharField(source='category.name', read_only=True)
     tags = TagSerializer(many=True, read_only=True)
@@ -226,9 +263,11 @@ class BlogPublicListSerializer(serializers.ModelSerializer):
         ]
 
 
-class BlogsByUserSerializer(serializers.ModelSerializer):
+class BlogsByUserSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for blogs by specific user."""
     
+    field_dependencies = {'reading_time': ['content']}
+    
     reading_time = serializers.IntegerField(read_only=True)
     
     class Meta:
@@ -259,4 +298,6 @@ class AdminBlogSerializer(serializers.ModelSerializer):
     
     def get_comment_count(self, obj):
         """Get count of all comments."""
+        if hasattr(obj, 'total_comment_count'):
+            return obj.total_comment_count
         return obj.comments.count()
@@ -0,0 +1,117 @@
+"""
+Signals for Blog app.
+Invalidate cached blog responses when blogs, categories or tags change,
+and rebuild the detail documents of the blogs a change shows up in.
+"""
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from .documents import blogs_embedding_user, schedule_rebuild, with_related
+from .models import Blog, BlogComment, Category, Tag
+
+# User fields shown in blog documents (BlogAuthorSerializer)
+AUTHOR_FIELDS = {'username', 'first_name', 'last_name', 'avatar', 'position'}
+
+
+def invalidate_blog_cache():
+    """Orphan every response cached under the 'blogs' namespace once the transaction commits."""
+    transaction.on_commit(lambda: caches['tiered'].invalidate('blogs'))
+
+
+@receiver(post_save, sender=Blog)
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Tag)
+def content_saved(sender, instance, update_fields=None, **kwargs):
+    # View counters change on every read; cached lists may lag behind them
+    if update_fields is not None and set(update_fields) <= {'view_count'}:
+        return
+    invalidate_blog_cache()
+
+
+@receiver(post_delete, sender=Blog)
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Tag)
+def content_deleted(sender, instance, **kwargs):
+    invalidate_blog_cache()
+
+
+@receiver(m2m_changed, sender=Blog.tags.through)
+def blog_tags_changed(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        invalidate_blog_cache()
+
+
+# ============================================================
+# Detail documents
+# ============================================================
+
+@receiver(pre_save, sender=Blog)
+def find_related_documents(sender, instance, update_fields=None, **kwargs):
+    # A blog that leaves the first few of its category (unpublished, moved,
+    # re-dated) must drop out of the lists that showed it before the save
+    if instance.pk is None or (update_fields is not None and set(update_fields) <= {'view_count'}):
+        return
+    instance._related_documents = with_related({instance.pk})
+
+
+@receiver(post_save, sender=Blog)
+def rebuild_blog_document(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and set(update_fields) <= {'view_count'}:
+        return
+    schedule_rebuild(with_related({instance.id}) | getattr(instance, '_related_documents', set()))
+
+
+@receiver(pre_delete, sender=Blog)
+def rebuild_related_documents(sender, instance, **kwargs):
+    # The blog's own document goes with it
+    schedule_rebuild(with_related({instance.id}) - {instance.id})
+
+
+@receiver(m2m_changed, sender=Blog.tags.through)
+def rebuild_document_on_tags_change(sender, instance, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear') and isinstance(instance, Blog):
+        schedule_rebuild(with_related({instance.id}))
+
+
+@receiver(post_save, sender=Tag)
+@receiver(pre_delete, sender=Tag)
+def rebuild_tagged_documents(sender, instance, **kwargs):
+    # Before delete, while the tag's blogs can still be found
+    schedule_rebuild(with_related(instance.blogs.values_list('id', flat=True)))
+
+
+@receiver(post_save, sender=Category)
+@receiver(pre_delete, sender=Category)
+def rebuild_category_documents(sender, instance, **kwargs):
+    schedule_rebuild(with_related(instance.blogs.values_list('id', flat=True)))
+
+
+@receiver(post_save, sender=BlogComment)
+@receiver(post_delete, sender=BlogComment)
+def rebuild_commented_document(sender, instance, **kwargs):
+    # comment_count also shows in related_blogs
+    schedule_rebuild(with_related({instance.blog_id}))
+
+
+@receiver(pre_save, sender=settings.AUTH_USER_MODEL)
+def find_author_changes(sender, instance, update_fields=None, **kwargs):
+    # Most user saves (logins, roles, profile fields) change nothing documents show
+    fields = AUTHOR_FIELDS if update_fields is None else AUTHOR_FIELDS & set(update_fields)
+    instance._author_changed = False
+    if instance.pk is None or not fields:
+        return
+    saved = sender.objects.filter(pk=instance.pk).values(*fields).first()
+    instance._author_changed = saved is None or any(
+        saved[name] != sender._meta.get_field(name).value_from_object(instance)
+        for name in fields
+    )
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def rebuild_user_documents(sender, instance, created, **kwargs):
+    if not created and getattr(instance, '_author_changed', False):
+        schedule_rebuild(blogs_embedding_user(instance.id))
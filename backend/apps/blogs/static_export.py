@@ -0,0 +1,149 @@
+"""
+Static snapshot of the public blog API.
+Renders the public blog endpoints into JSON files laid out by URL
+(api/blogs/<slug>/index.json, ...) with .gz and .br siblings, so
+WhiteNoise or any static file server can answer them without Django.
+Paginated lists are written per page under page/<n>/, and their
+next/previous links are rewritten to those paths.
+
+The functions here run in worker processes of export_static_api; each
+renders, compresses and writes its own files and only replaces files
+whose content changed.
+"""
+
+import gzip
+import json
+import os
+import re
+import tempfile
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from django.test import RequestFactory
+from django.test.utils import override_settings
+from django.urls import resolve
+
+try:
+    import brotli
+except ImportError:  # .br files are skipped without it
+    brotli = None
+
+from .models import Blog, BlogStatus
+from .serializers import BlogDetailSerializer
+
+LIST_PATHS = [
+    '/api/blogs/',
+    '/api/blogs/featured/',
+    '/api/blogs/categories/',
+    '/api/blogs/tags/',
+]
+INDEX_FILE = 'index.json'
+PAGE_LINK = re.compile(r'^(?P<path>[^?]*)\?(?:.*&)?page=(?P<page>\d+)')
+
+
+class ExportError(Exception):
+    pass
+
+
+def page_path(path, page):
+    """URL path a list page is written under."""
+    return path if page == 1 else f'{path}page/{page}/'
+
+
+def write_file(path, content):
+    """Atomically replace path with content unless it already has it; True if written."""
+    try:
+        if path.read_bytes() == content:
+            return False
+    except FileNotFoundError:
+        path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix='.export-')
+    with os.fdopen(fd, 'wb') as stream:
+        stream.write(content)
+    os.chmod(tmp, 0o644)
+    os.replace(tmp, path)
+    return True
+
+
+def write_json(output, url_path, data):
+    """Write data for url_path with its compressed variants; returns files written."""
+    content = json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode()
+    target = Path(output) / url_path.strip('/') / INDEX_FILE
+    if not write_file(target, content):
+        # Unchanged content, so the compressed files are current too
+        return 0
+    written = 1
+    # mtime=0 keeps the gzip bytes stable across runs
+    written += write_file(target.with_name(f'{INDEX_FILE}.gz'), gzip.compress(content, 9, mtime=0))
+    if brotli is not None:
+        written += write_file(target.with_name(f'{INDEX_FILE}.br'), brotli.compress(content))
+    return written
+
+
+def remove_json(output, url_path):
+    directory = Path(output) / url_path.strip('/')
+    for name in (INDEX_FILE, f'{INDEX_FILE}.gz', f'{INDEX_FILE}.br'):
+        (directory / name).unlink(missing_ok=True)
+    try:
+        directory.rmdir()
+    except OSError:
+        pass  # Not empty: list pages live below some paths
+
+
+def _factory(base_url):
+    parts = urlsplit(base_url)
+    return RequestFactory(HTTP_HOST=parts.netloc, secure=parts.scheme == 'https'), parts.hostname
+
+
+def _rewrite_link(link, base_url):
+    if not link:
+        return link
+    match = PAGE_LINK.match(urlsplit(link)._replace(scheme='', netloc='').geturl())
+    if match is None:
+        # DRF drops ?page= for the first page
+        return f'{base_url}{urlsplit(link).path}'
+    return f'{base_url}{page_path(match["path"], int(match["page"]))}'
+
+
+def export_list_page(path, page, output, base_url):
+    """
+    Render one page of a public list endpoint through its view.
+    Returns (page count, files written).
+    """
+    factory, host = _factory(base_url)
+    request = factory.get(path, {'page': page} if page > 1 else {})
+    match = resolve(path)
+    with override_settings(ALLOWED_HOSTS=[host]):
+        response = match.func(request, *match.args, **match.kwargs)
+        response.render()
+    if response.status_code != 200:
+        raise ExportError(f'GET {path}?page={page} returned {response.status_code}')
+
+    data = json.loads(response.content)
+    pages = 1
+    if isinstance(data, dict) and 'results' in data:
+        data['next'] = _rewrite_link(data['next'], base_url)
+        data['previous'] = _rewrite_link(data['previous'], base_url)
+        if page == 1 and data['results']:
+            pages = -(-data['count'] // len(data['results']))
+    return pages, write_json(output, page_path(path, page), data)
+
+
+def export_blog_details(blog_ids, output, base_url):
+    """
+    Render the detail payload of published blogs (without recording views).
+    Returns [(slug, files written)].
+    """
+    factory, host = _factory(base_url)
+    request = factory.get('/')
+    blogs = Blog.objects.filter(
+        id__in=blog_ids,
+        status=BlogStatus.PUBLISHED
+    ).select_related('author', 'category').prefetch_related('tags')
+
+    results = []
+    with override_settings(ALLOWED_HOSTS=[host]):
+        for blog in blogs:
+            data = BlogDetailSerializer(blog, context={'request': request}).data
+            results.append((blog.slug, write_json(output, f'/api/blogs/{blog.slug}/', data)))
+    return results
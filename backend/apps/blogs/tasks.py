@@ -0,0 +1,19 @@
+"""
+Celery tasks for Blog app.
+Background rebuilds of the blog detail read model.
+"""
+
+from celery import shared_task
+import logging
+
+from .documents import build_blog_documents
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def rebuild_blog_documents(blog_ids):
+    """Rebuild the detail documents of the given blogs."""
+    payloads = build_blog_documents(blog_ids)
+    logger.info(f'Rebuilt {len(payloads)} blog documents ({len(blog_ids) - len(payloads)} removed)')
+    return len(payloads)
@@ -0,0 +1,94 @@
+"""
+Tests for the public blog endpoints.
+The public detail prunes a pre-rendered document (prune_data) while the
+staff detail renders through the serializer (SparseFieldsMixin); the same
+?fields= and ?expand= must give the same payload on both paths.
+"""
+
+from django.core.cache import caches
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from apps.users.models import User, UserRole
+
+from .models import Blog, BlogComment, BlogStatus, Category, Tag
+
+
+class DetailFieldsetTests(APITestCase):
+    """GET the same blog through the public and staff detail endpoints."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(
+            'author@example.com', 'author', role=UserRole.STAFF, first_name='Ann', position='Engineer'
+        )
+        category = Category.objects.create(name='Engineering', slug='engineering')
+        tag = Tag.objects.create(name='Python', slug='python')
+        blogs = [
+            Blog.objects.create(
+                title=f'Post {index}',
+                slug=f'post-{index}',
+                content='Some words',
+                author=cls.author,
+                category=category,
+                status=BlogStatus.PUBLISHED,
+            )
+            for index in range(3)
+        ]
+        for blog in blogs:
+            blog.tags.set([tag])
+        cls.blog = blogs[0]
+        comment = BlogComment.objects.create(blog=cls.blog, author=cls.author, content='First')
+        BlogComment.objects.create(blog=cls.blog, author=cls.author, content='Reply', parent=comment)
+
+    def assert_same_payload(self, query):
+        public = self.client.get(reverse('public-blog-detail', args=[self.blog.slug]) + query)
+        self.client.force_authenticate(self.author)
+        staff = self.client.get(reverse('staff-blog-detail', args=[self.blog.pk]) + query)
+        self.client.force_authenticate(None)
+        self.assertEqual(public.status_code, 200)
+        self.assertEqual(staff.status_code, 200)
+        self.assertEqual(public.json(), staff.json())
+        return public.json()
+
+    def test_unexpanded_relations_are_ids(self):
+        data = self.assert_same_payload('?fields=id,author,tags,comments,related_blogs')
+        self.assertEqual(data['author'], self.author.pk)
+        self.assertTrue(all(isinstance(item, int) for item in data['comments'] + data['related_blogs']))
+
+    def test_expanded_relations(self):
+        data = self.assert_same_payload('?fields=id,comments,related_blogs&expand=comments,related_blogs')
+        self.assertEqual(data['comments'][0]['replies'][0]['content'], 'Reply')
+
+    def test_subfields_imply_expand(self):
+        data = self.assert_same_payload('?fields=id,comments.id,comments.content,related_blogs')
+        self.assertEqual(data['comments'], [{'id': data['comments'][0]['id'], 'content': 'First'}])
+
+
+@override_settings(ALLOWED_HOSTS=['one.example.com', 'two.example.com'])
+class CachedListTests(APITestCase):
+    """Cached lists hold absolute media URLs, so each host gets its own copy."""
+
+    @classmethod
+    def setUpTestData(cls):
+        author = User.objects.create_user('author@example.com', 'author', role=UserRole.STAFF)
+        Blog.objects.create(
+            title='Post',
+            slug='post',
+            content='Some words',
+            author=author,
+            status=BlogStatus.PUBLISHED,
+            is_featured=True,
+            featured_image='blogs/featured/post.png',
+        )
+
+    def setUp(self):
+        caches['tiered'].invalidate('blogs')
+
+    def test_media_urls_follow_the_host(self):
+        url = reverse('featured-blogs')
+        for host, scheme in (('one.example.com', 'http'), ('two.example.com', 'https')):
+            response = self.client.get(url, HTTP_HOST=host, secure=scheme == 'https')
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(response.json()['results'][0]['featured_image'].startswith(f'{scheme}://{host}/'))
@@ -7,6 +7,7 @@ from .views import (
     # Public views
     PublicBlogListView,
     PublicBlogDetailView,
+    BlogViewBeaconView,
     FeaturedBlogsView,
     BlogsByUserView,
     CategoryListView,
@@ -38,8 +39,6 @@ urlpatterns = [
     path('categories/', CategoryListView.as_view(), name='category-list'),
     path('tags/', TagListView.as_view(), name='tag-list'),
     path('user/<str:username>/', BlogsByUserView.as_view(), name='blogs-by-user'),
-    path('<slug:slug>/', PublicBlogDetailView.as_view(), name='public-blog-detail'),
-    path('<slug:slug>/comments/', BlogCommentCreateView.as_view(), name='blog-comment-create'),
     
     # Staff blog management
     path('staff/', StaffBlogListView.as_view(), name='staff-blog-list'),
@@ -59,4 +58,9 @@ urlpatterns = [
     # Admin tag management
     path('admin/tags/', AdminTagListCreateView.as_view(), name='admin-tag-list'),
     path('admin/tags/<int:pk>/', AdminTagDetailView.as_view(), name='admin-tag-detail'),
+    
+    # Public blog by slug: after the routes above, so a slug cannot shadow staff/ or admin/
+    path('<slug:slug>/', PublicBlogDetailView.as_view(), name='public-blog-detail'),
+    path('<slug:slug>/view/', BlogViewBeaconView.as_view(), name='blog-view-beacon'),
+    path('<slug:slug>/comments/', BlogCommentCreateView.as_view(), name='blog-comment-create'),
 ]
@@ -9,10 +9,12 @@ from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
-from django.db.models import Count, Q
+from django.core.cache import caches
+from django.db.models import Count, F, Q, Sum
 from django.utils import timezone
 
-from .models import Blog, Category, Tag, BlogComment, BlogStatus
+from .documents import build_blog_documents
+from .models import Blog, BlogDocument, Category, Tag, BlogComment, BlogStatus, apply_view_counts
 from .serializers import (
     CategorySerializer,
     TagSerializer,
@@ -32,6 +34,77 @@ from apps.users.permissions import (
     PublicReadOnly,
 )
 from apps.users.models import UserRole
+from apps.core.coalescing import coalesce, coalescing_key
+from apps.core.fieldsets import parse_fieldset, prune_data, sparse_queryset
+from apps.core.http_cache import ConditionalGetMixin, weak_etag
+from apps.core.sqlite import serialized_writes_enabled, writer as sqlite_writer
+
+
+# ============================================================
+# Cached Responses
+# ============================================================
+
+class CachedListMixin:
+    """
+    Serve list responses from the two-tier cache under the 'blogs'
+    namespace, keyed by the absolute URL: payloads hold absolute media URLs,
+    so the scheme and host are part of the key. Anything that changes blogs,
+    categories or tags invalidates the namespace (see signals.py).
+    CompressionMiddleware caches the compressed body as well.
+    """
+    cache_namespace = 'blogs'
+
+    def get_validators(self, request, *args, **kwargs):
+        # The namespace version changes with anything the cached lists show
+        version = caches['tiered'].namespace_version(self.cache_namespace)
+        return weak_etag(self.cache_namespace, version), None
+
+    def list(self, request, *args, **kwargs):
+        cache = caches['tiered']
+        key = cache.namespaced(self.cache_namespace, request.build_absolute_uri())
+        data = cache.get_or_set(key, lambda: super(CachedListMixin, self).list(request, *args, **kwargs).data)
+        response = Response(data)
+        # Same body until the namespace changes: keep its compressed bytes too
+        response.compress_once = True
+        return response
+
+
+# ============================================================
+# View Counting
+# ============================================================
+
+def get_client_ip(request):
+    """Get client IP address."""
+    x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
+    if x_forwarded_for:
+        return x_forwarded_for.split(',')[0]
+    return request.META.get('REMOTE_ADDR')
+
+
+def record_view(request, blog_id):
+    """Increment blog_id's view count and track the view for analytics."""
+    view = {
+        'blog_id': blog_id,
+        'user_id': request.user.id if request.user.is_authenticated else None,
+        'ip_address': get_client_ip(request),
+        'user_agent': request.META.get('HTTP_USER_AGENT', ''),
+    }
+    
+    if serialized_writes_enabled():
+        # SQLite: queue both writes for the single writer thread
+        from apps.analytics.tasks import record_blog_views
+        sqlite_writer.submit(apply_view_counts, blog_id)
+        sqlite_writer.submit(record_blog_views, view)
+    else:
+        # Increment view count (async task in production)
+        Blog.objects.filter(id=blog_id).update(view_count=F('view_count') + 1)
+        
+        # Track view analytics
+        from apps.analytics.tasks import track_blog_view
+        try:
+            track_blog_view.delay(**view)
+        except Exception:
+            pass  # Fail silently if Celery is not available
 
 
 # ============================================================
@@ -66,66 +139,118 @@ class PublicBlogListView(generics.ListAPIView):
                 Q(content__icontains=q)
             )
         
-        return queryset
+        # ?fields= / ?expand= load only what the response shows
+        return sparse_queryset(queryset, self.get_serializer())
 
 
-class PublicBlogDetailView(generics.RetrieveAPIView):
+class PublicBlogDetailView(ConditionalGetMixin, generics.RetrieveAPIView):
     """
     Get single published blog by slug.
     GET /api/blogs/<slug>/
-    Increments view count.
+    Increments view count, on 304 Not Modified responses too.
     """
     permission_classes = [AllowAny]
     serializer_class = BlogDetailSerializer
     lookup_field = 'slug'
+    shared_max_age = 0
     
     def get_queryset(self):
-        return Blog.objects.filter(
-            status=BlogStatus.PUBLISHED
-        ).select_related('author', 'category').prefetch_related('tags', 'comments')
+        # Only finds the blog for build_document(); the document holds the rest
+        return Blog.objects.filter(status=BlogStatus.PUBLISHED).only('id')
+    
+    def get_document(self):
+        """
+        (payload, view_count, built_at, updated_at) of the published blog,
+        or None. One query, shared by get_validators() and retrieve().
+        """
+        if not hasattr(self, '_document'):
+            # Until the rebuild runs, an unpublished blog still has its document
+            self._document = BlogDocument.objects.filter(
+                slug=self.kwargs[self.lookup_field],
+                blog__status=BlogStatus.PUBLISHED
+            ).values_list('payload', 'blog__view_count', 'built_at', 'blog__updated_at').first()
+        return self._document
+    
+    def get_validators(self, request, *args, **kwargs):
+        # The document is rebuilt whenever anything it shows changes
+        document = self.get_document()
+        if document is None:
+            return None, None
+        payload, _, built_at, updated_at = document
+        self.blog_id = payload['id']
+        self.surrogate_keys = ['blogs', f'blog-{payload["id"]}']
+        last_modified = max(built_at, updated_at)
+        return weak_etag('blog', payload['id'], int(last_modified.timestamp() * 1000)), last_modified
+    
+    def get(self, request, *args, **kwargs):
+        response = super().get(request, *args, **kwargs)
+        # A 304 is a view too; shared caches revalidate every request (shared_max_age)
+        if request.method == 'GET' and response.status_code in (200, 304):
+            record_view(request, self.blog_id)
+        return response
     
     def retrieve(self, request, *args, **kwargs):
+        # Serve the pre-rendered document with the live view count: one query
+        document = self.get_document()
+        if document is not None:
+            data, view_count = document[:2]
+            data['view_count'] = view_count
+        else:
+            # Not built yet: build it now. A popular post draws many identical
+            # requests at once; they share one build, and each still records its view
+            data = coalesce(coalescing_key(request), self.build_document)
+        self.blog_id = data['id']
+        self.absolutize_media(request, data)
+        fieldset = parse_fieldset(request)
+        # Counted by get()
+        data['view_count'] += 1
+        return Response(prune_data(data, fieldset, self.serializer_class.expandable_fields))
+    
+    def build_document(self):
         instance = self.get_object()
-        
-        # Increment view count (async task in production)
-        instance.increment_view_count()
-        
-        # Track view analytics
-        from apps.analytics.tasks import track_blog_view
-        try:
-            track_blog_view.delay(
-                blog_id=instance.id,
-                user_id=request.user.id if request.user.is_authenticated else None,
-                ip_address=self.get_client_ip(request),
-                user_agent=request.META.get('HTTP_USER_AGENT', '')
-            )
-        except Exception:
-            pass  # Fail silently if Celery is not available
-        
-        serializer = self.get_serializer(instance)
-        return Response(serializer.data)
+        return build_blog_documents([instance.id])[instance.id]
+    
+    def absolutize_media(self, request, data):
+        """Documents are built without a request; make media URLs absolute as the serializer would."""
+        for item in (data, data['author']):
+            for field in ('featured_image', 'avatar'):
+                if item.get(field):
+                    item[field] = request.build_absolute_uri(item[field])
+
+
+class BlogViewBeaconView(views.APIView):
+    """
+    Record a view of a published blog whose page was served without
+    reaching PublicBlogDetailView (static snapshot, CDN).
+    POST /api/blogs/<slug>/view/
+    """
+    permission_classes = [AllowAny]
     
-    def get_client_ip(self, request):
-        """Get client IP address."""
-        x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-        if x_forwarded_for:
-            return x_forwarded_for.split(',')[0]
-        return request.META.get('REMOTE_ADDR')
+    def post(self, request, slug):
+        blog_id = Blog.objects.filter(
+            slug=slug, status=BlogStatus.PUBLISHED
+        ).values_list('id', flat=True).first()
+        if blog_id is None:
+            return Response({'detail': 'Blog not found'}, status=status.HTTP_404_NOT_FOUND)
+        record_view(request, blog_id)
+        return Response(status=status.HTTP_204_NO_CONTENT)
 
 
-class FeaturedBlogsView(generics.ListAPIView):
+class FeaturedBlogsView(CachedListMixin, ConditionalGetMixin, generics.ListAPIView):
     """
     List featured blogs.
     GET /api/blogs/featured/
     """
     permission_classes = [AllowAny]
     serializer_class = BlogPublicListSerializer
+    surrogate_keys = ['blogs', 'featured']
     
     def get_queryset(self):
-        return Blog.objects.filter(
+        queryset = Blog.objects.filter(
             status=BlogStatus.PUBLISHED,
             is_featured=True
-        ).select_related('author', 'category')[:6]
+        ).select_related('author', 'category').prefetch_related('tags')
+        return sparse_queryset(queryset, self.get_serializer())[:6]
 
 
 class BlogsByUserView(generics.ListAPIView):
@@ -138,33 +263,39 @@ class BlogsByUserView(generics.ListAPIView):
     
     def get_queryset(self):
         username = self.kwargs.get('username')
-        return Blog.objects.filter(
+        queryset = Blog.objects.filter(
             status=BlogStatus.PUBLISHED,
             author__username=username
         ).order_by('-published_at')
+        return sparse_queryset(queryset, self.get_serializer())
 
 
-class CategoryListView(generics.ListAPIView):
+class CategoryListView(ConditionalGetMixin, generics.ListAPIView):
     """
     List all categories with blog counts.
     GET /api/blogs/categories/
     """
     permission_classes = [AllowAny]
     serializer_class = CategorySerializer
+    surrogate_keys = ['blogs', 'categories']
+    
+    def get_validators(self, request, *args, **kwargs):
+        # Counts change with blog status, which bumps the blogs cache namespace
+        version = caches['tiered'].namespace_version('blogs')
+        return weak_etag('categories', version), None
     
     def get_queryset(self):
-        return Category.objects.annotate(
-            blog_count=Count('blogs', filter=Q(blogs__status=BlogStatus.PUBLISHED))
-        ).filter(blog_count__gt=0).order_by('name')
+        return Category.objects.with_blog_counts().filter(published_blog_count__gt=0).order_by('name')
 
 
-class TagListView(generics.ListAPIView):
+class TagListView(CachedListMixin, ConditionalGetMixin, generics.ListAPIView):
     """
     List all tags.
     GET /api/blogs/tags/
     """
     permission_classes = [AllowAny]
     serializer_class = TagSerializer
+    surrogate_keys = ['blogs', 'tags']
     queryset = Tag.objects.all()
 
 
@@ -190,9 +321,9 @@ class StaffBlogListView(generics.ListCreateAPIView):
         return BlogListSerializer
     
     def get_queryset(self):
-        return Blog.objects.filter(
+        return Blog.objects.with_comment_counts().filter(
             author=self.request.user
-        ).select_related('category').prefetch_related('tags')
+        ).select_related('author').prefetch_related('tags')
 
 
 class StaffBlogDetailView(generics.RetrieveUpdateDestroyAPIView):
@@ -212,8 +343,8 @@ class StaffBlogDetailView(generics.RetrieveUpdateDestroyAPIView):
     def get_queryset(self):
         user = self.request.user
         if user.role == UserRole.ADMIN:
-            return Blog.objects.all()
-        return Blog.objects.filter(author=user)
+            return Blog.objects.for_detail()
+        return Blog.objects.for_detail().filter(author=user)
     
     def destroy(self, request, *args, **kwargs):
         instance = self.get_object()
@@ -242,7 +373,7 @@ class AdminBlogListView(generics.ListAPIView):
     ordering = ['-created_at']
     
     def get_queryset(self):
-        return Blog.objects.all().select_related('author', 'category').prefetch_related('tags')
+        return Blog.objects.with_comment_counts().select_related('author').prefetch_related('tags')
 
 
 class AdminBlogDetailView(generics.RetrieveUpdateDestroyAPIView):
@@ -343,7 +474,7 @@ class AdminBlogStatsView(views.APIView):
         draft_blogs = Blog.objects.filter(status=BlogStatus.DRAFT).count()
         
         # Total views
-        total_views = Blog.objects.aggregate(total=models.Sum('view_count'))['total'] or 0
+        total_views = Blog.objects.aggregate(total=Sum('view_count'))['total'] or 0
         
         # Views this month
         thirty_days_ago = timezone.now() - timedelta(days=30)
@@ -351,7 +482,7 @@ class AdminBlogStatsView(views.APIView):
         # Top viewed blogs
         top_blogs = Blog.objects.filter(
             status=BlogStatus.PUBLISHED
-        ).order_by('-view_count')[:5]
+        ).select_related('author', 'category').prefetch_related('tags').order_by('-view_count')[:5]
         
         # Blogs by category
         blogs_by_category = Category.objects.annotate(
@@ -387,7 +518,7 @@ class AdminCategoryListCreateView(generics.ListCreateAPIView):
     """
     permission_classes = [IsAuthenticated, IsAdmin]
     serializer_class = CategorySerializer
-    queryset = Category.objects.all()
+    queryset = Category.objects.with_blog_counts().order_by('name')
 
 
 class AdminCategoryDetailView(generics.RetrieveUpdateDestroyAPIView):
@@ -436,6 +567,7 @@ class BlogCommentCreateView(generics.CreateAPIView):
     """
     permission_classes = [IsAuthenticated]
     serializer_class = BlogCommentSerializer
+    throttle_scope = 'comment'
     
     def perform_create(self, serializer):
         slug = self.kwargs.get('slug')
@@ -0,0 +1,2 @@
+# Core app
+default_app_config = 'apps.core.apps.CoreConfig'
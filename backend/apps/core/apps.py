@@ -0,0 +1,17 @@
+from django.apps import AppConfig
+from django.conf import settings
+
+
+class CoreConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.core'
+    verbose_name = 'Core & Monitoring'
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+        from .sqlite import configure_sqlite_connection
+        connection_created.connect(configure_sqlite_connection)
+
+        if getattr(settings, 'SLOW_QUERY_LOG', False):
+            from .slow_queries import install_slow_query_wrapper
+            connection_created.connect(install_slow_query_wrapper)
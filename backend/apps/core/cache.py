@@ -0,0 +1,343 @@
+"""
+Cache backends.
+Drop-in subclasses of the configured cache backends that count hits and
+misses against the current request for RequestMetricsMiddleware, and a
+two-tier backend layering a per-process LRU over a shared cache.
+"""
+
+import math
+import pickle
+import random
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from contextlib import contextmanager
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.core.cache.backends.locmem import LocMemCache
+
+from .metrics import record_cache_lookup
+
+
+_MISSING = object()
+
+
+class InstrumentedCacheMixin:
+    """Counts get() results; everything else is passed through."""
+
+    def get(self, key, default=None, *args, **kwargs):
+        value = super().get(key, _MISSING, *args, **kwargs)
+        if value is _MISSING:
+            record_cache_lookup(0, 1)
+            return default
+        record_cache_lookup(1)
+        return value
+
+
+class InstrumentedLocMemCache(InstrumentedCacheMixin, LocMemCache):
+    pass
+
+
+try:
+    from django_redis.cache import RedisCache
+except ImportError:  # django-redis is only needed when USE_LOCAL_CACHE is off
+    pass
+else:
+    class InstrumentedRedisCache(InstrumentedCacheMixin, RedisCache):
+        # Redis fetches many keys in one round trip instead of via get()
+        def get_many(self, keys, *args, **kwargs):
+            keys = list(keys)
+            values = super().get_many(keys, *args, **kwargs)
+            record_cache_lookup(len(values), len(keys) - len(values))
+            return values
+
+
+# ============================================================
+# Two-tier cache
+# ============================================================
+
+# Values written by get_or_set(), with the seconds the last computation
+# took (delta) and when the entry expires, for early expiration
+CacheEntry = namedtuple('CacheEntry', ['value', 'delta', 'expires'])
+
+# Per-process stores and in-flight locks, shared by the per-thread
+# backend instances Django creates for each alias
+_local_stores = {}
+_local_stores_lock = threading.Lock()
+
+
+class _LocalStore:
+    """Bounded LRU of pickled values with per-entry expiry."""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return _MISSING
+            if item[1] <= time.monotonic():
+                del self._data[key]
+                return _MISSING
+            self._data.move_to_end(key)
+        return pickle.loads(item[0])
+
+    def set(self, key, value, ttl):
+        if ttl <= 0:
+            self.delete(key)
+            return
+        item = (pickle.dumps(value, pickle.HIGHEST_PROTOCOL), time.monotonic() + ttl)
+        with self._lock:
+            self._data[key] = item
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class _KeyLocks:
+    """One lock per key while anyone holds or waits for it."""
+
+    def __init__(self):
+        self._guard = threading.Lock()
+        self._locks = {}
+
+    @contextmanager
+    def hold(self, key, blocking=True, timeout=-1):
+        with self._guard:
+            entry = self._locks.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+        acquired = entry[0].acquire(blocking, timeout if blocking else -1)
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                entry[0].release()
+            with self._guard:
+                entry[1] -= 1
+                if not entry[1]:
+                    del self._locks[key]
+
+
+_in_flight = _KeyLocks()
+
+
+class TwoTierCache(BaseCache):
+    """
+    A bounded in-process LRU with a short TTL in front of a shared cache.
+
+    OPTIONS:
+        SHARED: alias of the shared cache (default 'default')
+        LOCAL_TIMEOUT: seconds a value may be served from process memory (5)
+        LOCAL_MAX_ENTRIES: LRU size per process (1024)
+        NAMESPACE_TIMEOUT: seconds a namespace version is trusted locally (1)
+        EARLY_EXPIRY_BETA: early expiration eagerness, 0 to disable (1.0)
+        LOCK_TIMEOUT: seconds the shared recompute lock lives (10)
+        LOCK_WAIT: seconds to wait for another recompute before computing (5)
+
+    Plain get/set/delete go through both tiers; other processes may serve a
+    deleted value for up to LOCAL_TIMEOUT. For coherent invalidation, build
+    keys with namespaced() and bump the namespace with invalidate(): every
+    process sees the new version within NAMESPACE_TIMEOUT.
+
+    get_or_set() recomputes a value before it expires with a probability that
+    rises as expiry nears and with how long the value took to compute
+    (XFetch), and only one thread in one process recomputes a key at a time
+    while the others keep serving the old value or wait for the new one.
+    """
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get('OPTIONS', {})
+        self._shared_alias = options.get('SHARED', 'default')
+        self.local_timeout = options.get('LOCAL_TIMEOUT', 5)
+        self.namespace_timeout = options.get('NAMESPACE_TIMEOUT', 1)
+        self.early_expiry_beta = options.get('EARLY_EXPIRY_BETA', 1.0)
+        self.lock_timeout = options.get('LOCK_TIMEOUT', 10)
+        self.lock_wait = options.get('LOCK_WAIT', 5)
+        with _local_stores_lock:
+            self._local = _local_stores.setdefault(
+                location or 'two-tier', _LocalStore(options.get('LOCAL_MAX_ENTRIES', 1024))
+            )
+
+    @property
+    def shared(self):
+        return caches[self._shared_alias]
+
+    def _local_ttl(self, timeout):
+        if timeout is None:
+            return self.local_timeout
+        return min(self.local_timeout, timeout)
+
+    def _seconds(self, timeout):
+        return self.default_timeout if timeout is DEFAULT_TIMEOUT else timeout
+
+    # ------------------------------------------------------------
+    # Cache API
+    # ------------------------------------------------------------
+
+    def _get_raw(self, key, version):
+        """Stored value or CacheEntry from the local tier, else the shared one."""
+        local_key = self.make_and_validate_key(key, version)
+        value = self._local.get(local_key)
+        if value is not _MISSING:
+            record_cache_lookup(1)
+            return value
+        value = self.shared.get(key, _MISSING, version=version)
+        if value is not _MISSING:
+            ttl = self.local_timeout
+            if isinstance(value, CacheEntry):
+                ttl = min(ttl, value.expires - time.time())
+            self._local.set(local_key, value, ttl)
+        return value
+
+    def get(self, key, default=None, version=None):
+        value = self._get_raw(key, version)
+        if value is _MISSING:
+            return default
+        return value.value if isinstance(value, CacheEntry) else value
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        timeout = self._seconds(timeout)
+        self.shared.set(key, value, timeout, version=version)
+        self._local.set(self.make_and_validate_key(key, version), value, self._local_ttl(timeout))
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        timeout = self._seconds(timeout)
+        added = self.shared.add(key, value, timeout, version=version)
+        if added:
+            self._local.set(self.make_and_validate_key(key, version), value, self._local_ttl(timeout))
+        return added
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        return self.shared.touch(key, self._seconds(timeout), version=version)
+
+    def delete(self, key, version=None):
+        self._local.delete(self.make_and_validate_key(key, version))
+        return self.shared.delete(key, version=version)
+
+    def has_key(self, key, version=None):
+        return self._get_raw(key, version) is not _MISSING
+
+    def incr(self, key, delta=1, version=None):
+        self._local.delete(self.make_and_validate_key(key, version))
+        return self.shared.incr(key, delta, version=version)
+
+    def clear(self):
+        self._local.clear()
+        self.shared.clear()
+
+    def get_or_set(self, key, default, timeout=DEFAULT_TIMEOUT, version=None):
+        value = self._get_raw(key, version)
+        if value is _MISSING:
+            return self._recompute(key, default, timeout, version, stale=None)
+        if not isinstance(value, CacheEntry):
+            return value
+        if self._expires_early(value):
+            return self._recompute(key, default, timeout, version, stale=value)
+        return value.value
+
+    # ------------------------------------------------------------
+    # Stampede protection
+    # ------------------------------------------------------------
+
+    def _expires_early(self, entry):
+        if not self.early_expiry_beta or entry.expires == math.inf:
+            return False
+        # -log(U) is exponentially distributed, so each reader has a small,
+        # growing chance of volunteering to refresh before the real expiry
+        jitter = -entry.delta * self.early_expiry_beta * math.log(1 - random.random())
+        return time.time() + jitter >= entry.expires
+
+    def _recompute(self, key, default, timeout, version, stale):
+        local_key = self.make_and_validate_key(key, version)
+        # With a stale value to serve, don't queue behind a refresh in progress
+        with _in_flight.hold(local_key, blocking=stale is None, timeout=self.lock_wait) as acquired:
+            if not acquired:
+                if stale is not None:
+                    return stale.value
+            elif stale is None:
+                # Another thread may have filled it while this one waited
+                value = self._get_raw(key, version)
+                if value is not _MISSING:
+                    return value.value if isinstance(value, CacheEntry) else value
+
+            lock_key = f'{key}:recompute-lock'
+            locked = self.shared.add(lock_key, 1, self.lock_timeout, version=version)
+            if not locked:
+                if stale is not None:
+                    return stale.value
+                value = self._wait_for(key, version)
+                if value is not _MISSING:
+                    return value
+            try:
+                return self._compute_and_store(key, default, timeout, version)
+            finally:
+                if locked:
+                    self.shared.delete(lock_key, version=version)
+
+    def _wait_for(self, key, version):
+        """Poll the shared tier while another process recomputes the key."""
+        deadline = time.monotonic() + self.lock_wait
+        while time.monotonic() < deadline:
+            time.sleep(0.02)
+            value = self.shared.get(key, _MISSING, version=version)
+            if value is not _MISSING:
+                self._local.set(self.make_and_validate_key(key, version), value, self.local_timeout)
+                return value.value if isinstance(value, CacheEntry) else value
+        return _MISSING
+
+    def _compute_and_store(self, key, default, timeout, version):
+        start = time.monotonic()
+        value = default() if callable(default) else default
+        delta = time.monotonic() - start
+        timeout = self._seconds(timeout)
+        if timeout is not None and timeout <= 0:
+            return value
+        expires = math.inf if timeout is None else time.time() + timeout
+        self.set(key, CacheEntry(value, delta, expires), timeout, version=version)
+        return value
+
+    # ------------------------------------------------------------
+    # Namespaces
+    # ------------------------------------------------------------
+
+    def _namespace_key(self, namespace):
+        return f'namespace:{namespace}'
+
+    def namespace_version(self, namespace):
+        key = self._namespace_key(namespace)
+        local_key = self.make_and_validate_key(key)
+        version = self._local.get(local_key)
+        if version is _MISSING:
+            version = self.shared.get(key)
+            if version is None:
+                # Time-based start, so an evicted counter never reuses old versions
+                self.shared.add(key, int(time.time() * 1000), None)
+                version = self.shared.get(key)
+            self._local.set(local_key, version, self.namespace_timeout)
+        return version
+
+    def namespaced(self, namespace, key):
+        """Key that changes whenever the namespace is invalidated."""
+        return f'{namespace}:v{self.namespace_version(namespace)}:{key}'
+
+    def invalidate(self, namespace):
+        """Orphan every key built with namespaced(namespace, ...)."""
+        key = self._namespace_key(namespace)
+        self._local.delete(self.make_and_validate_key(key))
+        try:
+            self.shared.incr(key)
+        except ValueError:
+            self.shared.set(key, int(time.time() * 1000), None)
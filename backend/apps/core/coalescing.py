@@ -0,0 +1,131 @@
+"""
+Request coalescing (single-flight).
+Concurrent identical reads share one computation: the first caller runs
+it and everyone who asks for the same key meanwhile waits and gets a copy
+of its result. Within a process, waiters block on the in-flight call.
+Across processes, the leader holds a short lock in the shared cache and
+publishes the result under that flight's token, so other processes wait
+for it instead of recomputing.
+
+Since public blog details are served from pre-rendered documents, the
+only caller is the cold document build (PublicBlogDetailView): a burst of
+requests for a blog with no document yet builds it once.
+
+Only the result of a flight is shared, never cached past it, so this
+adds no staleness; results must be picklable (serializer data is).
+"""
+
+import pickle
+import threading
+import time
+import uuid
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+
+POLL_INTERVAL = 0.02
+
+
+def coalescing_key(request, params=()):
+    """
+    Key for a request: the resolved view, its URL arguments and the
+    query parameters in params (others do not change the response).
+    """
+    match = request.resolver_match
+    query = urlencode(sorted(
+        (name, value) for name in params for value in request.GET.getlist(name)
+    ))
+    args = ','.join(str(arg) for arg in match.args)
+    kwargs = ','.join(f'{name}={value}' for name, value in sorted(match.kwargs.items()))
+    return f'{match.view_name}|{args}|{kwargs}|{query}'
+
+
+def _cache():
+    return caches[settings.COALESCE_CACHE]
+
+
+def _lock_key(key):
+    return f'coalesce:lock:{key}'
+
+
+def _result_key(key, token):
+    return f'coalesce:result:{key}:{token}'
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.payload = None
+        self.error = None
+
+
+_flights = {}
+_flights_lock = threading.Lock()
+
+
+def coalesce(key, compute):
+    """
+    Return compute(), sharing one call among concurrent callers with the same key.
+    The leader gets compute()'s own return value; waiters get copies.
+    Exceptions are re-raised in waiters of the same process.
+    """
+    with _flights_lock:
+        flight = _flights.get(key)
+        leader = flight is None
+        if leader:
+            flight = _flights[key] = _Flight()
+
+    if not leader:
+        if flight.done.wait(settings.COALESCE_WAIT):
+            if flight.error is not None:
+                raise flight.error
+            return pickle.loads(flight.payload)
+        # The leader is stuck; don't pile up behind it
+        return compute()
+
+    try:
+        result = _lead_across_processes(key, compute)
+        flight.payload = pickle.dumps(result, pickle.HIGHEST_PROTOCOL)
+        return result
+    except Exception as exc:
+        flight.error = exc
+        raise
+    finally:
+        with _flights_lock:
+            del _flights[key]
+        flight.done.set()
+
+
+def _lead_across_processes(key, compute):
+    cache = _cache()
+    token = uuid.uuid4().hex
+    lock_key = _lock_key(key)
+    if not cache.add(lock_key, token, settings.COALESCE_LOCK_TIMEOUT):
+        result = _wait_for_other_process(cache, key, lock_key)
+        if result is not None:
+            return pickle.loads(result)
+        token = None
+    try:
+        result = compute()
+        if token is not None:
+            cache.set(_result_key(key, token), pickle.dumps(result, pickle.HIGHEST_PROTOCOL),
+                      settings.COALESCE_WAIT + 1)
+        return result
+    finally:
+        if token is not None:
+            cache.delete(lock_key)
+
+
+def _wait_for_other_process(cache, key, lock_key):
+    """Pickled result of the other process's flight, or None to compute here."""
+    deadline = time.monotonic() + settings.COALESCE_WAIT
+    token = cache.get(lock_key)
+    while token is not None and time.monotonic() < deadline:
+        time.sleep(POLL_INTERVAL)
+        result = cache.get(_result_key(key, token))
+        if result is not None:
+            return result
+        token = cache.get(lock_key)
+    return None
+
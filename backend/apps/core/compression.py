@@ -0,0 +1,162 @@
+"""
+Response compression.
+Negotiates brotli or gzip from Accept-Encoding and compresses JSON
+responses above COMPRESSION_MIN_SIZE. Responses a view marks with
+`compress_once` (bodies served repeatedly from a cache) have their
+compressed bytes kept in COMPRESSION_CACHE, keyed by encoding and a hash
+of the body, so a hot payload is compressed once rather than per request.
+
+Against BREACH, as Django's GZipMiddleware does: HTML is never compressed,
+and other responses, which may mix a secret with reflected input, are
+gzipped with up to COMPRESSION_GZIP_RANDOM_BYTES of random padding in the
+gzip header. Brotli has no field to pad, so it is only negotiated for
+compress_once responses, which are public and the same for every client.
+"""
+
+import gzip
+import hashlib
+import re
+import secrets
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:  # Negotiate gzip only
+    brotli = None
+
+COMPRESSIBLE_TYPES = re.compile(r'^application/(json|[\w.+-]+\+json)\b')
+ACCEPT_ENCODING = re.compile(r'\s*([\w*-]+)\s*(?:;\s*q\s*=\s*([\d.]+))?\s*$')
+
+
+def _brotli_compress(content):
+    return brotli.compress(content, quality=settings.COMPRESSION_BROTLI_QUALITY)
+
+
+def _gzip_compress(content):
+    # mtime=0 keeps the bytes, and so the cache key's value, stable
+    return gzip.compress(content, settings.COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+def _padded_gzip_compress(content):
+    """_gzip_compress() with a random-length file name, as django.utils.text.compress_string()."""
+    compressed = _gzip_compress(content)
+    if not settings.COMPRESSION_GZIP_RANDOM_BYTES:
+        return compressed
+    header = bytearray(compressed[:10])
+    header[3] = gzip.FNAME
+    name = b'a' * secrets.randbelow(settings.COMPRESSION_GZIP_RANDOM_BYTES)
+    return bytes(header) + name + b'\x00' + compressed[10:]
+
+
+# In order of preference
+ENCODINGS = {'br': _brotli_compress, 'gzip': _gzip_compress} if brotli else {'gzip': _gzip_compress}
+# For responses that may hold secrets
+PADDED_ENCODINGS = {'gzip': _padded_gzip_compress}
+
+
+def negotiate(accept_encoding, encodings=ENCODINGS):
+    """The preferred encoding of encodings the client accepts, or None for identity."""
+    accepted = {}
+    for item in accept_encoding.split(','):
+        match = ACCEPT_ENCODING.match(item)
+        if match is None:
+            continue
+        try:
+            accepted[match[1].lower()] = float(match[2]) if match[2] else 1.0
+        except ValueError:
+            continue
+    best, best_q = None, 0.0
+    for encoding in encodings:
+        q = accepted.get(encoding, accepted.get('*', 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def compress(content, encoding):
+    return ENCODINGS[encoding](content)
+
+
+def compress_padded(content, encoding):
+    return PADDED_ENCODINGS[encoding](content)
+
+
+def compress_cached(content, encoding):
+    """compress(), remembered under a hash of content."""
+    cache = caches[settings.COMPRESSION_CACHE]
+    digest = hashlib.blake2b(content, digest_size=16).hexdigest()
+    key = f'compressed:{encoding}:{digest}'
+    compressed = cache.get(key)
+    if compressed is None:
+        compressed = compress(content, encoding)
+        cache.set(key, compressed, settings.COMPRESSION_CACHE_TIMEOUT)
+    return compressed
+
+
+class CompressionMiddleware:
+    """
+    Like Django's GZipMiddleware, with brotli and the compressed-bytes
+    cache. Streaming responses, responses that already carry a
+    Content-Encoding, non-JSON types and bodies under COMPRESSION_MIN_SIZE
+    are left alone. Compressed responses keep only weak ETags, since the
+    bytes differ from the identity encoding.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        response = self.get_response(request)
+        encoding = self.select_encoding(request, response)
+        if encoding is None:
+            return response
+        return self.compress_response(response, encoding)
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        encoding = self.select_encoding(request, response)
+        if encoding is None:
+            return response
+        # Compressing is CPU-bound and the cache lookup may block: keep them off the event loop
+        return await sync_to_async(self.compress_response, thread_sensitive=False)(response, encoding)
+
+    def select_encoding(self, request, response):
+        """Encoding to compress response with, or None to send it as is."""
+        if response.streaming or response.has_header('Content-Encoding'):
+            return None
+        if not COMPRESSIBLE_TYPES.match(response.get('Content-Type', '')):
+            return None
+        if len(response.content) < settings.COMPRESSION_MIN_SIZE:
+            return None
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encodings = ENCODINGS if getattr(response, 'compress_once', False) else PADDED_ENCODINGS
+        return negotiate(request.META.get('HTTP_ACCEPT_ENCODING', ''), encodings)
+
+    def compress_response(self, response, encoding):
+        if getattr(response, 'compress_once', False):
+            compressed = compress_cached(response.content, encoding)
+        else:
+            compressed = compress_padded(response.content, encoding)
+        # Not worth it for incompressible bodies
+        if len(compressed) >= len(response.content):
+            return response
+
+        response.content = compressed
+        response.headers['Content-Length'] = str(len(compressed))
+        response.headers['Content-Encoding'] = encoding
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        return response
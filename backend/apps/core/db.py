@@ -0,0 +1,14 @@
+"""
+Database helpers shared by the apps.
+"""
+
+from django.db import connections
+
+
+def reset_worker_connections():
+    """
+    Process pool initializer: drop connections inherited from the parent
+    without closing them, so each worker opens its own.
+    """
+    for conn in connections.all(initialized_only=True):
+        conn.connection = None
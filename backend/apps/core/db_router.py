@@ -0,0 +1,184 @@
+"""
+Read-replica routing.
+Sends reads from safe-method requests and analytics jobs to the replicas
+in DB_REPLICAS, and everything else to the primary. A client that has
+just written is pinned to the primary for DB_REPLICA_STICKY_SECONDS, by
+cookie and, for token-authenticated users, by a cache entry, so its own
+changes are visible on the next request.
+"""
+
+import base64
+import json
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+
+PRIMARY = 'default'
+PIN_COOKIE = 'db_primary_until'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+class RoutingState:
+    __slots__ = ('use_replica', 'wrote')
+
+    def __init__(self, use_replica):
+        self.use_replica = use_replica
+        self.wrote = False
+
+
+_state = ContextVar('db_routing_state', default=None)
+
+
+def replica_aliases():
+    return [alias for alias in settings.DATABASES if alias.startswith('replica')]
+
+
+@contextmanager
+def replica_reads():
+    """Route reads in this block to a replica (for reports and background aggregation)."""
+    token = _state.set(RoutingState(use_replica=True))
+    try:
+        yield
+    finally:
+        _state.reset(token)
+
+
+@contextmanager
+def primary_reads():
+    """Route reads in this block to the primary, e.g. right after a write."""
+    token = _state.set(RoutingState(use_replica=False))
+    try:
+        yield
+    finally:
+        _state.reset(token)
+
+
+class PrimaryReplicaRouter:
+    """
+    Database router for DATABASE_ROUTERS. Reads go to a random replica
+    only inside replica_reads() or a request ReplicaRoutingMiddleware
+    marked as replica-safe, and never after a write in the same context.
+    """
+
+    def db_for_read(self, model, **hints):
+        instance = hints.get('instance')
+        if instance is not None and instance._state.db:
+            # Related lookups stay on the database the instance came from
+            return instance._state.db
+        state = _state.get()
+        if state is None or not state.use_replica or state.wrote:
+            return PRIMARY
+        replicas = replica_aliases()
+        return random.choice(replicas) if replicas else PRIMARY
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state.wrote = True
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return None
+
+
+# ============================================================
+# Middleware
+# ============================================================
+
+def _token_user_id(request):
+    """
+    User id claim from a Bearer JWT, read without verifying it. Only used
+    to pin reads to the primary, which is harmless if the token is forged.
+    """
+    header = request.META.get('HTTP_AUTHORIZATION', '')
+    if not header.startswith('Bearer '):
+        return None
+    try:
+        payload = header[7:].split('.')[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4)))
+        return claims.get(settings.SIMPLE_JWT.get('USER_ID_CLAIM', 'user_id'))
+    except (IndexError, ValueError, AttributeError):
+        return None
+
+
+def _pin_key(user_id):
+    return f'db:primary-pin:{user_id}'
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Marks safe-method requests as replica-safe unless the client is pinned
+    to the primary, and pins clients whose unsafe request wrote.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not replica_aliases():
+            return self.get_response(request)
+
+        user_id = _token_user_id(request)
+        state = RoutingState(
+            use_replica=request.method in SAFE_METHODS and not self.is_pinned(request, user_id)
+        )
+        token = _state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _state.reset(token)
+
+        if state.wrote and request.method not in SAFE_METHODS:
+            self.pin(response, user_id)
+        return response
+
+    async def __acall__(self, request):
+        if not replica_aliases():
+            return await self.get_response(request)
+
+        user_id = _token_user_id(request)
+        pinned = await sync_to_async(self.is_pinned)(request, user_id)
+        state = RoutingState(use_replica=request.method in SAFE_METHODS and not pinned)
+        # Context variables follow the request into sync_to_async threads
+        token = _state.set(state)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _state.reset(token)
+
+        if state.wrote and request.method not in SAFE_METHODS:
+            await sync_to_async(self.pin)(response, user_id)
+        return response
+
+    def is_pinned(self, request, user_id):
+        try:
+            if float(request.COOKIES.get(PIN_COOKIE, 0)) > time.time():
+                return True
+        except ValueError:
+            pass
+        return user_id is not None and cache.get(_pin_key(user_id)) is not None
+
+    def pin(self, response, user_id):
+        seconds = settings.DB_REPLICA_STICKY_SECONDS
+        response.set_cookie(
+            PIN_COOKIE, f'{time.time() + seconds:.0f}', max_age=seconds,
+            httponly=True, samesite='Lax', secure=not settings.DEBUG,
+        )
+        if user_id is not None:
+            cache.set(_pin_key(user_id), 1, seconds)
@@ -0,0 +1,268 @@
+"""
+Sparse fieldsets and field expansion for read APIs.
+GET ?fields=id,title,author.username limits a response to the listed
+fields, dotted paths reaching into nested objects, and ?expand=author
+keeps an expandable relation as a nested object: with ?fields=, relations
+neither named in ?expand= nor given subfields (author.username implies
+expand=author) are returned as primary keys. Without ?fields= the
+response is unchanged.
+
+sparse_queryset() turns the same request into select_related,
+prefetch_related and only() calls, so unrequested relations and columns
+are never loaded.
+"""
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+
+FIELDS_PARAM = 'fields'
+EXPAND_PARAM = 'expand'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+def _tree(value):
+    """'a,b.c' -> {'a': {}, 'b': {'c': {}}}"""
+    tree = {}
+    for path in value.split(','):
+        node = tree
+        for part in path.strip().split('.'):
+            if part:
+                node = node.setdefault(part, {})
+    return tree
+
+
+def _imply_expand(fields, expand):
+    """Expand every field that has subfields listed, at any depth."""
+    for name, subfields in fields.items():
+        if subfields:
+            _imply_expand(subfields, expand.setdefault(name, {}))
+    return expand
+
+
+def parse_fieldset(request):
+    """(fields, expand) trees for a request; fields is None when not restricted."""
+    if request is None or request.method not in SAFE_METHODS:
+        return None, {}
+    params = getattr(request, 'query_params', request.GET)
+    fields = _tree(params.get(FIELDS_PARAM, '')) or None
+    expand = _tree(params.get(EXPAND_PARAM, ''))
+    return fields, _imply_expand(fields, expand) if fields else expand
+
+
+def _collapse(value):
+    """Expanded payload -> primary key(s), for documents rendered in advance."""
+    if isinstance(value, dict):
+        return value.get('id')
+    if isinstance(value, list):
+        return [item.get('id') if isinstance(item, dict) else item for item in value]
+    return value
+
+
+def _prune_value(value, subfields, collapse):
+    """One already-serialized field: primary key(s) when collapsed, else its subfields."""
+    if collapse:
+        return _collapse(value)
+    if subfields and isinstance(value, dict):
+        return {key: value[key] for key in subfields if key in value}
+    if subfields and isinstance(value, list):
+        return [{key: item[key] for key in subfields if key in item} for item in value]
+    return value
+
+
+def prune_data(data, fieldset, expandable_fields=()):
+    """Apply a parsed fieldset to already-serialized data (a dict)."""
+    fields, expand = fieldset
+    if fields is None:
+        return data
+    return {
+        name: _prune_value(data[name], subfields, name in expandable_fields and name not in expand)
+        for name, subfields in fields.items()
+        if name in data
+    }
+
+
+class SparseFieldsMixin:
+    """
+    Serializer mixin applying ?fields= and ?expand=. The top-level
+    serializer reads them from the request; nested serializers with this
+    mixin get their part of the fieldset from their parent.
+
+    expandable_fields: nested relations returned as primary keys unless expanded.
+    field_dependencies: {field: [ORM paths]} for fields whose source is not a
+    model field (properties, method fields, extra keys added in
+    to_representation); sparse_queryset() loads every column when a
+    requested field has none declared.
+    """
+    expandable_fields = ()
+    field_dependencies = {}
+
+    @property
+    def fieldset(self):
+        if not hasattr(self, '_fieldset'):
+            parent = self.parent
+            if parent is None or (isinstance(parent, serializers.ListSerializer) and parent.parent is None):
+                self._fieldset = parse_fieldset(self.context.get('request'))
+            else:
+                self._fieldset = (None, {})
+        return self._fieldset
+
+    def is_requested(self, name):
+        fields = self.fieldset[0]
+        return fields is None or name in fields
+
+    def get_fields(self):
+        all_fields = super().get_fields()
+        fields, expand = self.fieldset
+        if fields is None:
+            return all_fields
+        selected = {}
+        for name, field in all_fields.items():
+            if name not in fields:
+                continue
+            collapse = name in self.expandable_fields and name not in expand
+            if isinstance(field, serializers.SerializerMethodField):
+                # Already-serialized output: pruned as prune_data() would
+                if collapse or fields[name]:
+                    field = _PrunedMethodField(field.method_name, fields[name], collapse)
+            elif collapse:
+                field = self._collapsed(field)
+            else:
+                target = getattr(field, 'child', field)
+                if isinstance(target, SparseFieldsMixin):
+                    target._fieldset = (fields[name] or None, expand.get(name, {}))
+            selected[name] = field
+        return selected
+
+    def _collapsed(self, field):
+        kwargs = {'read_only': True}
+        if field.source:
+            kwargs['source'] = field.source
+        if isinstance(field, serializers.ListSerializer):
+            return serializers.PrimaryKeyRelatedField(many=True, **kwargs)
+        if isinstance(field, serializers.BaseSerializer):
+            return serializers.PrimaryKeyRelatedField(**kwargs)
+        return field
+
+
+class _PrunedMethodField(serializers.SerializerMethodField):
+    """SerializerMethodField whose result is pruned like a pre-rendered document."""
+
+    def __init__(self, method_name, subfields, collapse):
+        self.subfields = subfields
+        self.collapse = collapse
+        super().__init__(method_name=method_name)
+
+    def to_representation(self, value):
+        return _prune_value(super().to_representation(value), self.subfields, self.collapse)
+
+
+def sparse_queryset(queryset, serializer):
+    """
+    Restrict queryset to what serializer (a SparseFieldsMixin, with the
+    request in its context) will read. Returns queryset unchanged when the
+    request has no ?fields=.
+    """
+    if not isinstance(serializer, SparseFieldsMixin) or serializer.fieldset[0] is None:
+        return queryset
+    plan = _plan(queryset.model, serializer)
+
+    queryset = queryset.select_related(None).prefetch_related(None)
+    if plan.select:
+        queryset = queryset.select_related(*plan.select)
+    if plan.prefetch:
+        queryset = queryset.prefetch_related(*plan.prefetch.values())
+    if plan.complete:
+        queryset = queryset.only(*plan.only)
+    return queryset
+
+
+def _plan(model, serializer):
+    """The _Plan for the fields serializer will output from model."""
+    plan = _Plan(model)
+    requested = dict(serializer.fields)
+    fields = serializer.fieldset[0]
+    for name in serializer.field_dependencies:
+        if name not in requested and (fields is None or name in fields):
+            requested[name] = None
+    for name, field in requested.items():
+        if field is not None and field.write_only:
+            continue
+        paths = serializer.field_dependencies.get(name)
+        if paths is None:
+            if field.source == '*':
+                plan.complete = False
+                continue
+            paths = ['__'.join(field.source_attrs)]
+        if isinstance(field, SparseFieldsMixin) and plan.add_nested(paths[0], field):
+            continue
+        nested = isinstance(field, serializers.BaseSerializer)
+        for path in paths:
+            plan.add(path, nested)
+    return plan
+
+
+class _Plan:
+    def __init__(self, model):
+        self.model = model
+        self.only = {model._meta.pk.name}
+        self.select = set()
+        self.prefetch = {}
+        self.complete = True
+
+    def add(self, path, nested):
+        name, _, rest = path.partition('__')
+        try:
+            field = self.model._meta.get_field(name)
+        except FieldDoesNotExist:
+            # A property or method: its columns are unknown
+            self.complete = False
+            return
+        if field.many_to_many or field.one_to_many:
+            if nested or rest:
+                self.prefetch[name] = name
+            else:
+                # Collapsed to primary keys
+                self.prefetch.setdefault(name, Prefetch(name, queryset=field.related_model._default_manager.only('pk')))
+        elif field.one_to_one and not field.concrete:
+            # Reverse one-to-one: only() cannot name it, so load the related row whole
+            self.select.add(name)
+            self.only.update(
+                f'{name}__{related_field.name}'
+                for related_field in field.related_model._meta.concrete_fields
+            )
+        elif field.is_relation:
+            self.only.add(name)
+            if nested or rest:
+                self.select.add(name)
+                if rest:
+                    self.only.add(path)
+        else:
+            self.only.add(name)
+
+    def add_nested(self, name, serializer):
+        """
+        Join a forward foreign key or one-to-one shown by a nested
+        serializer, loading only the columns that serializer reads.
+        False if name is not such a relation.
+        """
+        try:
+            field = self.model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return False
+        if not (field.concrete and (field.many_to_one or field.one_to_one)):
+            return False
+        nested = _plan(field.related_model, serializer)
+        self.only.add(name)
+        self.select.add(name)
+        self.select.update(f'{name}__{path}' for path in nested.select)
+        for lookup, prefetch in nested.prefetch.items():
+            if isinstance(prefetch, Prefetch):
+                prefetch = Prefetch(f'{name}__{lookup}', queryset=prefetch.queryset)
+            else:
+                prefetch = f'{name}__{prefetch}'
+            self.prefetch[f'{name}__{lookup}'] = prefetch
+        if nested.complete:
+            # Otherwise the related row is loaded whole
+            self.only.update(f'{name}__{path}' for path in nested.only)
+        return True
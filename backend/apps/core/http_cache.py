@@ -0,0 +1,61 @@
+"""
+HTTP caching for public endpoints.
+Conditional GET support from validators the view computes without
+rendering the body, plus Cache-Control and Surrogate-Key headers so a
+downstream cache (CDN, Varnish) can store responses and purge them by key.
+"""
+
+from django.conf import settings
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+
+class ConditionalGetMixin:
+    """
+    For generic views: get_validators() returns (etag, last_modified) for
+    the request, either of which may be None. A matching If-None-Match or
+    If-Modified-Since gets 304 Not Modified without calling the view.
+    ETags are weak: fields like view_count may change without changing them.
+    shared_max_age overrides PUBLIC_CACHE_S_MAXAGE; 0 makes shared caches
+    revalidate every request, for views that count their requests.
+    """
+    surrogate_keys = ()
+    shared_max_age = None
+
+    def get_validators(self, request, *args, **kwargs):
+        return None, None
+
+    def get_surrogate_keys(self):
+        return list(self.surrogate_keys)
+
+    def get(self, request, *args, **kwargs):
+        etag, last_modified = self.get_validators(request, *args, **kwargs)
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        response = None
+        if etag or timestamp:
+            response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            if etag:
+                response.headers['ETag'] = etag
+            if timestamp:
+                response.headers['Last-Modified'] = http_date(timestamp)
+            self.add_cache_headers(response)
+        return response
+
+    def add_cache_headers(self, response):
+        # Browsers revalidate every time; shared caches may hold the response briefly
+        patch_cache_control(
+            response,
+            public=True,
+            max_age=settings.PUBLIC_CACHE_MAX_AGE,
+            s_maxage=settings.PUBLIC_CACHE_S_MAXAGE if self.shared_max_age is None else self.shared_max_age,
+        )
+        keys = self.get_surrogate_keys()
+        if keys:
+            response.headers['Surrogate-Key'] = ' '.join(keys)
+
+
+def weak_etag(*parts):
+    return 'W/"{}"'.format('-'.join(str(part) for part in parts))
@@ -0,0 +1,333 @@
+"""
+Synthetic data generation for load testing.
+Builds users, blogs, comment trees and blog views with skewed (Zipfian)
+popularity. Rows are generated in independent chunks with explicit ids so
+chunks can be written in parallel, using COPY on PostgreSQL and
+bulk_create elsewhere.
+"""
+
+import bisect
+import csv
+import io
+import json
+import random
+from datetime import timedelta
+from functools import lru_cache
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.color import no_style
+from django.db import connection, models
+from django.utils import timezone
+from django.utils.text import slugify
+
+
+LOAD_EMAIL_DOMAIN = 'load.test'
+LOAD_PASSWORD = 'loadtest-password'
+
+FIRST_NAMES = [
+    'james', 'mary', 'john', 'patricia', 'robert', 'jennifer', 'michael', 'linda',
+    'william', 'elizabeth', 'david', 'barbara', 'richard', 'susan', 'joseph', 'jessica',
+    'thomas', 'sarah', 'charles', 'karen', 'priya', 'wei', 'ahmed', 'olga', 'kenji',
+    'fatima', 'lucas', 'sofia', 'mateo', 'amara', 'noah', 'aiko', 'ivan', 'chloe',
+]
+LAST_NAMES = [
+    'smith', 'johnson', 'williams', 'brown', 'jones', 'garcia', 'miller', 'davis',
+    'rodriguez', 'martinez', 'hernandez', 'lopez', 'gonzalez', 'wilson', 'anderson',
+    'thomas', 'taylor', 'moore', 'jackson', 'martin', 'patel', 'chen', 'khan', 'ivanova',
+    'nakamura', 'okafor', 'silva', 'novak', 'kowalski', 'haddad',
+]
+POSITIONS = [
+    'Software Engineer', 'Product Designer', 'Engineering Manager', 'Data Analyst',
+    'DevOps Engineer', 'Technical Writer', 'QA Engineer', 'Solutions Architect',
+]
+CATEGORY_NAMES = [
+    'Engineering', 'Design', 'Product', 'Data Science', 'DevOps', 'Security',
+    'Career', 'Culture', 'Tutorials', 'Announcements', 'Mobile', 'Frontend',
+    'Backend', 'Cloud', 'Open Source', 'Testing', 'Performance', 'AI', 'Databases', 'Research',
+]
+WORDS = (
+    'system design performance latency cache database query index scale throughput '
+    'python django api service deploy release team review incident metric trace '
+    'frontend backend mobile cloud queue worker storage network security token user '
+    'feature product design pattern refactor migration schema model view render'
+).split()
+
+# (weight, user agent, device type, browser, operating system)
+USER_AGENTS = [
+    (40, 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) '
+         'Chrome/120.0.0.0 Safari/537.36', 'desktop', 'Chrome', 'Windows'),
+    (20, 'Mozilla/5.0 (iPhone; CPU iPhone OS 17_1 like Mac OS X) AppleWebKit/605.1.15 '
+         '(KHTML, like Gecko) Version/17.1 Mobile/15E148 Safari/604.1', 'mobile', 'Safari', 'iOS'),
+    (15, 'Mozilla/5.0 (Linux; Android 14; Pixel 8) AppleWebKit/537.36 (KHTML, like Gecko) '
+         'Chrome/120.0.0.0 Mobile Safari/537.36', 'mobile', 'Chrome', 'Android'),
+    (10, 'Mozilla/5.0 (Macintosh; Intel Mac OS X 14_1) AppleWebKit/605.1.15 (KHTML, like Gecko) '
+         'Version/17.1 Safari/605.1.15', 'desktop', 'Safari', 'macOS'),
+    (6, 'Mozilla/5.0 (X11; Linux x86_64; rv:121.0) Gecko/20100101 Firefox/121.0',
+        'desktop', 'Firefox', 'Linux'),
+    (5, 'Mozilla/5.0 (iPad; CPU OS 17_1 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) '
+        'Version/17.1 Mobile/15E148 Safari/604.1', 'tablet', 'Safari', 'iOS'),
+    (4, 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) '
+        'Chrome/120.0.0.0 Safari/537.36 Edg/120.0.0.0', 'desktop', 'Edge', 'Windows'),
+]
+REFERRERS = ['', '', '', 'https://www.google.com/', 'https://news.ycombinator.com/',
+             'https://twitter.com/', 'https://www.linkedin.com/']
+
+STAFF_FRACTION = 0.02
+DRAFT_FRACTION = 0.1
+REPLY_FRACTION = 0.3
+AUTHENTICATED_VIEW_FRACTION = 0.2
+ZIPF_EXPONENT = 1.1
+
+
+@lru_cache(maxsize=4)
+def zipf_popularity(count, seed, exponent=ZIPF_EXPONENT):
+    """
+    (cumulative weights by rank, index for each rank) for `count` items.
+    Rank 1 is the most popular; ranks are shuffled onto item indexes.
+    """
+    cumulative, total = [], 0.0
+    for rank in range(1, count + 1):
+        total += 1 / rank ** exponent
+        cumulative.append(total)
+    indexes = list(range(count))
+    random.Random(seed).shuffle(indexes)
+    return cumulative, indexes
+
+
+def pick_popular(rng, popularity):
+    cumulative, indexes = popularity
+    rank = bisect.bisect_left(cumulative, rng.random() * cumulative[-1])
+    return indexes[min(rank, len(indexes) - 1)]
+
+
+def zipf_shares(total, count, seed):
+    """Split `total` across `count` items following their popularity."""
+    cumulative, indexes = zipf_popularity(count, seed)
+    shares = [0] * count
+    previous = 0.0
+    for rank, weight in enumerate(cumulative):
+        shares[indexes[rank]] = round(total * (weight - previous) / cumulative[-1])
+        previous = weight
+    return shares
+
+
+def sentence(rng, low, high):
+    return ' '.join(rng.choice(WORDS) for _ in range(rng.randint(low, high))).capitalize()
+
+
+# ============================================================
+# Writing
+# ============================================================
+
+def _copy_value(field, value):
+    if value is None:
+        return '\\N'
+    if isinstance(field, models.JSONField):
+        return json.dumps(value)
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return str(value)
+
+
+def write_rows(model, objs, keep_timestamps=(), batch_size=5000):
+    """
+    Insert unsaved model instances; COPY on PostgreSQL, bulk_create elsewhere.
+    `keep_timestamps` names auto_now_add fields whose generated values
+    should be written instead of the current time.
+    """
+    if not objs:
+        return
+    kept = [model._meta.get_field(name) for name in keep_timestamps]
+    for field in kept:
+        field.auto_now_add = False
+    try:
+        if connection.vendor == 'postgresql':
+            _copy_rows(model, objs)
+        else:
+            model.objects.bulk_create(objs, batch_size=batch_size)
+    finally:
+        for field in kept:
+            field.auto_now_add = True
+
+
+def _copy_rows(model, objs):
+    fields = [
+        field for field in model._meta.concrete_fields
+        if not (field.primary_key and objs[0].pk is None)
+    ]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for obj in objs:
+        row = []
+        for field in fields:
+            value = field.pre_save(obj, True)
+            if not isinstance(field, models.JSONField):
+                value = field.get_db_prep_save(value, connection)
+            row.append(_copy_value(field, value))
+        writer.writerow(row)
+    buffer.seek(0)
+
+    columns = ', '.join(connection.ops.quote_name(field.column) for field in fields)
+    with connection.cursor() as cursor:
+        cursor.cursor.copy_expert(
+            f"COPY {connection.ops.quote_name(model._meta.db_table)} ({columns}) "
+            f"FROM STDIN WITH (FORMAT csv, NULL '\\N')",
+            buffer,
+        )
+
+
+def reset_sequences(*model_classes):
+    """Move id sequences past explicitly assigned ids (PostgreSQL)."""
+    statements = connection.ops.sequence_reset_sql(no_style(), model_classes)
+    if statements:
+        with connection.cursor() as cursor:
+            for statement in statements:
+                cursor.execute(statement)
+
+
+# ============================================================
+# Chunk generators (run in worker processes)
+# ============================================================
+
+def generate_users(start, stop, plan):
+    """Users, profiles and search tokens for user indexes start..stop."""
+    from apps.users.models import User, UserProfile, UserRole, UserSearchToken
+    from apps.users.search import make_search_token_rows
+
+    rng = random.Random(plan['seed'] * 1_000_003 + start)
+    now = timezone.now()
+    users, profiles = [], []
+    for index in range(start, stop):
+        user_id = plan['user_base'] + index
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        if index == 0:
+            role = UserRole.ADMIN
+        elif index < plan['staff_count']:
+            role = UserRole.STAFF
+        else:
+            role = UserRole.CUSTOMER
+        users.append(User(
+            id=user_id,
+            email=f'load{user_id}@{LOAD_EMAIL_DOMAIN}',
+            username=f'{first}{last}{user_id}',
+            first_name=first.title(),
+            last_name=last.title(),
+            position=rng.choice(POSITIONS) if role != UserRole.CUSTOMER else '',
+            role=role,
+            is_staff=role == UserRole.ADMIN,
+            is_verified=rng.random() < 0.8,
+            password=plan['password_hash'],
+            date_joined=now - timedelta(seconds=rng.randint(0, 3 * 365 * 86400)),
+        ))
+        profiles.append(UserProfile(
+            user_id=user_id,
+            department=rng.choice(CATEGORY_NAMES) if role != UserRole.CUSTOMER else '',
+            experience_years=rng.randint(0, 25) if role != UserRole.CUSTOMER else 0,
+        ))
+
+    write_rows(User, users)
+    write_rows(UserProfile, profiles)
+    write_rows(UserSearchToken, [token for user in users for token in make_search_token_rows(user)])
+    return len(users)
+
+
+def generate_blogs(start, stop, plan):
+    """Blogs and their tags for blog indexes start..stop."""
+    from apps.blogs.models import Blog, BlogStatus
+
+    rng = random.Random(plan['seed'] * 2_000_003 + start)
+    authors = zipf_popularity(plan['staff_count'], plan['seed'] + 1)
+    now = timezone.now()
+    blogs, blog_tags = [], []
+    for index in range(start, stop):
+        blog_id = plan['blog_base'] + index
+        title = sentence(rng, 4, 10)
+        published = rng.random() >= DRAFT_FRACTION
+        created_at = now - timedelta(seconds=rng.randint(0, 2 * 365 * 86400))
+        paragraphs = [sentence(rng, 40, 120) + '.' for _ in range(rng.randint(3, 12))]
+        blogs.append(Blog(
+            id=blog_id,
+            title=title,
+            slug=f'{slugify(title)[:200]}-{blog_id}',
+            excerpt=paragraphs[0][:300],
+            content='\n\n'.join(f'<p>{paragraph}</p>' for paragraph in paragraphs),
+            author_id=plan['user_base'] + pick_popular(rng, authors),
+            category_id=rng.choice(plan['category_ids']),
+            status=BlogStatus.PUBLISHED if published else BlogStatus.DRAFT,
+            is_featured=rng.random() < 0.01,
+            created_at=created_at,
+            published_at=created_at if published else None,
+        ))
+        for tag_id in rng.sample(plan['tag_ids'], rng.randint(1, 5)):
+            blog_tags.append(Blog.tags.through(blog_id=blog_id, tag_id=tag_id))
+
+    write_rows(Blog, blogs, keep_timestamps=['created_at'])
+    write_rows(Blog.tags.through, blog_tags)
+    return len(blogs)
+
+
+def generate_comments(start, stop, plan, counts, first_comment_id):
+    """Comment trees for blog indexes start..stop; `counts` is per blog."""
+    from apps.blogs.models import BlogComment
+
+    rng = random.Random(plan['seed'] * 3_000_003 + start)
+    now = timezone.now()
+    comments = []
+    comment_id = first_comment_id
+    for index, count in zip(range(start, stop), counts):
+        thread = []
+        for _ in range(count):
+            parent_id = rng.choice(thread) if thread and rng.random() < REPLY_FRACTION else None
+            comments.append(BlogComment(
+                id=comment_id,
+                blog_id=plan['blog_base'] + index,
+                author_id=plan['user_base'] + rng.randrange(plan['users']),
+                parent_id=parent_id,
+                content=sentence(rng, 5, 60) + '.',
+                is_approved=rng.random() < 0.95,
+                created_at=now - timedelta(seconds=rng.randint(0, 365 * 86400)),
+            ))
+            thread.append(comment_id)
+            comment_id += 1
+
+    write_rows(BlogComment, comments, keep_timestamps=['created_at'])
+    return len(comments)
+
+
+def generate_views(start, stop, plan):
+    """Blog views start..stop; returns {blog_id: views} for view_count."""
+    from apps.analytics.models import BlogView
+
+    rng = random.Random(plan['seed'] * 4_000_003 + start)
+    popularity = zipf_popularity(plan['blogs'], plan['seed'])
+    ua_weights = [entry[0] for entry in USER_AGENTS]
+    now = timezone.now()
+    counts = {}
+    views = []
+    for _ in range(start, stop):
+        blog_id = plan['blog_base'] + pick_popular(rng, popularity)
+        _, user_agent, device_type, browser, operating_system = rng.choices(USER_AGENTS, ua_weights)[0]
+        signed_in = rng.random() < AUTHENTICATED_VIEW_FRACTION
+        views.append(BlogView(
+            blog_id=blog_id,
+            user_id=plan['user_base'] + rng.randrange(plan['users']) if signed_in else None,
+            ip_address=f'{rng.randint(1, 223)}.{rng.randint(0, 255)}.{rng.randint(0, 255)}.{rng.randint(1, 254)}',
+            user_agent=user_agent,
+            referrer=rng.choice(REFERRERS),
+            device_type=device_type,
+            browser=browser,
+            operating_system=operating_system,
+            session_duration=int(rng.expovariate(1 / 90)),
+            viewed_at=now - timedelta(seconds=rng.randint(0, 90 * 86400)),
+        ))
+        counts[blog_id] = counts.get(blog_id, 0) + 1
+
+    write_rows(BlogView, views, keep_timestamps=['viewed_at'])
+    return counts
+
+
+def password_hash():
+    """One shared hash so every generated user can log in with LOAD_PASSWORD."""
+    return make_password(LOAD_PASSWORD)
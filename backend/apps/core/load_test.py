@@ -0,0 +1,371 @@
+"""
+Load-test driver.
+A small asyncio HTTP/1.1 client, virtual-user sessions, and per-endpoint
+latency recording for the run_load_test command. Scenarios live next to
+the apps they exercise, in apps/<app>/load_scenarios.py, and register
+themselves with the @scenario and @setup decorators below.
+"""
+
+import asyncio
+import bisect
+import json
+import math
+import random
+import time
+from dataclasses import dataclass
+from importlib import import_module
+from urllib.parse import urlencode, urlsplit
+
+from django.apps import apps
+
+from . import load_data
+
+SCENARIO_MODULE = 'load_scenarios'
+
+# name -> Scenario, filled in by discover_scenarios()
+SCENARIOS = {}
+# Callables that add entries to the shared context before the run
+SETUP_HOOKS = []
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    weight: int
+    func: object
+
+
+def scenario(weight=1, name=None):
+    """Register an async scenario function `func(session)` with a relative weight."""
+    def decorator(func):
+        scenario_name = name or func.__name__
+        SCENARIOS[scenario_name] = Scenario(scenario_name, weight, func)
+        return func
+    return decorator
+
+
+def setup(func):
+    """Register `func(context)`, run once against the database before traffic starts."""
+    SETUP_HOOKS.append(func)
+    return func
+
+
+def discover_scenarios():
+    """Import load_scenarios from every project app."""
+    for app_config in apps.get_app_configs():
+        if not app_config.name.startswith('apps.'):
+            continue
+        module_name = f'{app_config.name}.{SCENARIO_MODULE}'
+        try:
+            import_module(module_name)
+        except ModuleNotFoundError as exc:
+            if exc.name != module_name:
+                raise
+    return SCENARIOS
+
+
+def build_context(seed):
+    context = {'seed': seed}
+    for hook in SETUP_HOOKS:
+        hook(context)
+    return context
+
+
+def pick_ranked(rng, items, seed=0):
+    """Pick from items ordered most popular first, with Zipfian skew."""
+    cumulative, _ = load_data.zipf_popularity(len(items), seed)
+    rank = bisect.bisect_left(cumulative, rng.random() * cumulative[-1])
+    return items[min(rank, len(items) - 1)]
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    index = math.ceil(fraction * len(sorted_values)) - 1
+    return sorted_values[max(0, min(index, len(sorted_values) - 1))]
+
+
+# ============================================================
+# HTTP client
+# ============================================================
+
+class HTTPError(Exception):
+    pass
+
+
+class Response:
+    __slots__ = ('status', 'headers', 'body')
+
+    def __init__(self, status, headers, body):
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+    def json(self):
+        try:
+            return json.loads(self.body)
+        except ValueError:
+            return None
+
+
+class HTTPConnection:
+    """One keep-alive HTTP/1.1 connection; reconnects when the server closes it."""
+
+    def __init__(self, host, port, timeout=30):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.reader = None
+        self.writer = None
+
+    async def request(self, method, target, headers, body=b''):
+        for attempt in (0, 1):
+            reused = self.writer is not None
+            if not reused:
+                self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+            try:
+                return await asyncio.wait_for(self._exchange(method, target, headers, body), self.timeout)
+            except (ConnectionError, asyncio.IncompleteReadError) as exc:
+                self.close()
+                # A kept-alive socket may have been closed by the server
+                # between requests; retry once on a fresh connection
+                if not reused or attempt:
+                    raise HTTPError(str(exc) or exc.__class__.__name__) from exc
+            except BaseException:
+                self.close()
+                raise
+
+    async def _exchange(self, method, target, headers, body):
+        lines = [f'{method} {target} HTTP/1.1', f'Host: {self.host}:{self.port}',
+                 f'Content-Length: {len(body)}']
+        lines.extend(f'{key}: {value}' for key, value in headers.items())
+        self.writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body)
+        await self.writer.drain()
+
+        status_line = await self.reader.readuntil(b'\r\n')
+        try:
+            status = int(status_line.split(b' ', 2)[1])
+        except (IndexError, ValueError):
+            raise HTTPError(f'Malformed status line: {status_line!r}')
+        response_headers = {}
+        while True:
+            line = await self.reader.readuntil(b'\r\n')
+            if line == b'\r\n':
+                break
+            key, _, value = line.decode('latin-1').partition(':')
+            response_headers[key.strip().lower()] = value.strip()
+
+        if method == 'HEAD' or status in (204, 304) or 100 <= status < 200:
+            response_body = b''
+        elif response_headers.get('transfer-encoding', '').lower() == 'chunked':
+            response_body = await self._read_chunked()
+        elif 'content-length' in response_headers:
+            response_body = await self.reader.readexactly(int(response_headers['content-length']))
+        else:
+            response_body = await self.reader.read()
+            response_headers['connection'] = 'close'
+
+        if response_headers.get('connection', '').lower() == 'close':
+            self.close()
+        return Response(status, response_headers, response_body)
+
+    async def _read_chunked(self):
+        chunks = []
+        while True:
+            size = int((await self.reader.readuntil(b'\r\n')).split(b';')[0], 16)
+            if size == 0:
+                # Trailers, then the final blank line
+                while await self.reader.readuntil(b'\r\n') != b'\r\n':
+                    pass
+                return b''.join(chunks)
+            chunks.append(await self.reader.readexactly(size))
+            await self.reader.readexactly(2)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+
+# ============================================================
+# Recording
+# ============================================================
+
+class Recorder:
+    """Latencies and statuses per endpoint label, ignoring anything before start()."""
+
+    def __init__(self):
+        self.recording = False
+        self.started = None
+        self.stopped = None
+        self.endpoints = {}
+
+    def start(self):
+        self.endpoints.clear()
+        self.recording = True
+        self.started = time.perf_counter()
+
+    def stop(self):
+        self.recording = False
+        self.stopped = time.perf_counter()
+
+    def record(self, name, duration, status=None, error=None):
+        if not self.recording:
+            return
+        endpoint = self.endpoints.setdefault(name, {'latencies': [], 'statuses': {}, 'errors': 0})
+        endpoint['latencies'].append(duration)
+        key = str(status) if status is not None else 'error'
+        endpoint['statuses'][key] = endpoint['statuses'].get(key, 0) + 1
+        if error is not None or (status is not None and status >= 500):
+            endpoint['errors'] += 1
+
+    def _summary(self, latencies, requests, errors, elapsed):
+        latencies = sorted(latencies)
+        return {
+            'requests': requests,
+            'errors': errors,
+            'throughput_rps': round(requests / elapsed, 2),
+            'mean_ms': round(sum(latencies) / len(latencies) * 1000, 2) if latencies else None,
+            'p50_ms': round(percentile(latencies, 0.50) * 1000, 2) if latencies else None,
+            'p95_ms': round(percentile(latencies, 0.95) * 1000, 2) if latencies else None,
+            'p99_ms': round(percentile(latencies, 0.99) * 1000, 2) if latencies else None,
+            'max_ms': round(latencies[-1] * 1000, 2) if latencies else None,
+        }
+
+    def report(self):
+        elapsed = max((self.stopped or time.perf_counter()) - self.started, 1e-9)
+        endpoints, all_latencies, total_errors = {}, [], 0
+        for name, endpoint in sorted(self.endpoints.items()):
+            latencies = endpoint['latencies']
+            summary = self._summary(latencies, len(latencies), endpoint['errors'], elapsed)
+            summary['statuses'] = dict(sorted(endpoint['statuses'].items()))
+            endpoints[name] = summary
+            all_latencies.extend(latencies)
+            total_errors += endpoint['errors']
+        return {
+            'elapsed_s': round(elapsed, 2),
+            'totals': self._summary(all_latencies, len(all_latencies), total_errors, elapsed),
+            'endpoints': endpoints,
+        }
+
+
+# ============================================================
+# Virtual users
+# ============================================================
+
+class Session:
+    """
+    One virtual user: a keep-alive connection, an optional login, and a
+    client IP sent as X-Forwarded-For, as a load balancer would, so per-IP
+    throttles see distinct visitors. The server only uses it when it
+    trusts a proxy (NUM_PROXIES=1, which run_load_test sets for the server
+    it starts); against --url, set that on the target or expect every
+    session to share one IP.
+    """
+
+    def __init__(self, base_url, recorder, context, rng):
+        parts = urlsplit(base_url)
+        self.prefix = parts.path.rstrip('/')
+        self.connection = HTTPConnection(parts.hostname, parts.port or 80)
+        self.recorder = recorder
+        self.context = context
+        self.rng = rng
+        self.role = None
+        self.access_token = None
+        self.new_ip()
+
+    def new_ip(self):
+        self.ip = f'10.{self.rng.randint(0, 255)}.{self.rng.randint(0, 255)}.{self.rng.randint(1, 254)}'
+
+    async def request(self, method, path, name, *, params=None, json_body=None, auth=True):
+        target = self.prefix + path
+        if params:
+            target += '?' + urlencode(params)
+        headers = {'Accept': 'application/json', 'X-Forwarded-For': self.ip}
+        body = b''
+        if json_body is not None:
+            body = json.dumps(json_body).encode()
+            headers['Content-Type'] = 'application/json'
+        if auth and self.access_token:
+            headers['Authorization'] = f'Bearer {self.access_token}'
+
+        start = time.perf_counter()
+        try:
+            response = await self.connection.request(method, target, headers, body)
+        except (HTTPError, OSError, asyncio.TimeoutError) as exc:
+            self.recorder.record(name, time.perf_counter() - start, error=exc)
+            return None
+        self.recorder.record(name, time.perf_counter() - start, status=response.status)
+        return response
+
+    async def get(self, path, name, **kwargs):
+        return await self.request('GET', path, name, **kwargs)
+
+    async def post(self, path, name, **kwargs):
+        return await self.request('POST', path, name, **kwargs)
+
+    async def login(self, role, name='auth:login'):
+        """Log in as a random generated user with `role`; False if none or it failed."""
+        emails = self.context.get('users', {}).get(role)
+        if not emails:
+            return False
+        self.logout()
+        response = await self.post('/api/auth/login/', name, auth=False, json_body={
+            'email': self.rng.choice(emails),
+            'password': load_data.LOAD_PASSWORD,
+        })
+        data = response.json() if response is not None and response.status == 200 else None
+        if not data or 'access' not in data:
+            return False
+        self.role, self.access_token = role, data['access']
+        return True
+
+    async def ensure_login(self, role):
+        if self.role == role and self.access_token:
+            return True
+        return await self.login(role)
+
+    def logout(self):
+        self.role = self.access_token = None
+
+    def close(self):
+        self.connection.close()
+
+
+async def virtual_user(index, base_url, scenarios, recorder, context, deadline, think_time, seed):
+    rng = random.Random(seed * 1_000_003 + index)
+    session = Session(base_url, recorder, context, rng)
+    weights = [item.weight for item in scenarios]
+    try:
+        while time.perf_counter() < deadline:
+            chosen = rng.choices(scenarios, weights)[0]
+            if session.access_token is None:
+                # Each anonymous visit is a new visitor to the per-IP throttles
+                session.new_ip()
+            try:
+                await chosen.func(session)
+            except Exception as exc:
+                recorder.record(f'scenario:{chosen.name}', 0.0, error=exc)
+            if think_time:
+                await asyncio.sleep(rng.expovariate(1 / think_time))
+    finally:
+        session.close()
+
+
+async def run(base_url, scenarios, context, *, concurrency, duration, warmup=0, think_time=0, seed=42):
+    """Drive `concurrency` virtual users for warmup + duration seconds; returns the report."""
+    recorder = Recorder()
+    deadline = time.perf_counter() + warmup + duration
+    users = [
+        asyncio.create_task(virtual_user(
+            index, base_url, scenarios, recorder, context, deadline, think_time, seed,
+        ))
+        for index in range(concurrency)
+    ]
+    # Requests made during the warmup are not recorded
+    await asyncio.sleep(warmup)
+    recorder.start()
+    await asyncio.gather(*users)
+    recorder.stop()
+    return recorder.report()
@@ -0,0 +1,95 @@
+"""
+Benchmark response compression.
+Usage: python manage.py bench_compression [--rounds 10] [--min-time 0.05]
+
+Runs CompressionMiddleware over fixed JSON payloads shaped like the blog
+API responses and reports, per payload and encoding, the bytes sent and
+the CPU time per request. The "padded" rows are ordinary responses,
+gzipped per request with random padding; the "cached" rows are compress_once responses
+answered from the compressed-bytes cache after the first request.
+"""
+
+import json
+
+from django.core.management.base import BaseCommand
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from apps.core import compression, microbench
+
+
+def _author(index):
+    return {'id': index, 'username': f'author{index}', 'first_name': 'Ada', 'last_name': 'Lovelace',
+            'full_name': 'Ada Lovelace', 'avatar': None, 'position': 'Software Engineer'}
+
+
+def _detail(size):
+    content = microbench.post_html(size)
+    return {
+        'id': 1, 'title': 'How We Cut p99 Latency in Half', 'slug': 'how-we-cut-p99-latency-in-half',
+        'excerpt': content[:300], 'content': content, 'featured_image': None, 'author': _author(1),
+        'category': {'id': 1, 'name': 'Engineering', 'slug': 'engineering'},
+        'tags': [{'id': tag, 'name': f'tag{tag}', 'slug': f'tag{tag}'} for tag in range(1, 4)],
+        'comments': [
+            {'id': index, 'author': _author(index), 'content': microbench.comment_text('typical'),
+             'created_at': '2024-01-15T12:00:00Z', 'replies': []}
+            for index in range(1, 6)
+        ],
+        'view_count': 1234, 'reading_time': 4, 'published_at': '2024-01-15T12:00:00Z',
+    }
+
+
+def _list_page():
+    results = []
+    for index in range(1, 21):
+        item = _detail('small')
+        del item['content'], item['comments']
+        item.update(id=index, slug=f'post-{index}', author=_author(index))
+        results.append(item)
+    return {'count': 500, 'next': 'http://localhost:8000/api/blogs/?page=2', 'previous': None,
+            'results': results}
+
+
+PAYLOADS = {
+    'tags': lambda: [{'id': tag, 'name': f'tag{tag}', 'slug': f'tag{tag}'} for tag in range(1, 11)],
+    'list_page': _list_page,
+    'detail[typical]': lambda: _detail('typical'),
+    'detail[large]': lambda: _detail('large'),
+}
+
+
+class Command(BaseCommand):
+    help = 'Measure bytes on the wire and CPU per request for each response encoding.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rounds', type=int, default=10)
+        parser.add_argument('--min-time', type=float, default=0.05, help='Minimum seconds per round')
+
+    def handle(self, *args, **options):
+        modes = [('identity', '', False)]
+        # Uncached responses are padded and negotiate only the paddable encodings
+        modes += [(f'{encoding} padded', encoding, False) for encoding in compression.PADDED_ENCODINGS]
+        modes += [(f'{encoding} cached', encoding, True) for encoding in compression.ENCODINGS]
+        if compression.brotli is None:
+            self.stderr.write(self.style.WARNING('brotli is not installed; only gzip is measured.'))
+
+        factory = RequestFactory()
+        self.stdout.write(f'{"payload":<18} {"encoding":<14} {"bytes":>10} {"ratio":>7} {"cpu us":>10}')
+        for name, build in PAYLOADS.items():
+            body = json.dumps(build(), separators=(',', ':')).encode()
+            for label, encoding, cached in modes:
+                request = factory.get('/api/blogs/', HTTP_ACCEPT_ENCODING=encoding)
+                middleware = compression.CompressionMiddleware(self._view(body, cached))
+                size = len(middleware(request).content)
+                # The first request above filled the cache for the cached mode
+                result = microbench.measure(lambda: middleware(request), options['rounds'], options['min_time'])
+                self.stdout.write(
+                    f'{name:<18} {label:<14} {size:>10,} {size / len(body):>7.1%} {result["median_us"]:>10,.1f}'
+                )
+
+    def _view(self, body, cached):
+        def view(request):
+            response = HttpResponse(body, content_type='application/json')
+            response.compress_once = cached
+            return response
+        return view
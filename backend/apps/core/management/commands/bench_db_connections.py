@@ -0,0 +1,123 @@
+"""
+Benchmark per-request database connection overhead.
+Usage: python manage.py bench_db_connections [--requests 500]
+
+Runs against a throwaway test database (a file on SQLite, so closing the
+connection really closes it). Serves the same API request with a new
+connection per request (CONN_MAX_AGE=0), with persistent connections,
+and with persistent connections plus health checks, and reports latency
+and how many connections each mode opened. The gap is largest on
+PostgreSQL over TLS, where every connect pays a handshake and auth.
+"""
+
+import os
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection
+from django.db.backends.signals import connection_created
+from django.test import Client
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from apps.core.sqlite import remove_wal_files
+
+MODES = [
+    ('reconnect', 0, False),
+    ('persistent', 600, False),
+    ('persistent+health', 600, True),
+]
+
+
+class Command(BaseCommand):
+    help = 'Compare new-connection-per-request with persistent connections.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=500)
+        parser.add_argument('--connects', type=int, default=200, help='Raw connect/close cycles to time')
+        parser.add_argument('--path', default='/api/blogs/tags/', help='Endpoint to request')
+
+    def handle(self, *args, **options):
+        if connection.vendor == 'sqlite':
+            connection.settings_dict['TEST']['NAME'] = str(
+                Path(tempfile.gettempdir()) / f'bench-connections-{os.getpid()}.sqlite3'
+            )
+        original = (connection.settings_dict['CONN_MAX_AGE'], connection.settings_dict['CONN_HEALTH_CHECKS'])
+
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            self._seed()
+            connect_ms = self._time_connects(options['connects'])
+            self.stdout.write(f'{connection.vendor}: connect + first query {connect_ms:.3f} ms on average\n')
+            self.stdout.write(
+                f'{"mode":<20} {"connects":>9} {"mean ms":>9} {"p50 ms":>9} {"p95 ms":>9} {"req/s":>9}'
+            )
+            for name, max_age, health_checks in MODES:
+                result = self._run_mode(max_age, health_checks, options['requests'], options['path'])
+                self.stdout.write(
+                    f'{name:<20} {result["connects"]:>9} {result["mean"]:>9.3f} {result["p50"]:>9.3f} '
+                    f'{result["p95"]:>9.3f} {result["rps"]:>9.0f}'
+                )
+        finally:
+            connection.settings_dict['CONN_MAX_AGE'], connection.settings_dict['CONN_HEALTH_CHECKS'] = original
+            test_name = connection.settings_dict['NAME']
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            if connection.vendor == 'sqlite':
+                remove_wal_files(test_name)
+            teardown_test_environment()
+
+    def _seed(self):
+        from apps.blogs.models import Tag
+
+        Tag.objects.bulk_create([Tag(name=f'bench-{i}', slug=f'bench-{i}') for i in range(10)])
+
+    def _time_connects(self, cycles):
+        connection.close()
+        start = time.perf_counter()
+        for _ in range(cycles):
+            connection.connect()
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            connection.close()
+        return (time.perf_counter() - start) / cycles * 1000
+
+    def _run_mode(self, max_age, health_checks, requests, path):
+        connection.close()
+        connection.settings_dict['CONN_MAX_AGE'] = max_age
+        connection.settings_dict['CONN_HEALTH_CHECKS'] = health_checks
+
+        connects = 0
+
+        def count_connect(sender, connection, **kwargs):
+            nonlocal connects
+            connects += 1
+
+        connection_created.connect(count_connect)
+        client = Client(raise_request_exception=False)
+        timings = []
+        try:
+            for i in range(requests):
+                # A new client address each time keeps the anonymous throttle out of the way
+                remote_addr = f'10.{i // 65536 % 256}.{i // 256 % 256}.{i % 256}'
+                start = time.perf_counter()
+                # The test client skips the request_started/finished connection
+                # handling a real server does, so run it here
+                close_old_connections()
+                client.get(path, REMOTE_ADDR=remote_addr)
+                close_old_connections()
+                timings.append((time.perf_counter() - start) * 1000)
+        finally:
+            connection_created.disconnect(count_connect)
+            connection.close()
+
+        timings.sort()
+        return {
+            'connects': connects,
+            'mean': statistics.fmean(timings),
+            'p50': statistics.median(timings),
+            'p95': timings[max(0, int(len(timings) * 0.95) - 1)],
+            'rps': len(timings) / (sum(timings) / 1000),
+        }
@@ -0,0 +1,91 @@
+"""
+Microbenchmarks for per-request CPU hot paths.
+Usage: python manage.py bench_hot_paths [-k sanitize] [--save | --check] [--tolerance 0.2]
+
+Times the benchmarks in apps/<app>/benchmarks.py (sanitizing, nested
+serializers, User-Agent parsing, slugify) on fixed corpora. --save records
+the medians as the baseline; --check fails when any benchmark's median is
+more than --tolerance slower than it. Timings are machine-specific, so
+record the baseline on the machine that runs the check.
+"""
+
+import json
+import platform
+import sys
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.core import microbench
+
+DEFAULT_BASELINE = Path(settings.BASE_DIR) / 'perf' / 'microbench.json'
+
+
+class Command(BaseCommand):
+    help = 'Benchmark sanitizer, serializer and parsing hot paths against a stored baseline.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('-k', '--filter', help='Only benchmarks whose name contains this')
+        parser.add_argument('--rounds', type=int, default=10)
+        parser.add_argument('--min-time', type=float, default=0.05, help='Minimum seconds per round')
+        parser.add_argument('--baseline', default=str(DEFAULT_BASELINE))
+        parser.add_argument('--tolerance', type=float, default=0.2, help='Allowed slowdown (0.2 = 20%%)')
+        group = parser.add_mutually_exclusive_group()
+        group.add_argument('--save', action='store_true', help='Write results as the new baseline')
+        group.add_argument('--check', action='store_true', help='Fail on regressions against the baseline')
+
+    def handle(self, *args, **options):
+        benchmarks = microbench.discover_benchmarks()
+        names = sorted(name for name in benchmarks if not options['filter'] or options['filter'] in name)
+        if not names:
+            raise CommandError('No benchmarks match.')
+
+        baseline_path = Path(options['baseline'])
+        baseline = {}
+        if baseline_path.exists():
+            baseline = json.loads(baseline_path.read_text())['benchmarks']
+        elif options['check']:
+            raise CommandError(f'No baseline at {baseline_path}; run with --save first.')
+
+        self.stdout.write(
+            f'{"benchmark":<48} {"median us":>12} {"min us":>12} {"ops/s":>12} {"vs base":>9}'
+        )
+        results = {}
+        for name in names:
+            result = results[name] = microbench.run_benchmark(
+                benchmarks[name], options['rounds'], options['min_time']
+            )
+            line = (
+                f'{name:<48} {result["median_us"]:>12,.1f} {result["min_us"]:>12,.1f} '
+                f'{result["ops_per_s"]:>12,.0f}'
+            )
+            if name in baseline:
+                change = result['median_us'] / baseline[name]['median_us'] - 1
+                line += f' {change:>+8.1%}'
+                if change > options['tolerance']:
+                    line = self.style.WARNING(line + '  slower')
+            self.stdout.write(line)
+
+        if options['save']:
+            # Keep baseline entries for benchmarks filtered out of this run
+            merged = dict(baseline, **results) if options['filter'] else results
+            baseline_path.parent.mkdir(parents=True, exist_ok=True)
+            baseline_path.write_text(json.dumps({
+                'recorded_at': timezone.now().isoformat(),
+                'python': sys.version.split()[0],
+                'machine': f'{platform.system()} {platform.machine()}',
+                'benchmarks': merged,
+            }, indent=2, sort_keys=True) + '\n')
+            self.stdout.write(f'Baseline written to {baseline_path}')
+            return
+
+        if options['check']:
+            regressions = microbench.compare(results, baseline, options['tolerance'])
+            if regressions:
+                raise CommandError('Benchmark regressions:\n  ' + '\n  '.join(
+                    f'{name}: {current:,.1f}us, baseline {expected:,.1f}us ({ratio - 1:+.0%})'
+                    for name, expected, current, ratio in regressions
+                ))
+            self.stdout.write(self.style.SUCCESS('No benchmark regressions.'))
@@ -0,0 +1,169 @@
+"""
+Benchmark concurrent reads and view-count writes on SQLite.
+Usage: python manage.py bench_sqlite_concurrency [--readers 4] [--viewers 4] [--duration 5]
+
+Runs against a throwaway SQLite file. Reader threads load a blog with its
+comments while viewer threads do the same and then record the view, as
+the blog detail view does: first with SQLite's defaults (rollback
+journal, each view written directly) and then with SQLITE_PRAGMAS (WAL)
+and the serialized writer. Reports reads/s, views written/s, detail
+latency and "database is locked" errors for each mode.
+"""
+
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection
+from django.db.models import F, Sum
+from django.test.utils import override_settings
+
+from apps.core.sqlite import SerializedWriter, remove_wal_files
+
+
+class Command(BaseCommand):
+    help = 'Compare SQLite read/write concurrency with default settings and the tuned mode.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--readers', type=int, default=4)
+        parser.add_argument('--viewers', type=int, default=4)
+        parser.add_argument('--duration', type=float, default=5, help='Seconds per mode')
+        parser.add_argument('--blogs', type=int, default=200)
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('This benchmark is for SQLite; set USE_SQLITE=True.')
+        connection.settings_dict['TEST']['NAME'] = str(
+            Path(tempfile.gettempdir()) / f'bench-sqlite-{os.getpid()}.sqlite3'
+        )
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            blog_ids = self._seed(options['blogs'])
+            self.stdout.write(
+                f'{"mode":<10} {"reads/s":>9} {"read p95 ms":>12} {"views/s":>9} '
+                f'{"view p95 ms":>12} {"locked":>7}'
+            )
+            for mode in ('default', 'tuned'):
+                result = self._run_mode(mode, blog_ids, options)
+                self.stdout.write(
+                    f'{mode:<10} {result["reads_per_s"]:>9.0f} {result["read_p95_ms"]:>12.2f} '
+                    f'{result["views_per_s"]:>9.0f} {result["view_p95_ms"]:>12.2f} {result["locked"]:>7}'
+                )
+        finally:
+            test_name = connection.settings_dict['NAME']
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            remove_wal_files(test_name)
+
+    def _seed(self, count):
+        from apps.blogs.models import Blog, BlogComment, BlogStatus
+        from apps.users.models import User
+
+        author = User.objects.create_user('bench@sqlite.test', 'sqlitebench', None)
+        blogs = Blog.objects.bulk_create([
+            Blog(title=f'Post {i}', slug=f'post-{i}', content='Lorem ipsum dolor sit amet. ' * 100,
+                 author=author, status=BlogStatus.PUBLISHED)
+            for i in range(count)
+        ])
+        BlogComment.objects.bulk_create([
+            BlogComment(blog=blog, author=author, content=f'Comment {j}')
+            for blog in blogs for j in range(5)
+        ])
+        return [blog.id for blog in blogs]
+
+    def _run_mode(self, mode, blog_ids, options):
+        from apps.analytics.tasks import record_blog_views
+        from apps.blogs.models import Blog, BlogComment, apply_view_counts
+
+        tuned = mode == 'tuned'
+        with override_settings(SQLITE_PRAGMAS=tuned):
+            connection.close()
+            if not tuned:
+                # WAL persists in the file, so switch it back explicitly
+                with connection.cursor() as cursor:
+                    cursor.execute('PRAGMA journal_mode=DELETE')
+            connection.close()
+
+            writer = SerializedWriter()
+            views_before = Blog.objects.aggregate(total=Sum('view_count'))['total']
+            stop = threading.Event()
+            lock = threading.Lock()
+            stats = {'reads': [], 'views': [], 'locked': 0}
+
+            def timed(kind, func):
+                start = time.perf_counter()
+                try:
+                    func()
+                except OperationalError as exc:
+                    if 'locked' not in str(exc):
+                        raise
+                    with lock:
+                        stats['locked'] += 1
+                    return
+                elapsed = time.perf_counter() - start
+                with lock:
+                    stats[kind].append(elapsed)
+
+            def read(rng):
+                blog = Blog.objects.select_related('author').get(id=rng.choice(blog_ids))
+                list(BlogComment.objects.filter(blog=blog)[:20])
+
+            def view(rng):
+                # A blog detail request: the same read, then recording the view
+                blog_id = rng.choice(blog_ids)
+                blog = Blog.objects.select_related('author').get(id=blog_id)
+                list(BlogComment.objects.filter(blog=blog)[:20])
+                row = {'blog_id': blog_id, 'user_id': None, 'ip_address': '10.0.0.1', 'user_agent': 'bench'}
+                if tuned:
+                    writer.submit(apply_view_counts, blog_id)
+                    writer.submit(record_blog_views, row)
+                else:
+                    Blog.objects.filter(id=blog_id).update(view_count=F('view_count') + 1)
+                    record_blog_views([row])
+
+            def worker(kind, func, seed):
+                rng = random.Random(seed)
+                try:
+                    while not stop.is_set():
+                        timed(kind, lambda: func(rng))
+                finally:
+                    connection.close()
+
+            threads = [
+                threading.Thread(target=worker, args=('reads', read, i)) for i in range(options['readers'])
+            ] + [
+                threading.Thread(target=worker, args=('views', view, 1000 + i))
+                for i in range(options['viewers'])
+            ]
+            start = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            time.sleep(options['duration'])
+            stop.set()
+            for thread in threads:
+                thread.join()
+            # Views only count once they are on disk
+            writer.flush(timeout=60)
+            elapsed = time.perf_counter() - start
+
+            views_written = Blog.objects.aggregate(total=Sum('view_count'))['total'] - views_before
+            connection.close()
+
+        return {
+            'reads_per_s': len(stats['reads']) / elapsed,
+            'read_p95_ms': self._p95(stats['reads']),
+            'views_per_s': views_written / elapsed,
+            'view_p95_ms': self._p95(stats['views']),
+            'locked': stats['locked'],
+        }
+
+    def _p95(self, timings):
+        if not timings:
+            return 0.0
+        if len(timings) < 2:
+            return timings[0] * 1000
+        return statistics.quantiles(timings, n=20)[-1] * 1000
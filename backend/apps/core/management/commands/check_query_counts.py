@@ -0,0 +1,293 @@
+"""
+Query-count regression check for every API endpoint.
+Usage: python manage.py check_query_counts [--scale 3] [--check] [--output perf/query_counts.json]
+
+Runs against a throwaway test database. Seeds a dataset, GETs every named
+URL as anonymous, customer, staff and admin, then grows the dataset to 10x
+and repeats. The run fails if any endpoint's query count changes with row
+count (an N+1), or if it answers anything but 2xx, 405 (no GET) or, for
+roles below admin, 401/403. Without --check the report is then written as
+the new baseline; with --check the run also fails if any endpoint does
+more queries than the baseline or answers with a different status.
+"""
+
+import json
+import re
+from datetime import timedelta
+from pathlib import Path
+
+from celery import current_app
+from django.conf import settings
+from django.contrib import admin
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, setup_test_environment, teardown_test_environment
+from django.urls import URLPattern, URLResolver, get_resolver, reverse
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import AccessToken
+
+
+ROLES = ('anonymous', 'customer', 'staff', 'admin')
+DEFAULT_OUTPUT = Path(settings.BASE_DIR) / 'perf' / 'query_counts.json'
+
+# Routes that are not part of the API surface
+SKIP_PREFIXES = ('admin/', 'api/docs/', 'api/redoc/', 'media/', 'static/', 'metrics')
+
+
+def iter_named_patterns(patterns=None, prefix=''):
+    """Yield (route, name) for every named URL pattern, depth first."""
+    if patterns is None:
+        patterns = get_resolver().url_patterns
+    for pattern in patterns:
+        route = prefix + str(pattern.pattern)
+        if isinstance(pattern, URLResolver):
+            yield from iter_named_patterns(pattern.url_patterns, route)
+        elif isinstance(pattern, URLPattern) and pattern.name:
+            yield route, pattern.name
+
+
+class Command(BaseCommand):
+    help = 'Check that API query counts do not grow with row count.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=int, help='Rows per model in the small run (default 3)')
+        parser.add_argument('--check', action='store_true', help='Compare against the baseline')
+        parser.add_argument('--output', default=str(DEFAULT_OUTPUT))
+
+    def handle(self, *args, **options):
+        output = Path(options['output'])
+        baseline = None
+        if options['check']:
+            if not output.exists():
+                raise CommandError(f'No baseline at {output}; run without --check first.')
+            baseline = json.loads(output.read_text())
+        scale = options['scale'] or (baseline['scale'][0] if baseline else 3)
+        if baseline and baseline['scale'][0] != scale:
+            raise CommandError(f'Baseline was recorded at --scale {baseline["scale"][0]}.')
+
+        # Publish Celery tasks to memory so views never wait on a broker
+        current_app.conf.broker_url = 'memory://'
+
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            fixtures = self._create_actors()
+            requests = list(self._requests(fixtures))
+            self._seed(fixtures, 0, scale)
+            small = self._measure(fixtures, requests)
+            self._seed(fixtures, scale, scale * 10)
+            large = self._measure(fixtures, requests)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        report = {'scale': [scale, scale * 10], 'endpoints': {}}
+        for key, (route, role, status, queries) in small.items():
+            endpoint = report['endpoints'].setdefault(key[0], {'route': route, 'roles': {}})
+            endpoint['roles'][role] = {
+                'status': status,
+                'queries': [queries, large[key][3]],
+            }
+
+        self._print_report(report)
+        problems = self._problems(report)
+        if baseline:
+            problems += self._compare(report, baseline)
+        if problems:
+            raise CommandError('Query count check failed:\n  ' + '\n  '.join(problems))
+        if baseline:
+            self.stdout.write(self.style.SUCCESS('No query count regressions.'))
+            return
+
+        output.parent.mkdir(parents=True, exist_ok=True)
+        # Keep [small, large] pairs on one line so baseline diffs stay readable
+        text = json.dumps(report, indent=2, sort_keys=True)
+        output.write_text(re.sub(r'\[\s+(\d+),\s+(\d+)\s+\]', r'[\1, \2]', text) + '\n')
+        self.stdout.write(f'Baseline written to {output}.')
+
+    # ------------------------------------------------------------
+    # Dataset
+    # ------------------------------------------------------------
+
+    def _create_actors(self):
+        from apps.analytics.models import ContactSubmission
+        from apps.blogs.models import Blog, BlogStatus, Category, Tag
+        from apps.users.models import User, UserRole
+
+        password = 'query-count-check'
+        admin_user = User.objects.create_superuser('admin@qc.test', 'qcadmin', password)
+        staff = User.objects.create_user('staff@qc.test', 'qcstaff', password, role=UserRole.STAFF,
+                                         first_name='Quinn', last_name='Staff')
+        customer = User.objects.create_user('customer@qc.test', 'qccustomer', password)
+        category = Category.objects.create(name='Query Counts')
+        tag = Tag.objects.create(name='query-counts')
+        blog = Blog.objects.create(
+            title='Query count target', content='Target post for query counts.',
+            author=staff, category=category, status=BlogStatus.PUBLISHED,
+            is_featured=True, published_at=timezone.now(),
+        )
+        blog.tags.add(tag)
+        contact = ContactSubmission.objects.create(
+            name='Query Counts', email='contact@qc.test', subject='Hello', message='Hello'
+        )
+        return {
+            'users': {'customer': customer, 'staff': staff, 'admin': admin_user},
+            'blog': blog, 'category': category, 'tag': tag, 'contact': contact,
+        }
+
+    def _seed(self, fixtures, start, stop):
+        """Add rows start..stop of every model, attached to the target objects."""
+        from apps.analytics.models import BlogView, ContactSubmission, DailyAnalytics, MonthlyAnalytics
+        from apps.blogs.documents import build_blog_documents
+        from apps.blogs.models import Blog, BlogComment, BlogStatus, Category, Tag
+        from apps.users.models import User, UserRole
+
+        staff, blog = fixtures['users']['staff'], fixtures['blog']
+        today = timezone.now().date()
+        for i in range(start, stop):
+            author = User.objects.create_user(
+                f'author{i}@qc.test', f'qcauthor{i}', None, role=UserRole.STAFF,
+                first_name=f'Author{i}', position='Writer',
+            )
+            commenter = User.objects.create_user(f'reader{i}@qc.test', f'qcreader{i}', None)
+            category = Category.objects.create(name=f'Category {i}')
+            tag = Tag.objects.create(name=f'tag-{i}')
+
+            # Half the new posts belong to the staff actor so their lists grow too
+            for owner in (author, staff):
+                post = Blog.objects.create(
+                    title=f'Post {i} by {owner.username}', content='Lorem ipsum ' * 50,
+                    author=owner, category=category, status=BlogStatus.PUBLISHED,
+                    is_featured=i % 2 == 0, published_at=timezone.now(),
+                )
+                post.tags.add(tag, fixtures['tag'])
+
+            comment = BlogComment.objects.create(blog=blog, author=commenter, content=f'Comment {i}')
+            BlogComment.objects.create(blog=blog, author=author, parent=comment, content=f'Reply {i}')
+            BlogView.objects.create(blog=blog, user=commenter, device_type='mobile', browser='Chrome')
+            ContactSubmission.objects.create(
+                name=f'Visitor {i}', email=f'visitor{i}@qc.test', subject='Hi', message='Hi'
+            )
+            DailyAnalytics.objects.create(date=today - timedelta(days=i + 1), total_views=i)
+            MonthlyAnalytics.objects.create(year=2000 + i // 12, month=i % 12 + 1, total_views=i)
+
+        # Viewing the contact marks it read: unread again, so both runs take the same path
+        ContactSubmission.objects.filter(pk=fixtures['contact'].pk).update(is_read=False)
+
+        # Rebuild tasks only reach the in-memory broker: build the detail
+        # documents as a worker would, so the detail view is measured warm
+        build_blog_documents(Blog.objects.values_list('id', flat=True))
+
+    # ------------------------------------------------------------
+    # Measurement
+    # ------------------------------------------------------------
+
+    def _requests(self, fixtures):
+        """(key, route, url) for every endpoint this check can address."""
+        blog, staff = fixtures['blog'], fixtures['users']['staff']
+        kwargs = {
+            'public-blog-detail': {'slug': blog.slug},
+            'blog-comment-create': {'slug': blog.slug},
+            'blogs-by-user': {'username': staff.username},
+            'staff-blog-detail': {'pk': blog.pk},
+            'admin-blog-detail': {'pk': blog.pk},
+            'admin-blog-status': {'pk': blog.pk},
+            'admin-blog-featured': {'pk': blog.pk},
+            'admin-category-detail': {'pk': fixtures['category'].pk},
+            'admin-tag-detail': {'pk': fixtures['tag'].pk},
+            'admin-user-detail': {'pk': staff.pk},
+            'admin-user-role': {'pk': staff.pk},
+            'blog-analytics': {'pk': blog.pk},
+            'admin-contact-detail': {'pk': fixtures['contact'].pk},
+            'admin-contact-reply': {'pk': fixtures['contact'].pk},
+        }
+        query_strings = {
+            'public-profile-detail': f'?username={staff.username}',
+            'user-autocomplete': '?q=qc',
+        }
+
+        for route, name in iter_named_patterns():
+            if route.startswith(SKIP_PREFIXES):
+                continue
+            try:
+                url = reverse(name, kwargs=kwargs.get(name))
+            except Exception:
+                self.stderr.write(f'Skipping {name} ({route}): no arguments known')
+                continue
+            yield name, route, url + query_strings.get(name, '')
+
+        # Django admin changelists (admin role only)
+        for model in admin.site._registry:
+            name = f'admin:{model._meta.app_label}_{model._meta.model_name}_changelist'
+            yield name, str(reverse(name)).lstrip('/'), reverse(name)
+
+    def _measure(self, fixtures, requests):
+        headers = {
+            role: {'HTTP_AUTHORIZATION': f'Bearer {AccessToken.for_user(user)}'}
+            for role, user in fixtures['users'].items()
+        }
+        results = {}
+        for name, route, url in requests:
+            django_admin = name.startswith('admin:')
+            for role in ('admin',) if django_admin else ROLES:
+                client = Client(raise_request_exception=False)
+                if django_admin:
+                    client.force_login(fixtures['users']['admin'])
+                # Cold cache, so throttles and cached lookups do not skew counts
+                cache.clear()
+                with CaptureQueriesContext(connection) as captured:
+                    response = client.get(url, **headers.get(role, {}))
+                results[(name, role)] = (route, role, response.status_code, len(captured))
+        return results
+
+    # ------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------
+
+    def _print_report(self, report):
+        small, large = report['scale']
+        self.stdout.write(f'{"endpoint":<50} {"role":<10} {"status":>6} {f"q@{small}":>6} {f"q@{large}":>6}')
+        for name, endpoint in sorted(report['endpoints'].items()):
+            for role, result in endpoint['roles'].items():
+                queries = result['queries']
+                line = f'{name:<50} {role:<10} {result["status"]:>6} {queries[0]:>6} {queries[1]:>6}'
+                if queries[0] != queries[1]:
+                    line = self.style.WARNING(line + '  grows with rows')
+                elif not self._status_ok(role, result['status']):
+                    line = self.style.WARNING(line + '  unexpected status')
+                self.stdout.write(line)
+
+    def _status_ok(self, role, status):
+        if 200 <= status < 300 or status == 405:
+            return True
+        # Turned away: fine for roles an endpoint is not meant for
+        return status in (401, 403) and role != 'admin'
+
+    def _problems(self, report):
+        problems = []
+        for name, endpoint in sorted(report['endpoints'].items()):
+            for role, result in endpoint['roles'].items():
+                small, large = result['queries']
+                if not self._status_ok(role, result['status']):
+                    problems.append(f'{name} [{role}]: status {result["status"]}')
+                if small != large:
+                    problems.append(f'{name} [{role}]: grows with rows ({small} -> {large})')
+        return problems
+
+    def _compare(self, report, baseline):
+        regressions = []
+        for name, endpoint in sorted(report['endpoints'].items()):
+            baseline_roles = baseline['endpoints'].get(name, {}).get('roles', {})
+            for role, result in endpoint['roles'].items():
+                expected = baseline_roles.get(role)
+                if expected is None:
+                    continue
+                if result['status'] != expected['status']:
+                    regressions.append(f'{name} [{role}]: status {result["status"]}, baseline {expected["status"]}')
+                if result['queries'][1] > expected['queries'][1]:
+                    regressions.append(
+                        f'{name} [{role}]: {result["queries"][1]} queries, baseline {expected["queries"][1]}'
+                    )
+        return regressions
@@ -0,0 +1,139 @@
+"""
+Generate production-scale synthetic data for load testing.
+Usage: python manage.py generate_load_data --users 1e6 --blogs 1e5 --views 1e8
+
+Writes into the configured database, after any existing rows. Every
+generated user can log in with LOAD_PASSWORD (apps.core.load_data).
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import accumulate
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.db.models import Case, Max, Value, When
+
+from apps.core import load_data
+from apps.core.db import reset_worker_connections
+
+
+def count_arg(value):
+    """Accept counts like 1e6 as well as 1000000."""
+    return int(float(value))
+
+
+class Command(BaseCommand):
+    help = 'Generate large skewed datasets (users, blogs, comments, views) for load testing.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=count_arg, default=10000)
+        parser.add_argument('--blogs', type=count_arg, default=1000)
+        parser.add_argument('--comments', type=count_arg, help='Default: 5 per blog')
+        parser.add_argument('--views', type=count_arg, default=100000)
+        parser.add_argument('--chunk-size', type=count_arg, default=20000)
+        parser.add_argument('--workers', type=int, help='Default: CPU count (1 on SQLite)')
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        from apps.analytics.models import BlogView
+        from apps.blogs.models import Blog, BlogComment, Category, Tag
+        from apps.users.models import User
+
+        users, blogs, views = options['users'], options['blogs'], options['views']
+        comments = options['comments'] if options['comments'] is not None else blogs * 5
+        staff_count = max(1, int(users * load_data.STAFF_FRACTION))
+        if users < 1 or (blogs and staff_count < 1):
+            raise CommandError('At least one user is needed to author blogs.')
+
+        workers = options['workers'] or os.cpu_count() or 1
+        if connection.vendor == 'sqlite' and workers > 1:
+            # SQLite allows a single writer; extra processes would only contend for the lock
+            self.stdout.write('SQLite detected: generating with a single worker.')
+            workers = 1
+
+        plan = {
+            'seed': options['seed'],
+            'users': users,
+            'blogs': blogs,
+            'staff_count': staff_count,
+            'user_base': (User.objects.aggregate(m=Max('id'))['m'] or 0) + 1,
+            'blog_base': (Blog.objects.aggregate(m=Max('id'))['m'] or 0) + 1,
+            'password_hash': load_data.password_hash(),
+            'category_ids': self._ensure_categories(Category),
+            'tag_ids': self._ensure_tags(Tag),
+        }
+        chunk = options['chunk_size']
+
+        self._phase('users', users, chunk, workers, load_data.generate_users, plan)
+        self._phase('blogs', blogs, chunk, workers, load_data.generate_blogs, plan)
+
+        # Comments follow blog popularity; ids are laid out per blog up front
+        per_blog = load_data.zipf_shares(comments, blogs, plan['seed']) if blogs else []
+        offsets = [0] + list(accumulate(per_blog))
+        first_comment_id = (BlogComment.objects.aggregate(m=Max('id'))['m'] or 0) + 1
+        blog_chunk = max(1, chunk // max(1, comments // max(1, blogs)))
+        tasks = [
+            (start, min(start + blog_chunk, blogs), plan,
+             per_blog[start:start + blog_chunk], first_comment_id + offsets[start])
+            for start in range(0, blogs, blog_chunk)
+        ]
+        self._run('comments', offsets[-1], workers, load_data.generate_comments, tasks)
+
+        view_counts = {}
+        if blogs:
+            for counts in self._phase('views', views, chunk, workers, load_data.generate_views, plan):
+                for blog_id, count in counts.items():
+                    view_counts[blog_id] = view_counts.get(blog_id, 0) + count
+        self._update_view_counts(Blog, view_counts)
+
+        load_data.reset_sequences(User, Blog, BlogComment, BlogView)
+        self.stdout.write(self.style.SUCCESS(
+            f'Generated {users} users, {blogs} blogs, {offsets[-1]} comments, {views} views. '
+            f'Password for all generated users: {load_data.LOAD_PASSWORD}'
+        ))
+
+    def _phase(self, label, total, chunk, workers, func, plan):
+        tasks = [(start, min(start + chunk, total), plan) for start in range(0, total, chunk)]
+        return self._run(label, total, workers, func, tasks)
+
+    def _run(self, label, total, workers, func, tasks):
+        """Run chunk tasks inline or across a process pool; returns their results."""
+        if not tasks:
+            return []
+        started = time.perf_counter()
+        self.stdout.write(f'Generating {total} {label} in {len(tasks)} chunks...')
+        if workers == 1:
+            results = [func(*task) for task in tasks]
+        else:
+            # Workers must not share the parent's database connections
+            connections.close_all()
+            with ProcessPoolExecutor(max_workers=workers, initializer=reset_worker_connections) as pool:
+                futures = [pool.submit(func, *task) for task in tasks]
+                results = [future.result() for future in futures]
+        elapsed = time.perf_counter() - started
+        self.stdout.write(f'  {label}: {elapsed:.1f}s ({total / max(elapsed, 1e-9):,.0f} rows/s)')
+        return results
+
+    def _ensure_categories(self, Category):
+        existing = dict(Category.objects.values_list('name', 'id'))
+        for name in load_data.CATEGORY_NAMES:
+            if name not in existing:
+                existing[name] = Category.objects.create(name=name).id
+        return [existing[name] for name in load_data.CATEGORY_NAMES]
+
+    def _ensure_tags(self, Tag):
+        names = [f'{word}' for word in sorted(set(load_data.WORDS))]
+        existing = dict(Tag.objects.filter(name__in=names).values_list('name', 'id'))
+        missing = [Tag(name=name, slug=name) for name in names if name not in existing]
+        Tag.objects.bulk_create(missing)
+        return list(Tag.objects.filter(name__in=names).values_list('id', flat=True))
+
+    def _update_view_counts(self, Blog, view_counts, batch_size=1000):
+        items = list(view_counts.items())
+        for start in range(0, len(items), batch_size):
+            batch = items[start:start + batch_size]
+            Blog.objects.filter(id__in=[blog_id for blog_id, _ in batch]).update(
+                view_count=Case(*[When(id=blog_id, then=Value(count)) for blog_id, count in batch])
+            )
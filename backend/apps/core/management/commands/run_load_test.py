@@ -0,0 +1,238 @@
+"""
+End-to-end load test.
+Usage: python manage.py run_load_test [--generate] [--duration 30] [--concurrency 20] [--output run.json]
+
+Boots the app in a server subprocess on a free local port and drives it
+with the scenarios in apps/<app>/load_scenarios.py from asyncio virtual
+users. With --generate the server runs against a throwaway test database
+filled by generate_load_data; otherwise against the configured database,
+or pass --url to target a server that is already running. Throughput and
+p50/p95/p99 latency per endpoint are printed, and written as JSON with
+--output so runs can be diffed. Everything runs locally, on SQLite or a
+local PostgreSQL.
+"""
+
+import asyncio
+import importlib.util
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from apps.core import load_test
+from apps.core.sqlite import remove_wal_files
+from apps.core.management.commands.generate_load_data import count_arg
+
+SERVERS = ('gunicorn', 'uvicorn', 'runserver')
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class Command(BaseCommand):
+    help = 'Drive realistic traffic at the API and report per-endpoint throughput and latency.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', help='Target a running server instead of booting one')
+        parser.add_argument('--server', choices=SERVERS, help='Default: gunicorn if installed, else runserver')
+        parser.add_argument('--workers', type=int, default=2, help='Server worker processes')
+        parser.add_argument('--threads', type=int, default=4, help='Threads per gunicorn worker')
+        parser.add_argument('--duration', type=float, default=30, help='Seconds of recorded traffic')
+        parser.add_argument('--warmup', type=float, default=5, help='Unrecorded seconds before that')
+        parser.add_argument('--concurrency', type=int, default=20, help='Virtual users')
+        parser.add_argument('--think-time', type=float, default=0, help='Mean pause between scenarios (s)')
+        parser.add_argument('--scenarios', help='Comma-separated scenario names (default: all)')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--output', help='Write the JSON report here')
+        parser.add_argument('--generate', action='store_true',
+                            help='Run against a throwaway database filled by generate_load_data')
+        parser.add_argument('--users', type=count_arg, default=2000)
+        parser.add_argument('--blogs', type=count_arg, default=500)
+        parser.add_argument('--views', type=count_arg, default=20000)
+
+    def handle(self, *args, **options):
+        scenarios = self._select_scenarios(options['scenarios'])
+
+        old_name = None
+        if options['generate']:
+            if options['url']:
+                raise CommandError('--generate boots its own server; it cannot be combined with --url.')
+            old_name = self._create_database(options)
+        try:
+            context = load_test.build_context(options['seed'])
+            if not context.get('blog_slugs') or not any(context.get('users', {}).values()):
+                self.stderr.write(self.style.WARNING(
+                    'No generated users or published blogs found; run generate_load_data or pass --generate.'
+                ))
+            if options['url']:
+                report = self._drive(options['url'], scenarios, context, options)
+            else:
+                report = self._run_with_server(scenarios, context, options)
+        finally:
+            if old_name is not None:
+                self._destroy_database(old_name)
+
+        report = {
+            'meta': {
+                'started_at': timezone.now().isoformat(),
+                'target': options['url'] or self._server_name(options),
+                'database': connection.vendor,
+                'concurrency': options['concurrency'],
+                'duration_s': options['duration'],
+                'warmup_s': options['warmup'],
+                'think_time_s': options['think_time'],
+                'seed': options['seed'],
+                'scenarios': {item.name: item.weight for item in scenarios},
+            },
+            **report,
+        }
+        self._print_report(report)
+        if options['output']:
+            output = Path(options['output'])
+            output.parent.mkdir(parents=True, exist_ok=True)
+            output.write_text(json.dumps(report, indent=2, sort_keys=True) + '\n')
+            self.stdout.write(f'Report written to {output}')
+
+    def _select_scenarios(self, names):
+        available = load_test.discover_scenarios()
+        if not names:
+            return list(available.values())
+        selected = []
+        for name in (name.strip() for name in names.split(',')):
+            if name not in available:
+                raise CommandError(f'Unknown scenario {name!r}; available: {", ".join(sorted(available))}')
+            selected.append(available[name])
+        return selected
+
+    # ------------------------------------------------------------
+    # Database and server
+    # ------------------------------------------------------------
+
+    def _create_database(self, options):
+        if connection.vendor == 'sqlite':
+            # The server runs in another process, so the test database must be a file
+            connection.settings_dict['TEST']['NAME'] = str(
+                Path(tempfile.gettempdir()) / f'loadtest-{os.getpid()}.sqlite3'
+            )
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            call_command(
+                'generate_load_data', '--users', str(options['users']), '--blogs', str(options['blogs']),
+                '--views', str(options['views']), '--seed', str(options['seed']), stdout=self.stdout,
+            )
+        except BaseException:
+            self._destroy_database(old_name)
+            raise
+        return old_name
+
+    def _destroy_database(self, old_name):
+        test_name = connection.settings_dict['NAME']
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        if connection.vendor == 'sqlite':
+            remove_wal_files(test_name)
+
+    def _server_name(self, options):
+        if options['server']:
+            return options['server']
+        return 'gunicorn' if importlib.util.find_spec('gunicorn') else 'runserver'
+
+    def _server_command(self, server, port, options):
+        bind = f'127.0.0.1:{port}'
+        if server == 'gunicorn':
+            return [sys.executable, '-m', 'gunicorn', 'config.wsgi:application', '--bind', bind,
+                    '--workers', str(options['workers']), '--threads', str(options['threads']),
+                    '--worker-class', 'gthread']
+        if server == 'uvicorn':
+            return [sys.executable, '-m', 'uvicorn', 'config.asgi:application', '--host', '127.0.0.1',
+                    '--port', str(port), '--workers', str(options['workers']), '--no-access-log']
+        return [sys.executable, 'manage.py', 'runserver', bind, '--noreload']
+
+    def _server_env(self):
+        # The driver stands in for the load balancer, so the server trusts
+        # the client IP it forwards (see load_test.Session)
+        env = dict(os.environ, PYTHONUNBUFFERED='1', NUM_PROXIES='1')
+        name = str(connection.settings_dict['NAME'])
+        # Point the server at the same database as this process
+        if connection.vendor == 'sqlite':
+            env['SQLITE_PATH'] = name
+        else:
+            env['DB_NAME'] = name
+        return env
+
+    def _run_with_server(self, scenarios, context, options):
+        server = self._server_name(options)
+        if server != 'runserver' and importlib.util.find_spec(server) is None:
+            raise CommandError(f'{server} is not installed.')
+        port = free_port()
+        log = tempfile.NamedTemporaryFile(prefix='loadtest-server-', suffix='.log', delete=False)
+        self.stdout.write(f'Starting {server} on port {port} (log: {log.name})...')
+        process = subprocess.Popen(
+            self._server_command(server, port, options), cwd=settings.BASE_DIR,
+            env=self._server_env(), stdout=log, stderr=subprocess.STDOUT,
+        )
+        try:
+            self._wait_for_port(process, port, log.name)
+            return self._drive(f'http://127.0.0.1:{port}', scenarios, context, options)
+        finally:
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+            log.close()
+
+    def _wait_for_port(self, process, port, log_name, timeout=30):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise CommandError(f'Server exited with status {process.returncode}; see {log_name}')
+            try:
+                socket.create_connection(('127.0.0.1', port), timeout=0.5).close()
+                return
+            except OSError:
+                time.sleep(0.2)
+        raise CommandError(f'Server did not start listening within {timeout}s; see {log_name}')
+
+    def _drive(self, url, scenarios, context, options):
+        self.stdout.write(
+            f'Driving {url} with {options["concurrency"]} virtual users for '
+            f'{options["warmup"]:g}s warmup + {options["duration"]:g}s...'
+        )
+        return asyncio.run(load_test.run(
+            url, scenarios, context,
+            concurrency=options['concurrency'], duration=options['duration'],
+            warmup=options['warmup'], think_time=options['think_time'], seed=options['seed'],
+        ))
+
+    # ------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------
+
+    def _print_report(self, report):
+        header = f'{"endpoint":<28} {"reqs":>7} {"err":>5} {"rps":>8} {"p50 ms":>8} {"p95 ms":>8} {"p99 ms":>8}'
+        self.stdout.write(header)
+        rows = list(report['endpoints'].items()) + [('TOTAL', report['totals'])]
+        for name, result in rows:
+            line = (
+                f'{name:<28} {result["requests"]:>7} {result["errors"]:>5} {result["throughput_rps"]:>8.1f} '
+                + ' '.join(
+                    f'{result[key]:>8.1f}' if result[key] is not None else f'{"-":>8}'
+                    for key in ('p50_ms', 'p95_ms', 'p99_ms')
+                )
+            )
+            if result['errors']:
+                line = self.style.WARNING(line)
+            self.stdout.write(line)
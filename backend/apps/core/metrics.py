@@ -0,0 +1,180 @@
+"""
+In-process request metrics.
+Counters and fixed-bucket histograms keyed by label values, rendered in
+the Prometheus text exposition format. Each worker process keeps its own
+registry, so scrape every worker (or aggregate by instance).
+"""
+
+import bisect
+import threading
+from contextvars import ContextVar
+
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 250)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+class Counter:
+    """Monotonic counter per label set."""
+    kind = 'counter'
+
+    def __init__(self, name, documentation, labelnames):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            values = dict(self._values)
+        for labels, value in sorted(values.items()):
+            yield self.name, list(zip(self.labelnames, labels)), value
+
+
+class Histogram:
+    """Cumulative-bucket histogram per label set."""
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames, buckets):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels, value):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(labels)
+            if state is None:
+                # Per-bucket counts plus +Inf, then sum
+                state = self._values[labels] = [[0] * (len(self.buckets) + 1), 0]
+            state[0][index] += 1
+            state[1] += value
+
+    def samples(self):
+        with self._lock:
+            values = {labels: (list(counts), total) for labels, (counts, total) in self._values.items()}
+        for labels, (counts, total) in sorted(values.items()):
+            pairs = list(zip(self.labelnames, labels))
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                yield f'{self.name}_bucket', pairs + [('le', _format_value(bound))], cumulative
+            cumulative += counts[-1]
+            yield f'{self.name}_bucket', pairs + [('le', '+Inf')], cumulative
+            yield f'{self.name}_sum', pairs, total
+            yield f'{self.name}_count', pairs, cumulative
+
+
+class Registry:
+    """Collection of metrics rendered together on /metrics."""
+
+    def __init__(self):
+        self._metrics = {}
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DURATION_BUCKETS):
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def _register(self, metric):
+        return self._metrics.setdefault(metric.name, metric)
+
+    def render(self):
+        """Prometheus text exposition format."""
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            for name, pairs, value in metric.samples():
+                lines.append(f'{name}{_format_labels(pairs)} {_format_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+
+def _format_labels(pairs):
+    if not pairs:
+        return ''
+    escaped = []
+    for name, value in pairs:
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        escaped.append(f'{name}="{value}"')
+    return '{' + ','.join(escaped) + '}'
+
+
+def _format_value(value):
+    if isinstance(value, float):
+        return repr(round(value, 6))
+    return str(value)
+
+
+registry = Registry()
+
+REQUESTS = registry.counter(
+    'http_requests_total', 'Requests by view, method and status.',
+    ('view', 'method', 'status'),
+)
+REQUEST_DURATION = registry.histogram(
+    'http_request_duration_seconds', 'Wall time per request.',
+    ('view', 'method'),
+)
+DB_QUERIES = registry.histogram(
+    'http_request_db_queries', 'Database queries per request.',
+    ('view', 'method'), QUERY_COUNT_BUCKETS,
+)
+DB_DURATION = registry.histogram(
+    'http_request_db_duration_seconds', 'Database time per request.',
+    ('view', 'method'),
+)
+CACHE_REQUESTS = registry.counter(
+    'http_request_cache_lookups_total', 'Cache lookups during requests by result.',
+    ('view', 'result'),
+)
+RESPONSE_SIZE = registry.histogram(
+    'http_response_size_bytes', 'Response body size.',
+    ('view', 'method'), SIZE_BUCKETS,
+)
+QUERY_BUDGET_EXCEEDED = registry.counter(
+    'http_query_budget_exceeded_total', 'Requests that ran more queries than their budget.',
+    ('view',),
+)
+
+
+def view_label(request):
+    """Dotted path of the view that handled the request."""
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unresolved'
+    func = getattr(match.func, 'view_class', match.func)
+    return f'{func.__module__}.{func.__qualname__}'
+
+
+class RequestStats:
+    """Per-request counters filled in by the DB and cache instrumentation."""
+    __slots__ = ('request', 'queries', 'db_time', 'cache_hits', 'cache_misses')
+
+    def __init__(self, request):
+        self.request = request
+        self.queries = 0
+        self.db_time = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+
+current_stats = ContextVar('request_stats', default=None)
+
+
+def record_cache_lookup(hits, misses=0):
+    """Count cache hits and misses against the current request, if any."""
+    stats = current_stats.get()
+    if stats is not None:
+        stats.cache_hits += hits
+        stats.cache_misses += misses
@@ -0,0 +1,192 @@
+"""
+Microbenchmarks for CPU hot paths.
+Benchmarks register with @benchmark in apps/<app>/benchmarks.py and run
+against fixed, deterministic input corpora without touching the database.
+Timing follows timeit: iterations are calibrated so each round lasts at
+least min_time, and the per-call time of every round is kept.
+"""
+
+import gc
+import random
+import statistics
+import time
+from contextlib import ExitStack
+from dataclasses import dataclass
+from functools import lru_cache
+
+from django.db import connections
+from django.utils.module_loading import autodiscover_modules
+
+from . import load_data
+
+BENCHMARK_MODULE = 'benchmarks'
+
+# Approximate corpus sizes in bytes
+CORPUS_SIZES = {'small': 300, 'typical': 8_000, 'large': 100_000}
+COMMENT_SIZES = {'small': 80, 'typical': 600}
+
+# name -> Benchmark, filled in by discover_benchmarks()
+BENCHMARKS = {}
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    name: str
+    factory: object
+    case: object
+
+
+def benchmark(name, cases=None):
+    """
+    Register `factory(case)` under `name`, or `name[case]` for each case.
+    The factory builds the input outside the timed region and returns the
+    zero-argument callable to time.
+    """
+    def decorator(factory):
+        if cases is None:
+            BENCHMARKS[name] = Benchmark(name, factory, None)
+        else:
+            for case in cases:
+                BENCHMARKS[f'{name}[{case}]'] = Benchmark(f'{name}[{case}]', factory, case)
+        return factory
+    return decorator
+
+
+def discover_benchmarks():
+    autodiscover_modules(BENCHMARK_MODULE)
+    return BENCHMARKS
+
+
+# ============================================================
+# Corpora
+# ============================================================
+
+def _words(rng, low, high):
+    return load_data.sentence(rng, low, high)
+
+
+def _html_block(rng, index):
+    """One block of post HTML, including markup the sanitizer must escape or drop."""
+    kind = index % 8
+    if kind == 0:
+        return f'<h2>{_words(rng, 3, 8)}</h2>'
+    if kind == 1:
+        return (
+            f'<p>{_words(rng, 20, 60)} <strong>{_words(rng, 2, 4)}</strong> {_words(rng, 10, 30)} '
+            f'<a href="https://example.com/{rng.randint(1, 9999)}" title="ref" onclick="track()">'
+            f'{_words(rng, 1, 3)}</a> <em>{_words(rng, 2, 5)}</em>.</p>'
+        )
+    if kind == 2:
+        return '<ul>' + ''.join(f'<li>{_words(rng, 3, 12)}</li>' for _ in range(rng.randint(3, 6))) + '</ul>'
+    if kind == 3:
+        return '<pre><code>for item in items:\n    if item &lt; limit and ready(item):\n        yield item</code></pre>'
+    if kind == 4:
+        return f'<blockquote>{_words(rng, 15, 40)}</blockquote><script>alert("{rng.randint(1, 99)}")</script>'
+    if kind == 5:
+        return (
+            f'<img src="/media/blogs/{rng.randint(1, 999)}.png" alt="{_words(rng, 2, 4)}" '
+            f'width="640" onerror="steal()"><div class="note" style="color: red">{_words(rng, 10, 25)}</div>'
+        )
+    if kind == 6:
+        rows = ''.join(
+            f'<tr><td>{_words(rng, 1, 3)}</td><td colspan="2">{rng.randint(1, 10_000)}</td></tr>'
+            for _ in range(rng.randint(2, 5))
+        )
+        return f'<table class="data"><tbody>{rows}</tbody></table>'
+    return f'<p>{_words(rng, 30, 80)}<iframe src="https://ads.example.com"></iframe></p>'
+
+
+@lru_cache(maxsize=None)
+def post_html(size):
+    """Deterministic post body of roughly CORPUS_SIZES[size] bytes."""
+    rng = random.Random(f'post-{size}')
+    target = CORPUS_SIZES[size]
+    blocks, length, index = [], 0, 0
+    while length < target:
+        block = _html_block(rng, index)
+        blocks.append(block)
+        length += len(block)
+        index += 1
+    return '\n'.join(blocks)
+
+
+@lru_cache(maxsize=None)
+def comment_text(size):
+    """Deterministic comment of roughly COMMENT_SIZES[size] bytes, with stray markup."""
+    rng = random.Random(f'comment-{size}')
+    target = COMMENT_SIZES[size]
+    parts, length = [], 0
+    while length < target:
+        part = _words(rng, 5, 15) + rng.choice(['. ', '! ', ' <b>really</b> ', ' <script>x()</script> '])
+        parts.append(part)
+        length += len(part)
+    return ''.join(parts)
+
+
+# ============================================================
+# Timing
+# ============================================================
+
+class QueryInBenchmark(RuntimeError):
+    pass
+
+
+def _forbid_queries(execute, sql, params, many, context):
+    raise QueryInBenchmark(f'Benchmarks must not query the database: {sql[:80]}')
+
+
+def _time(func, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return time.perf_counter() - start
+
+
+def measure(func, rounds=10, min_time=0.05):
+    """Per-call timings in microseconds: min, median, mean, stddev, ops/s."""
+    iterations = 1
+    while True:
+        elapsed = _time(func, iterations)
+        if elapsed >= min_time or iterations >= 10_000_000:
+            break
+        iterations *= max(2, min(10, int(min_time / max(elapsed, 1e-9)) + 1))
+
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        timings = [_time(func, iterations) / iterations * 1e6 for _ in range(rounds)]
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    median = statistics.median(timings)
+    return {
+        'min_us': round(min(timings), 3),
+        'median_us': round(median, 3),
+        'mean_us': round(statistics.fmean(timings), 3),
+        'stddev_us': round(statistics.stdev(timings), 3) if rounds > 1 else 0.0,
+        'ops_per_s': round(1e6 / median, 1) if median else None,
+        'iterations': iterations,
+        'rounds': rounds,
+    }
+
+
+def run_benchmark(bench, rounds=10, min_time=0.05):
+    func = bench.factory(bench.case) if bench.case is not None else bench.factory()
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(_forbid_queries))
+        return measure(func, rounds, min_time)
+
+
+def compare(results, baseline, tolerance):
+    """(name, baseline median, median, ratio) for every benchmark slower than tolerance allows."""
+    regressions = []
+    for name, result in sorted(results.items()):
+        expected = baseline.get(name)
+        if expected is None:
+            continue
+        ratio = result['median_us'] / expected['median_us']
+        if ratio > 1 + tolerance:
+            regressions.append((name, expected['median_us'], result['median_us'], ratio))
+    return regressions
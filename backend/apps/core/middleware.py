@@ -0,0 +1,127 @@
+"""
+Request instrumentation middleware.
+Records per-view wall time, database and cache usage, and response size,
+and enforces per-view query budgets.
+"""
+
+import logging
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+
+from . import metrics
+from .metrics import view_label
+
+logger = logging.getLogger(__name__)
+
+
+class QueryTimer:
+    """execute_wrapper that counts queries and their time."""
+
+    def __init__(self, stats):
+        self.stats = stats
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.stats.db_time += time.perf_counter() - start
+            self.stats.queries += 1
+
+
+class RequestMetricsMiddleware:
+    """
+    Collects request metrics into apps.core.metrics.registry.
+    Adds a Server-Timing header when METRICS_SERVER_TIMING is on, and logs
+    a warning when a view runs more queries than its budget. Runs natively
+    under both WSGI and ASGI.
+
+    Budgets come from QUERY_BUDGETS ({view path: max queries}), then a
+    `query_budget` attribute on the view class, then QUERY_BUDGET_DEFAULT.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        stats = metrics.RequestStats(request)
+        token = metrics.current_stats.set(stats)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                self.wrap_connections(stack, stats)
+                response = self.get_response(request)
+        finally:
+            metrics.current_stats.reset(token)
+        return self.record(request, response, stats, time.perf_counter() - start)
+
+    async def __acall__(self, request):
+        stats = metrics.RequestStats(request)
+        token = metrics.current_stats.set(stats)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                # The ORM runs in the request's sync thread (sync_to_async),
+                # so the timers go on that thread's connections
+                await sync_to_async(self.wrap_connections)(stack, stats)
+                response = await self.get_response(request)
+        finally:
+            metrics.current_stats.reset(token)
+        return self.record(request, response, stats, time.perf_counter() - start)
+
+    def wrap_connections(self, stack, stats):
+        timer = QueryTimer(stats)
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(timer))
+
+    def record(self, request, response, stats, duration):
+        view = view_label(request)
+        method = request.method
+        metrics.REQUESTS.inc((view, method, str(response.status_code)))
+        metrics.REQUEST_DURATION.observe((view, method), duration)
+        metrics.DB_QUERIES.observe((view, method), stats.queries)
+        metrics.DB_DURATION.observe((view, method), stats.db_time)
+        if stats.cache_hits:
+            metrics.CACHE_REQUESTS.inc((view, 'hit'), stats.cache_hits)
+        if stats.cache_misses:
+            metrics.CACHE_REQUESTS.inc((view, 'miss'), stats.cache_misses)
+        if not response.streaming:
+            metrics.RESPONSE_SIZE.observe((view, method), len(response.content))
+
+        budget = self.get_query_budget(request, view)
+        if budget is not None and stats.queries > budget:
+            metrics.QUERY_BUDGET_EXCEEDED.inc((view,))
+            logger.warning(
+                f"Query budget exceeded: {view} ran {stats.queries} queries "
+                f"(budget {budget}) for {method} {request.path}"
+            )
+
+        if getattr(settings, 'METRICS_SERVER_TIMING', False):
+            response['Server-Timing'] = (
+                f'app;dur={duration * 1000:.1f}, '
+                f'db;dur={stats.db_time * 1000:.1f};desc="{stats.queries} queries", '
+                f'cache;desc="{stats.cache_hits} hits {stats.cache_misses} misses"'
+            )
+        return response
+
+    def get_query_budget(self, request, view):
+        budgets = getattr(settings, 'QUERY_BUDGETS', {})
+        if view in budgets:
+            return budgets[view]
+        match = getattr(request, 'resolver_match', None)
+        view_class = getattr(match.func, 'view_class', None) if match else None
+        budget = getattr(view_class, 'query_budget', None)
+        if budget is not None:
+            return budget
+        return getattr(settings, 'QUERY_BUDGET_DEFAULT', None)
@@ -0,0 +1,238 @@
+"""
+Sampled request profiler.
+Profiles requests on demand (admin header) or at a 1-in-N sampling rate
+and keeps the most recent profiles in a ring buffer in the cache.
+"""
+
+import cProfile
+import logging
+import marshal
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from .metrics import view_label
+
+logger = logging.getLogger(__name__)
+
+
+PROFILE_HEADER = 'X-Profile-Request'
+PROFILE_ENGINES = ('cprofile', 'sampling')
+PROFILE_FORMATS = {'cprofile': 'pstats', 'sampling': 'collapsed'}
+
+
+class StackSampler:
+    """
+    Samples one thread's Python stack on a timer, or with thread_id None
+    every other thread's, each under its thread name as the root frame.
+    Produces collapsed stacks ("outer;inner count") for flame graphs.
+    """
+
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            if self.thread_id is not None:
+                self._sample(frames.get(self.thread_id))
+                continue
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in frames.items():
+                if thread_id != self._thread.ident:
+                    self._sample(frame, names.get(thread_id, str(thread_id)))
+
+    def _sample(self, frame, root=None):
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append(f'{code.co_name} ({code.co_filename}:{code.co_firstlineno})')
+            frame = frame.f_back
+        if stack:
+            if root is not None:
+                stack.append(root)
+            self.stacks[';'.join(reversed(stack))] += 1
+
+    def collapsed(self):
+        return ''.join(f'{stack} {count}\n' for stack, count in self.stacks.most_common())
+
+
+class ProfileStore:
+    """
+    Fixed-size ring buffer of profiles in the default cache.
+    A shared cache (Redis) makes profiles visible from every worker.
+    """
+    key_prefix = 'profiler'
+    timeout = 7 * 24 * 60 * 60
+
+    def size(self):
+        return getattr(settings, 'PROFILER_MAX_PROFILES', 50)
+
+    def _slot_key(self, slot):
+        return f'{self.key_prefix}:slot:{slot}'
+
+    def add(self, record):
+        seq_key = f'{self.key_prefix}:seq'
+        cache.add(seq_key, 0, None)
+        try:
+            seq = cache.incr(seq_key)
+        except ValueError:
+            # Evicted between add() and incr()
+            cache.set(seq_key, 1, None)
+            seq = 1
+        cache.set(self._slot_key(seq % self.size()), record, self.timeout)
+
+    def all(self):
+        records = cache.get_many([self._slot_key(slot) for slot in range(self.size())])
+        return sorted(records.values(), key=lambda record: record['created_at'], reverse=True)
+
+    def get(self, profile_id):
+        for record in self.all():
+            if record['id'] == profile_id:
+                return record
+        return None
+
+
+profile_store = ProfileStore()
+
+
+def _requested_engine(request):
+    """Engine asked for via PROFILE_HEADER by an admin, or None."""
+    value = request.headers.get(PROFILE_HEADER)
+    if not value:
+        return None
+
+    from rest_framework.exceptions import AuthenticationFailed
+    from rest_framework_simplejwt.authentication import JWTAuthentication
+    from apps.users.models import UserRole
+
+    try:
+        result = JWTAuthentication().authenticate(request)
+    except AuthenticationFailed:
+        return None
+    if result is None or result[0].role != UserRole.ADMIN:
+        return None
+    return value if value in PROFILE_ENGINES else settings.PROFILER_ENGINE
+
+
+class ProfilingMiddleware:
+    """
+    Profiles a request when an admin sends `X-Profile-Request: 1` (or an
+    engine name: cprofile, sampling), or for one in PROFILER_SAMPLE_RATE
+    requests. The profile id is returned in the X-Profile-Id header.
+    Under ASGI, sync views run in a worker thread rather than the event
+    loop thread, and cProfile only sees the thread that enables it: there
+    every profile uses the sampling engine over all threads instead, so
+    concurrent requests and idle threads show up in it too.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        selected = self.select(request)
+        if selected is None:
+            return self.get_response(request)
+        start = time.perf_counter()
+        stop = self.start_profiler(selected[0])
+        try:
+            response = self.get_response(request)
+        finally:
+            data = stop()
+        return self.store(request, response, selected, data, time.perf_counter() - start)
+
+    async def __acall__(self, request):
+        if request.headers.get(PROFILE_HEADER):
+            # Checking the admin's token queries the database
+            selected = await sync_to_async(self.select)(request)
+        else:
+            selected = self.select(request)
+        if selected is None:
+            return await self.get_response(request)
+        selected = ('sampling', selected[1])
+        start = time.perf_counter()
+        stop = self.start_profiler(selected[0], all_threads=True)
+        try:
+            response = await self.get_response(request)
+        finally:
+            data = stop()
+        return await sync_to_async(self.store)(request, response, selected, data, time.perf_counter() - start)
+
+    def select(self, request):
+        """(engine, trigger) when this request is profiled, else None."""
+        engine = _requested_engine(request)
+        if engine is not None:
+            return engine, 'header'
+        rate = getattr(settings, 'PROFILER_SAMPLE_RATE', 0)
+        if not rate or random.random() >= 1 / rate:
+            return None
+        return settings.PROFILER_ENGINE, 'sample'
+
+    def start_profiler(self, engine, all_threads=False):
+        """Profile the current thread (sampling: or all threads); returns stop() -> profile data."""
+        if engine == 'sampling':
+            thread_id = None if all_threads else threading.get_ident()
+            sampler = StackSampler(thread_id, settings.PROFILER_SAMPLING_INTERVAL)
+            sampler.start()
+
+            def stop():
+                sampler.stop()
+                return sampler.collapsed()
+        else:
+            profiler = cProfile.Profile()
+            profiler.enable()
+
+            def stop():
+                profiler.disable()
+                profiler.create_stats()
+                return marshal.dumps(profiler.stats)
+        return stop
+
+    def store(self, request, response, selected, data, duration):
+        engine, trigger = selected
+        profile_id = uuid.uuid4().hex
+        try:
+            profile_store.add({
+                'id': profile_id,
+                'engine': engine,
+                'trigger': trigger,
+                'method': request.method,
+                'path': request.path,
+                'view': view_label(request),
+                'status': response.status_code,
+                'duration_ms': round(duration * 1000, 2),
+                'created_at': timezone.now().isoformat(),
+                'data': data,
+            })
+        except Exception as exc:
+            logger.error(f'Error storing request profile: {exc}')
+            return response
+
+        response['X-Profile-Id'] = profile_id
+        return response
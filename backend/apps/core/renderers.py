@@ -0,0 +1,68 @@
+"""
+Fast JSON renderer and parser for the REST API.
+Use orjson when it is installed and DRF's stdlib implementation otherwise.
+Output matches DRF's JSONRenderer with the default settings (compact, UTF-8,
+DRF's datetime/Decimal/lazy string handling), so switching is invisible to
+clients.
+"""
+
+from django.conf import settings
+from rest_framework import renderers
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib renderer and parser
+    orjson = None
+
+# Let DRF's encoder format datetimes (millisecond precision, 'Z') as the
+# stdlib renderer does; orjson handles the other native types itself
+ORJSON_OPTIONS = (orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME) if orjson else 0
+
+# Escaped by DRF so JSON is also valid JavaScript
+LINE_SEPARATORS = ((b'\xe2\x80\xa8', b'\\u2028'), (b'\xe2\x80\xa9', b'\\u2029'))
+
+
+class FastJSONRenderer(renderers.JSONRenderer):
+    """
+    JSONRenderer on orjson. Falls back to the stdlib for indented output
+    (browsable API, ?indent) and for settings orjson cannot reproduce.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or not self._compact_utf8() or self.get_indent(
+            accepted_media_type or '', renderer_context or {}
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b''
+        content = orjson.dumps(data, default=self._default, option=ORJSON_OPTIONS)
+        for raw, escaped in LINE_SEPARATORS:
+            if raw in content:
+                content = content.replace(raw, escaped)
+        return content
+
+    def _compact_utf8(self):
+        return self.compact and not self.ensure_ascii and self.strict
+
+    _default = staticmethod(JSONEncoder().default)
+
+
+class FastJSONParser(JSONParser):
+    """JSONParser on orjson: same errors, and NaN/Infinity stay rejected."""
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None:
+            return super().parse(stream, media_type, parser_context)
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        try:
+            content = stream.read()
+            if encoding.lower().replace('-', '') != 'utf8':
+                content = content.decode(encoding).encode()
+            return orjson.loads(content)
+        except (ValueError, UnicodeError) as exc:
+            raise ParseError(f'JSON parse error - {exc}')
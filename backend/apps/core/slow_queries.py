@@ -0,0 +1,190 @@
+"""
+Slow query log.
+Captures queries slower than SLOW_QUERY_THRESHOLD_MS, aggregated by
+normalized SQL fingerprint in a bounded per-process structure, with an
+optional EXPLAIN of each new fingerprint.
+"""
+
+import hashlib
+import logging
+import re
+import statistics
+import threading
+import time
+import traceback
+from collections import OrderedDict, deque
+
+from django.conf import settings
+from django.utils import timezone
+
+from . import metrics
+from .metrics import view_label
+
+logger = logging.getLogger(__name__)
+
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r'\b\d+(?:\.\d+)?\b')
+_IN_LIST_RE = re.compile(r'\bIN\s*\((?:\s*(?:%s|\?|\d+)\s*,?)+\)', re.IGNORECASE)
+_SPACE_RE = re.compile(r'\s+')
+
+SAMPLES_PER_FINGERPRINT = 256
+STACK_DEPTH = 8
+
+
+def normalize_sql(sql):
+    """Replace literals and IN lists so equivalent queries share a fingerprint."""
+    sql = _STRING_RE.sub('?', sql)
+    sql = _NUMBER_RE.sub('?', sql)
+    sql = _IN_LIST_RE.sub('IN (...)', sql)
+    return _SPACE_RE.sub(' ', sql).strip()
+
+
+def fingerprint(normalized_sql):
+    return hashlib.sha1(normalized_sql.encode()).hexdigest()[:16]
+
+
+def params_fingerprint(params):
+    """Hash of the parameters, so repeats are visible without storing values."""
+    return hashlib.sha1(repr(params).encode()).hexdigest()[:12]
+
+
+def project_stack():
+    """Innermost frames from project code (minus this app), outermost first."""
+    base_dir = str(settings.BASE_DIR)
+    core_dir = str(settings.BASE_DIR / 'apps' / 'core')
+    frames = [
+        f'{frame.filename.removeprefix(base_dir).lstrip("/")}:{frame.lineno} in {frame.name}'
+        for frame in traceback.extract_stack()
+        if frame.filename.startswith(base_dir)
+        and not frame.filename.startswith(core_dir)
+        and 'site-packages' not in frame.filename
+    ]
+    return frames[-STACK_DEPTH:]
+
+
+class SlowQueryLog:
+    """
+    Slow queries by fingerprint, least recently seen evicted first.
+    Keeps count, total and max time, recent durations for percentiles,
+    and the latest example, view, and stack.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def max_fingerprints(self):
+        return getattr(settings, 'SLOW_QUERY_MAX_FINGERPRINTS', 200)
+
+    def record(self, sql, params, duration, alias, view):
+        normalized = normalize_sql(sql)
+        key = fingerprint(normalized)
+        with self._lock:
+            entry = self._entries.get(key)
+            is_new = entry is None
+            if is_new:
+                entry = self._entries[key] = {
+                    'fingerprint': key,
+                    'sql': normalized,
+                    'database': alias,
+                    'count': 0,
+                    'total_ms': 0.0,
+                    'max_ms': 0.0,
+                    'samples': deque(maxlen=SAMPLES_PER_FINGERPRINT),
+                    'explain': None,
+                }
+                while len(self._entries) > self.max_fingerprints():
+                    self._entries.popitem(last=False)
+            else:
+                self._entries.move_to_end(key)
+
+            duration_ms = duration * 1000
+            entry['count'] += 1
+            entry['total_ms'] += duration_ms
+            entry['max_ms'] = max(entry['max_ms'], duration_ms)
+            entry['samples'].append(duration_ms)
+            entry['example_sql'] = sql
+            entry['params_fingerprint'] = params_fingerprint(params)
+            entry['view'] = view
+            entry['stack'] = project_stack()
+            entry['last_seen'] = timezone.now().isoformat()
+        return entry, is_new
+
+    def set_explain(self, key, plan):
+        with self._lock:
+            if key in self._entries:
+                self._entries[key]['explain'] = plan
+
+    def snapshot(self):
+        """Entries as plain dicts with p50/p95 computed from recent samples."""
+        with self._lock:
+            entries = [dict(entry, samples=list(entry['samples'])) for entry in self._entries.values()]
+        for entry in entries:
+            samples = sorted(entry.pop('samples'))
+            entry['p50_ms'] = round(statistics.median(samples), 2)
+            entry['p95_ms'] = round(samples[max(0, int(len(samples) * 0.95) - 1)], 2)
+            entry['total_ms'] = round(entry['total_ms'], 2)
+            entry['max_ms'] = round(entry['max_ms'], 2)
+        return entries
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+slow_query_log = SlowQueryLog()
+
+
+def explain(connection, sql, params):
+    """Run the backend's EXPLAIN for a SELECT on a raw cursor; None on failure."""
+    if not sql.lstrip().upper().startswith('SELECT'):
+        return None
+    if not connection.features.supports_explaining_query_execution:
+        return None
+    # Inside a transaction, a failed EXPLAIN would abort the caller's
+    # transaction (PostgreSQL); a savepoint confines it. None in autocommit
+    savepoint = connection.savepoint()
+    try:
+        # A raw backend cursor bypasses execute wrappers, so the EXPLAIN is
+        # not recorded itself, and leaves the caller's cursor untouched
+        cursor = connection.create_cursor()
+        try:
+            cursor.execute(f'{connection.ops.explain_query_prefix()} {sql}', params)
+            plan = '\n'.join(' '.join(str(column) for column in row) for row in cursor.fetchall())
+        finally:
+            cursor.close()
+    except Exception as exc:
+        if savepoint:
+            connection.savepoint_rollback(savepoint)
+        logger.warning(f'Could not EXPLAIN slow query: {exc}')
+        return None
+    if savepoint:
+        connection.savepoint_commit(savepoint)
+    return plan
+
+
+def slow_query_wrapper(execute, sql, params, many, context):
+    """execute_wrapper installed on every connection by CoreConfig.ready()."""
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration = time.perf_counter() - start
+        if duration * 1000 >= settings.SLOW_QUERY_THRESHOLD_MS:
+            connection = context['connection']
+            stats = metrics.current_stats.get()
+            view = view_label(stats.request) if stats is not None else None
+            entry, is_new = slow_query_log.record(sql, params, duration, connection.alias, view)
+            if is_new and not many and getattr(settings, 'SLOW_QUERY_EXPLAIN', False):
+                slow_query_log.set_explain(entry['fingerprint'], explain(connection, sql, params))
+
+
+def install_slow_query_wrapper(sender, connection, **kwargs):
+    """connection_created handler; wrappers persist across reconnects."""
+    if slow_query_wrapper not in connection.execute_wrappers:
+        # First in the list, so outermost (Django applies wrappers in
+        # reverse): its timing includes the other wrappers, which are
+        # cheap. Appending instead would put it where an execute_wrapper()
+        # context active while the connection opens pops on exit
+        connection.execute_wrappers.insert(0, slow_query_wrapper)
@@ -0,0 +1,121 @@
+"""
+SQLite tuning for single-node deployments.
+Applies WAL and related pragmas to every new SQLite connection, and
+provides a serialized writer: one background thread per process that
+applies queued writes (view counters, analytics rows) in batched
+transactions, so request threads never wait on SQLite's single write lock.
+"""
+
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+
+logger = logging.getLogger(__name__)
+
+
+def configure_sqlite_connection(sender, connection, **kwargs):
+    """connection_created handler applying SQLITE_* pragmas."""
+    if connection.vendor != 'sqlite' or not getattr(settings, 'SQLITE_PRAGMAS', False):
+        return
+    # On the raw connection, so the pragmas stay out of query metrics and logs
+    raw = connection.connection
+    raw.execute('PRAGMA journal_mode=WAL')
+    raw.execute('PRAGMA synchronous=NORMAL')
+    raw.execute(f'PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}')
+    raw.execute(f'PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}')
+    # Negative cache_size is in KiB rather than pages
+    raw.execute(f'PRAGMA cache_size=-{int(settings.SQLITE_CACHE_SIZE_KB)}')
+    raw.execute('PRAGMA temp_store=MEMORY')
+
+
+def remove_wal_files(path):
+    """Delete the -wal and -shm files WAL mode leaves next to a database file."""
+    for suffix in ('-wal', '-shm'):
+        try:
+            os.remove(f'{path}{suffix}')
+        except FileNotFoundError:
+            pass
+
+
+class SerializedWriter:
+    """
+    Single writer thread. submit(handler, item) queues an item; the thread
+    groups whatever is queued (up to max_batch, waiting at most max_delay
+    for more) by handler and calls handler(items) for each group inside
+    one transaction.
+    """
+
+    def __init__(self, max_batch=500, max_delay=0.05):
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._queue = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def submit(self, handler, item):
+        self._ensure_started()
+        self._queue.put((handler, item))
+
+    def flush(self, timeout=10):
+        """Block until everything submitted before this call is written."""
+        if self._thread is None:
+            return True
+        done = threading.Event()
+        self._queue.put((None, done))
+        return done.wait(timeout)
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                thread = threading.Thread(target=self._run, name='sqlite-writer', daemon=True)
+                thread.start()
+                self._thread = thread
+                atexit.register(self.flush)
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_delay
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._apply(batch)
+
+    def _apply(self, batch):
+        grouped, markers = {}, []
+        for handler, item in batch:
+            if handler is None:
+                markers.append(item)
+            else:
+                grouped.setdefault(handler, []).append(item)
+        try:
+            if grouped:
+                close_old_connections()
+                with transaction.atomic():
+                    for handler, items in grouped.items():
+                        handler(items)
+        except Exception as exc:
+            logger.error(f'Serialized write of {len(batch) - len(markers)} items failed: {exc}')
+        finally:
+            for marker in markers:
+                marker.set()
+
+
+writer = SerializedWriter()
+
+
+def serialized_writes_enabled():
+    return connection.vendor == 'sqlite' and getattr(settings, 'SQLITE_SERIALIZED_WRITES', False)
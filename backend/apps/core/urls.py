@@ -0,0 +1,22 @@
+"""
+URL patterns for Core app.
+"""
+
+from django.urls import path
+from .views import (
+    # Admin profiling views
+    AdminProfileListView,
+    AdminProfileDownloadView,
+    
+    # Admin slow query views
+    AdminSlowQueryListView,
+)
+
+urlpatterns = [
+    # Admin profiling endpoints
+    path('admin/profiles/', AdminProfileListView.as_view(), name='admin-profiles-list'),
+    path('admin/profiles/<str:profile_id>/', AdminProfileDownloadView.as_view(), name='admin-profile-download'),
+    
+    # Admin slow query log
+    path('admin/slow-queries/', AdminSlowQueryListView.as_view(), name='admin-slow-queries'),
+]
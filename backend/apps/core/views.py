@@ -0,0 +1,125 @@
+"""
+Views for Core app.
+Prometheus metrics endpoint and admin performance diagnostics.
+"""
+
+import hmac
+
+from rest_framework import status, views
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from django.conf import settings
+from django.http import Http404, HttpResponse, HttpResponseForbidden
+from django.views.decorators.http import require_GET
+
+from apps.users.permissions import IsAdmin
+from .metrics import registry
+from .profiling import PROFILE_FORMATS, profile_store
+from .slow_queries import slow_query_log
+
+
+@require_GET
+def metrics_view(request):
+    """
+    Prometheus scrape endpoint for this worker's metrics.
+    GET /metrics
+
+    Requires `Authorization: Bearer <METRICS_TOKEN>` when METRICS_TOKEN is
+    set; without a token it is only served in DEBUG.
+    """
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    if token:
+        supplied = request.headers.get('Authorization', '').removeprefix('Bearer ')
+        if not hmac.compare_digest(supplied.encode(), token.encode()):
+            return HttpResponseForbidden()
+    elif not settings.DEBUG:
+        raise Http404
+
+    return HttpResponse(
+        registry.render(),
+        content_type='text/plain; version=0.0.4; charset=utf-8',
+    )
+
+
+# ============================================================
+# Admin Profiling Views
+# ============================================================
+
+class AdminProfileListView(views.APIView):
+    """
+    Admin: List stored request profiles, newest first.
+    GET /api/core/admin/profiles/
+    """
+    permission_classes = [IsAuthenticated, IsAdmin]
+    
+    def get(self, request):
+        profiles = [
+            {key: value for key, value in record.items() if key != 'data'}
+            for record in profile_store.all()
+        ]
+        for profile in profiles:
+            profile['format'] = PROFILE_FORMATS[profile['engine']]
+        return Response(profiles)
+
+
+class AdminProfileDownloadView(views.APIView):
+    """
+    Admin: Download a stored profile.
+    GET /api/core/admin/profiles/<id>/
+    
+    cProfile captures download as pstats files (load with pstats.Stats),
+    sampling captures as collapsed stacks (flamegraph.pl, speedscope).
+    """
+    permission_classes = [IsAuthenticated, IsAdmin]
+    
+    def get(self, request, profile_id):
+        record = profile_store.get(profile_id)
+        if record is None:
+            return Response(
+                {'error': 'Profile not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        if record['engine'] == 'sampling':
+            response = HttpResponse(record['data'], content_type='text/plain; charset=utf-8')
+            filename = f'{profile_id}.collapsed'
+        else:
+            response = HttpResponse(record['data'], content_type='application/octet-stream')
+            filename = f'{profile_id}.pstats'
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+
+# ============================================================
+# Admin Slow Query Views
+# ============================================================
+
+class AdminSlowQueryListView(views.APIView):
+    """
+    Admin: Slow queries recorded by this worker, grouped by fingerprint.
+    GET /api/core/admin/slow-queries/?ordering=-total_ms
+    DELETE /api/core/admin/slow-queries/
+    """
+    permission_classes = [IsAuthenticated, IsAdmin]
+    ordering_fields = ['count', 'total_ms', 'max_ms', 'p50_ms', 'p95_ms', 'last_seen']
+    
+    def get(self, request):
+        ordering = request.query_params.get('ordering', '-total_ms')
+        field = ordering.lstrip('-')
+        if field not in self.ordering_fields:
+            return Response(
+                {'error': f'Invalid ordering. Must be one of: {self.ordering_fields}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        entries = slow_query_log.snapshot()
+        entries.sort(key=lambda entry: entry[field], reverse=ordering.startswith('-'))
+        return Response({
+            'threshold_ms': settings.SLOW_QUERY_THRESHOLD_MS,
+            'count': len(entries),
+            'results': entries,
+        })
+    
+    def delete(self, request):
+        slow_query_log.clear()
+        return Response(status=status.HTTP_204_NO_CONTENT)
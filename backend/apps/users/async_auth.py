@@ -0,0 +1,196 @@
+"""
+Async login for the ASGI application.
+Runs authenticate() in a bounded worker pool so the event loop stays
+free while passwords are hashed, and answers repeated wrong passwords
+from the cache.
+"""
+
+import asyncio
+import hashlib
+import hmac
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import authenticate
+from django.contrib.auth.signals import user_logged_in, user_login_failed
+from django.core.cache import cache
+from django.db import close_old_connections
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+
+from apps.core.db import reset_worker_connections
+
+from .models import User
+from .serializers import CustomTokenObtainPairSerializer
+from .views import LoginView
+
+
+NO_ACTIVE_ACCOUNT = 'No active account found with the given credentials'
+
+_executor = None
+_pending = 0
+
+
+def get_hash_executor():
+    """
+    Return the shared password-hashing pool.
+    PBKDF2 releases the GIL, so threads scale across cores; set
+    LOGIN_HASH_EXECUTOR='process' to use processes instead.
+    """
+    global _executor
+    if _executor is None:
+        workers = getattr(settings, 'LOGIN_HASH_WORKERS', 0) or os.cpu_count() or 1
+        if getattr(settings, 'LOGIN_HASH_EXECUTOR', 'thread') == 'process':
+            _executor = ProcessPoolExecutor(max_workers=workers, initializer=reset_worker_connections)
+        else:
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='login-hash')
+    return _executor
+
+
+class LoginQueueFull(Exception):
+    """Raised when too many password checks are already queued."""
+
+
+def _authenticate(request, credentials):
+    """
+    authenticate() in a pool worker: the configured backends, password
+    hash upgrades and user_login_failed all apply as in LoginView.
+    """
+    try:
+        return authenticate(request, **credentials)
+    finally:
+        # Workers keep their own connections; end each call like a request
+        close_old_connections()
+
+
+async def run_in_hash_pool(func, *args):
+    """
+    Run func(*args) in the hashing pool.
+    Raises LoginQueueFull once LOGIN_MAX_PENDING calls are in flight.
+    """
+    global _pending
+    if _pending >= getattr(settings, 'LOGIN_MAX_PENDING', 64):
+        raise LoginQueueFull()
+
+    _pending += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_hash_executor(), func, *args)
+    finally:
+        _pending -= 1
+
+
+async def authenticate_async(request, credentials):
+    """authenticate() in the hashing pool; raises LoginQueueFull like run_in_hash_pool()."""
+    if isinstance(get_hash_executor(), ProcessPoolExecutor):
+        # The request cannot cross a process boundary
+        request = None
+    return await run_in_hash_pool(_authenticate, request, credentials)
+
+
+def _failure_cache_key(email, password, encoded):
+    """
+    Cache key for a failed attempt.
+    Includes the stored hash, so a password change invalidates it.
+    """
+    message = '\0'.join([email, password, encoded or '']).encode()
+    digest = hmac.new(settings.SECRET_KEY.encode(), message, hashlib.sha256).hexdigest()
+    return f'login:failed:{digest}'
+
+
+def _error(detail, status, code=None, headers=None):
+    body = {'detail': detail}
+    if code:
+        body['code'] = code
+    return JsonResponse(body, status=status, headers=headers)
+
+
+def _throttle_wait(request):
+    """
+    Apply LoginView's throttles (anon, user and the login scope); return
+    seconds to wait or None. As in DRF, every throttle counts the request.
+    """
+    view = LoginView()
+    waits = [
+        throttle.wait()
+        for throttle in view.get_throttles()
+        if not throttle.allow_request(request, view)
+    ]
+    if not waits:
+        return None
+    return max((wait for wait in waits if wait is not None), default=0)
+
+
+def _issue_tokens(request, user):
+    """Build the same payload as LoginView (runs in a thread, touches the DB)."""
+    refresh = CustomTokenObtainPairSerializer.get_token(user)
+    user_logged_in.send(sender=user.__class__, request=request, user=user)
+    return {
+        'refresh': str(refresh),
+        'access': str(refresh.access_token),
+        'user': CustomTokenObtainPairSerializer.get_user_data(user),
+    }
+
+
+@csrf_exempt
+@require_POST
+async def async_login(request):
+    """
+    Async user login endpoint (ASGI only).
+    POST /api/auth/login/
+    """
+    try:
+        payload = json.loads(request.body or b'{}')
+    except ValueError:
+        return _error('JSON parse error', 400)
+    if not isinstance(payload, dict):
+        payload = {}
+
+    missing = {
+        field: ['This field is required.']
+        for field in (User.USERNAME_FIELD, 'password')
+        if not payload.get(field)
+    }
+    if missing:
+        return JsonResponse(missing, status=400)
+
+    wait = await sync_to_async(_throttle_wait)(request)
+    if wait is not None:
+        return _error(
+            f'Request was throttled. Expected available in {wait} seconds.', 429,
+            'throttled', headers={'Retry-After': str(wait)}
+        )
+
+    email = str(payload[User.USERNAME_FIELD])
+    password = str(payload['password'])
+    credentials = {User.USERNAME_FIELD: email, 'password': password}
+
+    account = await User.objects.filter(**{User.USERNAME_FIELD: email}).afirst()
+    encoded = account.password if account is not None else None
+
+    failure_key = _failure_cache_key(email, password, encoded)
+    if await cache.aget(failure_key):
+        await user_login_failed.asend(
+            sender=__name__,
+            credentials={User.USERNAME_FIELD: email, 'password': '********************'},
+            request=request,
+        )
+        return _error(NO_ACTIVE_ACCOUNT, 401, 'no_active_account')
+
+    try:
+        user = await authenticate_async(request, credentials)
+    except LoginQueueFull:
+        return _error('Too many login attempts in progress. Try again shortly.', 503, headers={'Retry-After': '1'})
+
+    if user is None or not user.is_active:
+        # Only wrong passwords: an inactive account may be activated at any time
+        if account is not None and account.is_active:
+            await cache.aset(failure_key, True, getattr(settings, 'LOGIN_FAILURE_CACHE_TTL', 300))
+        return _error(NO_ACTIVE_ACCOUNT, 401, 'no_active_account')
+
+    data = await sync_to_async(_issue_tokens)(request, user)
+    return JsonResponse(data)
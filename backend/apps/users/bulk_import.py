@@ -0,0 +1,274 @@
+"""
+Bulk user import for User app.
+Imports users from CSV or NDJSON with set-based validation,
+parallel password hashing, and batched inserts.
+
+Uploads through the admin API are imported by a Celery task
+(tasks.import_users_file), hashing inline; only the import_users
+management command hashes across a process pool, never a web worker.
+"""
+
+import csv
+import io
+import json
+import logging
+import os
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+
+from rest_framework import serializers, status, views
+from rest_framework.parsers import MultiPartParser, FormParser
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from celery.result import AsyncResult
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.files.storage import default_storage
+from django.db import IntegrityError, transaction
+
+from apps.core.db import reset_worker_connections
+
+from .models import User, UserProfile, UserRole, UserSearchToken
+from .permissions import IsAdmin
+from .search import make_search_token_rows
+
+
+logger = logging.getLogger(__name__)
+
+IMPORT_FORMATS = ('csv', 'ndjson')
+DEFAULT_BATCH_SIZE = 500
+
+
+class BulkUserRowSerializer(serializers.Serializer):
+    """
+    Validates a single import row.
+    Uniqueness is checked per batch by `import_users`, not per row.
+    """
+    email = serializers.EmailField(max_length=255)
+    username = serializers.CharField(min_length=3, max_length=150)
+    password = serializers.CharField(required=False, allow_blank=True)
+    first_name = serializers.CharField(required=False, allow_blank=True, max_length=150)
+    last_name = serializers.CharField(required=False, allow_blank=True, max_length=150)
+    phone = serializers.RegexField(
+        User.phone_regex.regex, required=False, allow_blank=True, max_length=17
+    )
+    position = serializers.CharField(required=False, allow_blank=True, max_length=100)
+    role = serializers.ChoiceField(choices=UserRole.choices, default=UserRole.CUSTOMER)
+    is_active = serializers.BooleanField(default=True)
+    is_verified = serializers.BooleanField(default=False)
+
+    def validate_email(self, value):
+        return value.lower()
+
+    def validate_username(self, value):
+        return value.lower()
+
+
+def detect_format(filename):
+    """Guess the import format from a file name."""
+    if filename and filename.lower().endswith(('.ndjson', '.jsonl')):
+        return 'ndjson'
+    return 'csv'
+
+
+def read_rows(stream, fmt='csv'):
+    """
+    Yield (row_number, data) pairs from a text stream.
+    Malformed NDJSON lines are yielded as strings for error reporting.
+    """
+    if fmt == 'ndjson':
+        row_number = 0
+        for line in stream:
+            line = line.strip()
+            if not line:
+                continue
+            row_number += 1
+            try:
+                data = json.loads(line)
+            except ValueError:
+                data = line
+            yield row_number, data
+    else:
+        for row_number, data in enumerate(csv.DictReader(stream), start=1):
+            yield row_number, data
+
+
+def _hash_passwords(passwords, executor):
+    """Hash raw passwords, in the process pool when one is available."""
+    if executor is None:
+        return [make_password(password) for password in passwords]
+    return list(executor.map(make_password, passwords, chunksize=16))
+
+
+def _import_batch(batch, seen_emails, seen_usernames, executor, report):
+    """Validate, hash, and insert one batch of rows."""
+    valid = []
+    for row_number, data in batch:
+        if not isinstance(data, dict):
+            report['errors'].append({'row': row_number, 'errors': {'row': ['Malformed row.']}})
+            continue
+
+        # Treat empty CSV cells as missing values
+        data = {key: value for key, value in data.items() if value not in ('', None)}
+        serializer = BulkUserRowSerializer(data=data)
+        if not serializer.is_valid():
+            report['errors'].append({'row': row_number, 'errors': serializer.errors})
+            continue
+        valid.append((row_number, serializer.validated_data))
+
+    # Set-based uniqueness checks against the database
+    emails = [attrs['email'] for _, attrs in valid]
+    usernames = [attrs['username'] for _, attrs in valid]
+    existing_emails = set(User.objects.filter(email__in=emails).values_list('email', flat=True))
+    existing_usernames = set(
+        User.objects.filter(username__in=usernames).values_list('username', flat=True)
+    )
+
+    rows = []
+    for row_number, attrs in valid:
+        errors = {}
+        if attrs['email'] in existing_emails or attrs['email'] in seen_emails:
+            errors['email'] = ['A user with this email already exists.']
+        if attrs['username'] in existing_usernames or attrs['username'] in seen_usernames:
+            errors['username'] = ['A user with this username already exists.']
+        if errors:
+            report['errors'].append({'row': row_number, 'errors': errors})
+            continue
+        seen_emails.add(attrs['email'])
+        seen_usernames.add(attrs['username'])
+        rows.append((row_number, attrs))
+
+    if not rows:
+        return
+
+    hashes = _hash_passwords([attrs.pop('password', None) or None for _, attrs in rows], executor)
+    users = [
+        User(password=password_hash, **attrs)
+        for (_, attrs), password_hash in zip(rows, hashes)
+    ]
+
+    try:
+        with transaction.atomic():
+            User.objects.bulk_create(users)
+            if any(user.pk is None for user in users):
+                ids = dict(
+                    User.objects.filter(email__in=[user.email for user in users])
+                    .values_list('email', 'id')
+                )
+                for user in users:
+                    user.pk = ids[user.email]
+            UserProfile.objects.bulk_create([UserProfile(user_id=user.pk) for user in users])
+            UserSearchToken.objects.bulk_create([
+                token for user in users for token in make_search_token_rows(user)
+            ])
+    except IntegrityError as exc:
+        for row_number, _ in rows:
+            report['errors'].append({'row': row_number, 'errors': {'row': [str(exc)]}})
+        return
+
+    report['created'] += len(users)
+
+
+def import_users(rows, batch_size=DEFAULT_BATCH_SIZE, workers=None):
+    """
+    Import users from an iterable of (row_number, data) pairs.
+    Passwords are hashed across `workers` processes (0 hashes inline).
+    Returns a report with created/failed counts and per-row errors.
+    """
+    if workers is None:
+        workers = getattr(settings, 'BULK_IMPORT_WORKERS', None) or os.cpu_count() or 1
+
+    report = {'total': 0, 'created': 0, 'failed': 0, 'errors': []}
+    seen_emails, seen_usernames = set(), set()
+    executor = None
+    if workers > 1:
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=reset_worker_connections)
+
+    try:
+        batch = []
+        for row in rows:
+            report['total'] += 1
+            batch.append(row)
+            if len(batch) >= batch_size:
+                _import_batch(batch, seen_emails, seen_usernames, executor, report)
+                batch = []
+        if batch:
+            _import_batch(batch, seen_emails, seen_usernames, executor, report)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    report['failed'] = len(report['errors'])
+    report['errors'].sort(key=lambda error: error['row'])
+    return report
+
+
+def import_users_upload(path, fmt):
+    """Import an uploaded file saved to default_storage, then delete it."""
+    try:
+        with default_storage.open(path, 'rb') as upload:
+            stream = io.TextIOWrapper(upload, encoding='utf-8-sig', newline='')
+            # Hash inline: the caller (a Celery or web worker) must not fork a pool
+            return import_users(read_rows(stream, fmt), workers=0)
+    finally:
+        default_storage.delete(path)
+
+
+class AdminUserBulkImportView(views.APIView):
+    """
+    Admin: Bulk import users from a CSV or NDJSON file.
+    POST /api/users/admin/users/import/
+    Queues the import and returns 202 with its task id; without a Celery
+    broker the import runs in the request and returns its report.
+    """
+    permission_classes = [IsAuthenticated, IsAdmin]
+    parser_classes = [MultiPartParser, FormParser]
+
+    def post(self, request):
+        upload = request.FILES.get('file')
+        if not upload:
+            return Response(
+                {'error': 'A file upload is required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        fmt = request.data.get('format') or detect_format(upload.name)
+        if fmt not in IMPORT_FORMATS:
+            return Response(
+                {'error': f'Invalid format. Must be one of: {list(IMPORT_FORMATS)}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        # The worker reads the file from storage, not from this request
+        path = default_storage.save(f'imports/{uuid.uuid4().hex}.{fmt}', upload)
+
+        from .tasks import import_users_file
+        try:
+            task = import_users_file.delay(path, fmt)
+        except Exception as exc:
+            # No broker (e.g. local development): import in-process
+            logger.warning(f'Could not queue user import: {exc}')
+            report = import_users_upload(path, fmt)
+            return Response(
+                report,
+                status=status.HTTP_201_CREATED if report['created'] else status.HTTP_200_OK
+            )
+
+        return Response({'task_id': task.id, 'status': task.status}, status=status.HTTP_202_ACCEPTED)
+
+
+class AdminUserBulkImportStatusView(views.APIView):
+    """
+    Admin: State of a queued bulk import, with its report once finished.
+    GET /api/users/admin/users/import/<task_id>/
+    """
+    permission_classes = [IsAuthenticated, IsAdmin]
+
+    def get(self, request, task_id):
+        result = AsyncResult(task_id)
+        data = {'task_id': task_id, 'status': result.status}
+        if result.successful():
+            data['report'] = result.result
+        elif result.failed():
+            data['error'] = str(result.result)
+        return Response(data)
@@ -0,0 +1,47 @@
+"""
+Load-test scenarios for users.
+Logins, profile browsing and autocomplete.
+"""
+
+from apps.core import load_data
+from apps.core.load_test import scenario, setup
+
+USERS_PER_ROLE = 1000
+
+
+@setup
+def user_context(context):
+    from .models import User, UserRole
+
+    # Only generated users share a known password
+    generated = User.objects.filter(email__endswith=f'@{load_data.LOAD_EMAIL_DOMAIN}', is_active=True)
+    context['users'] = {
+        role: list(generated.filter(role=role).order_by('id').values_list('email', flat=True)[:USERS_PER_ROLE])
+        for role in UserRole.values
+    }
+
+
+@scenario(weight=3)
+async def login(session):
+    # Each login comes from a new client, as the login throttle is per IP
+    session.new_ip()
+    role = 'customer' if session.rng.random() < 0.9 else 'staff'
+    if await session.login(role):
+        await session.get('/api/users/me/', 'users:me')
+
+
+@scenario(weight=5)
+async def browse_profiles(session):
+    params = {}
+    if session.rng.random() < 0.3:
+        params['search'] = session.rng.choice(load_data.POSITIONS)
+    await session.get('/api/users/profiles/', 'users:profiles', auth=False, params=params)
+
+
+@scenario(weight=4)
+async def autocomplete(session):
+    name = session.rng.choice(load_data.FIRST_NAMES + load_data.LAST_NAMES)
+    # Type the name one keystroke at a time, as a search box would
+    for length in range(2, min(len(name), 5) + 1):
+        await session.get('/api/users/autocomplete/', 'users:autocomplete', auth=False,
+                          params={'q': name[:length]})
@@ -0,0 +1,59 @@
+"""
+Benchmark password verification throughput for the login path.
+Usage: python manage.py bench_login [--requests 200] [--concurrency 32]
+
+Compares inline verification (as in the sync LoginView) with the hashing
+pool the ASGI login authenticates in, and reports logins/sec per core.
+No database access is needed.
+"""
+
+import asyncio
+import os
+import time
+
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, make_password
+from django.core.management.base import BaseCommand
+
+from apps.users.async_auth import get_hash_executor, run_in_hash_pool
+
+
+class Command(BaseCommand):
+    help = 'Benchmark login password verification throughput.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument('--concurrency', type=int, default=32)
+
+    def handle(self, *args, **options):
+        total = options['requests']
+        concurrency = min(options['concurrency'], settings.LOGIN_MAX_PENDING)
+        cores = os.cpu_count() or 1
+        encoded = make_password('benchmark-password')
+
+        start = time.perf_counter()
+        for _ in range(total):
+            check_password('benchmark-password', encoded)
+        inline_elapsed = time.perf_counter() - start
+
+        pooled_elapsed = asyncio.run(self._run_pooled(encoded, total, concurrency))
+        workers = get_hash_executor()._max_workers
+
+        for label, elapsed in (('inline', inline_elapsed), ('pooled', pooled_elapsed)):
+            rate = total / elapsed
+            self.stdout.write(
+                f'{label:>7}: {rate:8.1f} logins/sec  {rate / cores:8.1f} logins/sec/core  '
+                f'({total} logins in {elapsed:.2f}s)'
+            )
+        self.stdout.write(f'cores={cores} pool_workers={workers} concurrency={concurrency}')
+
+    async def _run_pooled(self, encoded, total, concurrency):
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def login():
+            async with semaphore:
+                await run_in_hash_pool(check_password, 'benchmark-password', encoded)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(login() for _ in range(total)))
+        return time.perf_counter() - start
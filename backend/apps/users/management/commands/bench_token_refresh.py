@@ -0,0 +1,78 @@
+"""
+Benchmark /api/auth/refresh/ latency against a large token history.
+Usage: python manage.py bench_token_refresh [--tokens 100000] [--refreshes 500]
+The default history seeds in under a minute; pass e.g. --tokens 10000000
+for a production-sized one (far slower to seed).
+
+Runs against a throwaway test database, seeded with historical
+outstanding and blacklisted tokens, and compares refresh latency with
+the blacklist Bloom filter off and on.
+"""
+
+import statistics
+import time
+import uuid
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import override_settings
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+from apps.users.models import User
+from apps.users.token_blacklist import FilteredTokenRefreshSerializer, blacklist_filter
+
+
+class Command(BaseCommand):
+    help = 'Benchmark token refresh latency with a large blacklist history.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tokens', type=int, default=100000, help='Historical tokens to seed')
+        parser.add_argument('--refreshes', type=int, default=500)
+        parser.add_argument('--batch-size', type=int, default=10000)
+
+    def handle(self, *args, **options):
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            user = User.objects.create_user('bench@example.com', 'bench', 'bench-password')
+            self._seed(user, options['tokens'], options['batch_size'])
+
+            for enabled in (False, True):
+                with override_settings(JWT_BLACKLIST_FILTER=enabled):
+                    blacklist_filter.reset()
+                    samples = self._refresh(user, options['refreshes'])
+                label = 'filter on' if enabled else 'filter off'
+                samples.sort()
+                self.stdout.write(
+                    f'{label:>10}: p50={statistics.median(samples):.2f}ms '
+                    f'p95={samples[int(len(samples) * 0.95) - 1]:.2f}ms '
+                    f'max={samples[-1]:.2f}ms'
+                )
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    def _seed(self, user, total, batch_size):
+        self.stdout.write(f'Seeding {total} historical tokens...')
+        expires_at = timezone.now() + timedelta(days=7)
+        for start in range(0, total, batch_size):
+            tokens = OutstandingToken.objects.bulk_create([
+                OutstandingToken(user=user, jti=uuid.uuid4().hex, token='', expires_at=expires_at)
+                for _ in range(min(batch_size, total - start))
+            ])
+            if any(token.pk is None for token in tokens):
+                tokens = OutstandingToken.objects.filter(
+                    jti__in=[token.jti for token in tokens]
+                )
+            BlacklistedToken.objects.bulk_create([BlacklistedToken(token=token) for token in tokens])
+
+    def _refresh(self, user, count):
+        refresh = str(FilteredTokenRefreshSerializer.token_class.for_user(user))
+        samples = []
+        for _ in range(count):
+            start = time.perf_counter()
+            serializer = FilteredTokenRefreshSerializer(data={'refresh': refresh})
+            serializer.is_valid(raise_exception=True)
+            samples.append((time.perf_counter() - start) * 1000)
+            refresh = serializer.validated_data['refresh']
+        return samples
@@ -0,0 +1,114 @@
+"""
+Benchmark user search latency at scale.
+Usage: python manage.py bench_user_search [--users 1000000] [--queries 200]
+
+Runs against a throwaway test database and compares the old icontains
+scan with the UserSearchToken prefix index for typed-prefix queries.
+"""
+
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Q
+
+from apps.users.models import User, UserSearchField, UserSearchToken
+from apps.users.search import filter_by_prefixes, make_search_token_rows
+
+
+FIRST_NAMES = [
+    'james', 'mary', 'john', 'patricia', 'robert', 'jennifer', 'michael', 'linda',
+    'william', 'elizabeth', 'david', 'barbara', 'richard', 'susan', 'joseph', 'jessica',
+    'thomas', 'sarah', 'charles', 'karen', 'priya', 'wei', 'ahmed', 'olga', 'kenji',
+]
+LAST_NAMES = [
+    'smith', 'johnson', 'williams', 'brown', 'jones', 'garcia', 'miller', 'davis',
+    'rodriguez', 'martinez', 'hernandez', 'lopez', 'gonzalez', 'wilson', 'anderson',
+    'thomas', 'taylor', 'moore', 'jackson', 'martin', 'patel', 'chen', 'khan', 'ivanova',
+]
+POSITIONS = ['engineer', 'designer', 'manager', 'analyst', 'developer', 'consultant', '']
+DOMAINS = ['example.com', 'mail.test', 'corp.local', 'inbox.dev']
+
+
+class Command(BaseCommand):
+    help = 'Benchmark indexed user search against icontains at scale.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100000)
+        parser.add_argument('--queries', type=int, default=200)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            self._seed(rng, options['users'], options['batch_size'])
+            total, queries = options['users'], options['queries']
+            # Broad prefixes match many users; selective ones match a few
+            # and force icontains through a full scan; misses match nobody
+            term_sets = {
+                'broad': [
+                    rng.choice(FIRST_NAMES + LAST_NAMES)[:rng.randint(2, 5)]
+                    for _ in range(queries)
+                ],
+                'selective': [
+                    f'{rng.choice(FIRST_NAMES)}{rng.choice(LAST_NAMES)}{rng.randrange(total)}'
+                    for _ in range(queries)
+                ],
+                'miss': [f'zq{rng.randrange(10 ** 6)}' for _ in range(queries)],
+            }
+            fields = [UserSearchField.USERNAME, UserSearchField.NAME, UserSearchField.EMAIL]
+
+            def legacy(term):
+                return User.objects.filter(
+                    Q(email__icontains=term) | Q(username__icontains=term) |
+                    Q(first_name__icontains=term) | Q(last_name__icontains=term)
+                )
+
+            def indexed(term):
+                return filter_by_prefixes(User.objects.all(), [term], fields)
+
+            for kind, terms in term_sets.items():
+                for label, search in (('icontains', legacy), ('indexed', indexed)):
+                    samples = []
+                    for term in terms:
+                        start = time.perf_counter()
+                        list(search(term).order_by('username').values('id', 'username')[:10])
+                        samples.append((time.perf_counter() - start) * 1000)
+                    samples.sort()
+                    self.stdout.write(
+                        f'{kind:>9} {label:>9}: p50={statistics.median(samples):.2f}ms '
+                        f'p95={samples[int(len(samples) * 0.95) - 1]:.2f}ms '
+                        f'max={samples[-1]:.2f}ms'
+                    )
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    def _seed(self, rng, total, batch_size):
+        self.stdout.write(f'Seeding {total} users...')
+        for start in range(0, total, batch_size):
+            users = []
+            for i in range(start, min(start + batch_size, total)):
+                first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+                users.append(User(
+                    email=f'{first}.{last}{i}@{rng.choice(DOMAINS)}',
+                    username=f'{first}{last}{i}',
+                    first_name=first.title(),
+                    last_name=last.title(),
+                    position=rng.choice(POSITIONS),
+                    password='!',
+                ))
+            User.objects.bulk_create(users)
+            if any(user.pk is None for user in users):
+                ids = dict(
+                    User.objects.filter(email__in=[user.email for user in users])
+                    .values_list('email', 'id')
+                )
+                for user in users:
+                    user.pk = ids[user.email]
+            UserSearchToken.objects.bulk_create([
+                token for user in users for token in make_search_token_rows(user)
+            ])
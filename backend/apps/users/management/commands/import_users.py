@@ -0,0 +1,54 @@
+"""
+Bulk import users from a CSV or NDJSON file.
+Usage: python manage.py import_users users.csv [--workers 8] [--report errors.json]
+"""
+
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.users.bulk_import import (
+    DEFAULT_BATCH_SIZE,
+    IMPORT_FORMATS,
+    detect_format,
+    import_users,
+    read_rows,
+)
+
+
+class Command(BaseCommand):
+    help = 'Bulk import users from a CSV or NDJSON file.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Path to the CSV or NDJSON file')
+        parser.add_argument('--format', choices=IMPORT_FORMATS, help='Defaults to the file extension')
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument('--workers', type=int, help='Password hashing processes (0 = inline)')
+        parser.add_argument('--report', help='Write the full error report to this JSON file')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = options['format'] or detect_format(path)
+
+        try:
+            with open(path, encoding='utf-8-sig', newline='') as stream:
+                report = import_users(
+                    read_rows(stream, fmt),
+                    batch_size=options['batch_size'],
+                    workers=options['workers'],
+                )
+        except OSError as exc:
+            raise CommandError(f'Cannot read {path}: {exc}')
+
+        if options['report']:
+            with open(options['report'], 'w') as fh:
+                json.dump(report, fh, indent=2, default=str)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {report['created']} of {report['total']} users "
+            f"({report['failed']} failed)"
+        ))
+        for error in report['errors'][:20]:
+            self.stdout.write(f"  row {error['row']}: {json.dumps(error['errors'], default=str)}")
+        if report['failed'] > 20:
+            self.stdout.write(f"  ... {report['failed'] - 20} more errors")
@@ -0,0 +1,21 @@
+# Index for chunked pruning of expired JWTs (see apps.users.tasks)
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+        ('token_blacklist', '0012_alter_outstandingtoken_user'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=(
+                'CREATE INDEX IF NOT EXISTS users_outstandingtoken_expires_at_idx '
+                'ON token_blacklist_outstandingtoken (expires_at);'
+            ),
+            reverse_sql='DROP INDEX IF EXISTS users_outstandingtoken_expires_at_idx;',
+        ),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 5.0.1 on 2026-10-19 09:58
+
+import re
+import unicodedata
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+# Frozen copies of apps.users.search as of this migration, so later changes
+# to the live tokenizer don't change what this backfill does
+SEARCH_FIELD_MAP = {
+    'username': 'username',
+    'first_name': 'name',
+    'last_name': 'name',
+    'email': 'email',
+    'position': 'position',
+}
+
+
+def normalize_words(text):
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(char for char in text if not unicodedata.combining(char)).lower()
+    return [word[:100] for word in re.findall(r'[^\W_]+', text)]
+
+
+def backfill_search_tokens(apps, schema_editor):
+    User = apps.get_model('users', 'User')
+    UserSearchToken = apps.get_model('users', 'UserSearchToken')
+
+    rows = []
+    for user in User.objects.only(*SEARCH_FIELD_MAP).iterator(chunk_size=2000):
+        tokens = {
+            (field, word)
+            for attr, field in SEARCH_FIELD_MAP.items()
+            for word in normalize_words(getattr(user, attr))
+        }
+        rows.extend(UserSearchToken(user_id=user.pk, field=field, token=token) for field, token in tokens)
+        if len(rows) >= 5000:
+            UserSearchToken.objects.bulk_create(rows)
+            rows = []
+    UserSearchToken.objects.bulk_create(rows)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_outstandingtoken_expires_at_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserSearchToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('field', models.CharField(choices=[('username', 'Username'), ('name', 'Name'), ('email', 'Email'), ('position', 'Position')], max_length=20)),
+                ('token', models.CharField(max_length=100)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_tokens', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'User Search Token',
+                'verbose_name_plural': 'User Search Tokens',
+                'indexes': [models.Index(fields=['token', 'field'], name='users_users_token_4e2cc9_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_search_tokens, migrations.RunPython.noop),
+    ]
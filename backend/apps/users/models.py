@@ -3,8 +3,13 @@ User models for Project SPD.
 Custom user model with role-based access control.
 """
 
+import copy
+from datetime import timedelta
+
+from django.conf import settings
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin
 from django.db import models
+from django.db.models import Count, Q
 from django.utils import timezone
 from django.core.validators import RegexValidator
 
@@ -45,6 +50,18 @@ class UserManager(BaseUserManager):
             raise ValueError('Superuser must have is_superuser=True.')
         
         return self.create_user(email, username, password, **extra_fields)
+    
+    def with_blog_counts(self):
+        """
+        Return users annotated with published and total blog counts.
+        Lets list serializers read the counts without a query per row.
+        """
+        return self.get_queryset().annotate(
+            published_blog_count=Count(
+                'blogs', filter=Q(blogs__status='published'), distinct=True
+            ),
+            total_blog_count=Count('blogs', distinct=True),
+        )
 
 
 class User(AbstractBaseUser, PermissionsMixin):
@@ -128,6 +145,21 @@ class User(AbstractBaseUser, PermissionsMixin):
     def get_role_display_name(self):
         """Get human-readable role name."""
         return dict(UserRole.choices).get(self.role, 'Unknown')
+    
+    def update_last_login(self):
+        """
+        Record a login, writing at most once per LAST_LOGIN_UPDATE_INTERVAL.
+        Uses a queryset update so no post_save signals fire.
+        Returns True if the row was written.
+        """
+        now = timezone.now()
+        interval = timedelta(seconds=getattr(settings, 'LAST_LOGIN_UPDATE_INTERVAL', 0))
+        if self.last_login and now - self.last_login < interval:
+            return False
+        
+        self.last_login = now
+        User.objects.filter(pk=self.pk).update(last_login=now)
+        return True
 
 
 class UserProfile(models.Model):
@@ -165,5 +197,79 @@ class UserProfile(models.Model):
         verbose_name = 'User Profile'
         verbose_name_plural = 'User Profiles'
     
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._snapshot_fields()
+    
     def __str__(self):
         return f'Profile of {self.user.username}'
+    
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._snapshot_fields()
+    
+    def _tracked_values(self):
+        """Current values of loaded, editable fields (deferred fields are skipped)."""
+        return {
+            field.attname: self.__dict__[field.attname]
+            for field in self._meta.concrete_fields
+            if not field.primary_key
+            and field.name not in ('user', 'created_at', 'updated_at')
+            and field.attname in self.__dict__
+        }
+    
+    def _snapshot_fields(self):
+        self._loaded_values = copy.deepcopy(self._tracked_values())
+    
+    def get_dirty_fields(self):
+        """Return names of fields changed since load or last save."""
+        return [
+            name for name, value in self._tracked_values().items()
+            if self._loaded_values.get(name) != value
+        ]
+    
+    def save_if_changed(self):
+        """
+        Save only the fields that changed.
+        Returns True if a write was issued.
+        """
+        dirty_fields = self.get_dirty_fields()
+        if not dirty_fields:
+            return False
+        self.save(update_fields=dirty_fields + ['updated_at'])
+        return True
+
+
+class UserSearchField(models.TextChoices):
+    """User fields covered by the search index."""
+    USERNAME = 'username', 'Username'
+    NAME = 'name', 'Name'
+    EMAIL = 'email', 'Email'
+    POSITION = 'position', 'Position'
+
+
+class UserSearchToken(models.Model):
+    """
+    Prefix search index for users.
+    One row per normalized word of a searchable field, so searches are
+    indexed prefix lookups instead of icontains scans.
+    Maintained by apps.users.search.
+    """
+    
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='search_tokens'
+    )
+    field = models.CharField(max_length=20, choices=UserSearchField.choices)
+    token = models.CharField(max_length=100)
+    
+    class Meta:
+        verbose_name = 'User Search Token'
+        verbose_name_plural = 'User Search Tokens'
+        indexes = [
+            models.Index(fields=['token', 'field']),
+        ]
+    
+    def __str__(self):
+        return f'{self.field}:{self.token}'
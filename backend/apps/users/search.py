@@ -0,0 +1,106 @@
+"""
+Indexed user search.
+Searchable user fields are split into normalized words and stored in
+UserSearchToken, so a search term becomes an indexed prefix range lookup.
+"""
+
+import re
+import unicodedata
+
+from rest_framework.filters import SearchFilter
+
+from .models import UserSearchField, UserSearchToken
+
+
+# Maps User model fields to the search index field that covers them
+SEARCH_FIELD_MAP = {
+    'username': UserSearchField.USERNAME,
+    'first_name': UserSearchField.NAME,
+    'last_name': UserSearchField.NAME,
+    'email': UserSearchField.EMAIL,
+    'position': UserSearchField.POSITION,
+}
+
+SEARCHABLE_FIELDS = frozenset(SEARCH_FIELD_MAP)
+
+TOKEN_MAX_LENGTH = 100
+
+
+def normalize_words(text):
+    """Lowercase, strip accents, and split text into alphanumeric words."""
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(char for char in text if not unicodedata.combining(char)).lower()
+    return [word[:TOKEN_MAX_LENGTH] for word in re.findall(r'[^\W_]+', text)]
+
+
+def build_search_tokens(user):
+    """Return the set of (field, token) pairs indexed for a user."""
+    tokens = set()
+    for attr, field in SEARCH_FIELD_MAP.items():
+        for word in normalize_words(getattr(user, attr)):
+            tokens.add((field, word))
+    return tokens
+
+
+def make_search_token_rows(user, tokens=None):
+    """UserSearchToken instances for a saved user, ready for bulk_create."""
+    if tokens is None:
+        tokens = build_search_tokens(user)
+    return [UserSearchToken(user_id=user.pk, field=field, token=token) for field, token in tokens]
+
+
+def sync_search_tokens(user, created=False):
+    """Rewrite a user's search tokens if their searchable fields changed."""
+    tokens = build_search_tokens(user)
+    if not created:
+        existing = set(user.search_tokens.values_list('field', 'token'))
+        if existing == tokens:
+            return
+        user.search_tokens.all().delete()
+    UserSearchToken.objects.bulk_create(make_search_token_rows(user, tokens))
+
+
+def prefix_upper_bound(word):
+    """
+    Smallest string above every string starting with word: word with its
+    last character incremented. Unlike word + '\uffff', this bound does not
+    rely on the collation sorting '\uffff' after every character.
+    """
+    return word[:-1] + chr(ord(word[-1]) + 1)
+
+
+def filter_by_prefixes(queryset, words, fields):
+    """
+    Restrict a User queryset to users with, for every word, an indexed
+    token in `fields` starting with that word.
+    """
+    for word in words:
+        matching = UserSearchToken.objects.filter(
+            field__in=fields,
+            # The range lets a plain b-tree index serve the prefix match
+            token__gte=word,
+            token__lt=prefix_upper_bound(word),
+            token__startswith=word,
+        ).values('user_id')
+        queryset = queryset.filter(id__in=matching)
+    return queryset
+
+
+class UserSearchFilter(SearchFilter):
+    """
+    SearchFilter backed by the UserSearchToken prefix index.
+    Honours the view's `search_fields` and `search_param` (?search=);
+    matches words by prefix rather than substring.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        search_fields = self.get_search_fields(view, request) or []
+        fields = {SEARCH_FIELD_MAP[name] for name in search_fields if name in SEARCH_FIELD_MAP}
+        words = [
+            word
+            for term in self.get_search_terms(request)
+            for word in normalize_words(term)
+        ]
+        if not fields or not words:
+            return queryset
+        return filter_by_prefixes(queryset, words, fields)
@@ -6,11 +6,36 @@ Handles user registration, authentication, and profile management.
 from rest_framework import serializers
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from django.contrib.auth.password_validation import validate_password
+from django.contrib.auth.signals import user_logged_in
 from django.core.exceptions import ValidationError
+
+from apps.core.fieldsets import SparseFieldsMixin
 from .models import User, UserProfile, UserRole
 
 
-class UserProfileSerializer(serializers.ModelSerializer):
+def get_published_blog_count(user):
+    """
+    Published blog count for a user.
+    Uses the `with_blog_counts()` annotation when present, else queries.
+    """
+    count = getattr(user, 'published_blog_count', None)
+    if count is not None:
+        return count
+    return user.blogs.filter(status='published').count() if hasattr(user, 'blogs') else 0
+
+
+def get_total_blog_count(user):
+    """
+    Total blog count for a user.
+    Uses the `with_blog_counts()` annotation when present, else queries.
+    """
+    count = getattr(user, 'total_blog_count', None)
+    if count is not None:
+        return count
+    return user.blogs.count() if hasattr(user, 'blogs') else 0
+
+
+class UserProfileSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for UserProfile model."""
     
     class Meta:
@@ -110,22 +135,32 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
     def validate(self, attrs):
         data = super().validate(attrs)
         
+        # Records last_login, coalesced (UPDATE_LAST_LOGIN is off)
+        user_logged_in.send(sender=self.user.__class__, request=self.context.get('request'), user=self.user)
+        
         # Add user data to response
-        data['user'] = {
-            'id': self.user.id,
-            'email': self.user.email,
-            'username': self.user.username,
-            'full_name': self.user.full_name,
-            'role': self.user.role,
-            'avatar': self.user.avatar.url if self.user.avatar else None,
-        }
+        data['user'] = self.get_user_data(self.user)
         
         return data
+    
+    @staticmethod
+    def get_user_data(user):
+        """User data returned alongside the tokens."""
+        return {
+            'id': user.id,
+            'email': user.email,
+            'username': user.username,
+            'full_name': user.full_name,
+            'role': user.role,
+            'avatar': user.avatar.url if user.avatar else None,
+        }
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for User model - basic info."""
     
+    field_dependencies = {'full_name': ['first_name', 'last_name'], 'blog_count': []}
+    
     profile = UserProfileSerializer(read_only=True)
     full_name = serializers.CharField(read_only=True)
     blog_count = serializers.SerializerMethodField()
@@ -142,12 +177,20 @@ class UserSerializer(serializers.ModelSerializer):
     
     def get_blog_count(self, obj):
         """Get count of published blogs by user."""
-        return obj.blogs.filter(status='published').count() if hasattr(obj, 'blogs') else 0
+        return get_published_blog_count(obj)
 
 
-class UserPublicSerializer(serializers.ModelSerializer):
+class UserPublicSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for public user profile - limited info."""
     
+    field_dependencies = {
+        'full_name': ['first_name', 'last_name'],
+        'blog_count': [],
+        # Added by to_representation when the profile makes them public
+        'email': ['email', 'profile'],
+        'phone': ['phone', 'profile'],
+    }
+    
     full_name = serializers.CharField(read_only=True)
     profile = UserProfileSerializer(read_only=True)
     blog_count = serializers.SerializerMethodField()
@@ -161,16 +204,18 @@ class UserPublicSerializer(serializers.ModelSerializer):
     
     def get_blog_count(self, obj):
         """Get count of published blogs by user."""
-        return obj.blogs.filter(status='published').count() if hasattr(obj, 'blogs') else 0
+        return get_published_blog_count(obj)
     
     def to_representation(self, instance):
         """Conditionally include email and phone based on profile settings."""
         data = super().to_representation(instance)
+        wants_email = self.is_requested('email')
+        wants_phone = self.is_requested('phone')
         
-        if hasattr(instance, 'profile'):
-            if instance.profile.public_email:
+        if (wants_email or wants_phone) and hasattr(instance, 'profile'):
+            if wants_email and instance.profile.public_email:
                 data['email'] = instance.email
-            if instance.profile.public_phone:
+            if wants_phone and instance.profile.public_phone:
                 data['phone'] = instance.phone
         
         return data
@@ -201,7 +246,7 @@ class UserUpdateSerializer(serializers.ModelSerializer):
         if profile_data and hasattr(instance, 'profile'):
             for attr, value in profile_data.items():
                 setattr(instance.profile, attr, value)
-            instance.profile.save()
+            instance.profile.save_if_changed()
         
         return instance
 
@@ -226,7 +271,7 @@ class AdminUserSerializer(serializers.ModelSerializer):
     
     def get_blog_count(self, obj):
         """Get count of all blogs by user."""
-        return obj.blogs.count() if hasattr(obj, 'blogs') else 0
+        return get_total_blog_count(obj)
 
 
 class AdminUserCreateSerializer(serializers.ModelSerializer):
@@ -1,11 +1,17 @@
 """
 Signals for User app.
-Auto-create user profile on user creation.
+Auto-create user profile on user creation, keep the search index and
+JWT blacklist filter in sync, and record logins.
 """
 
+from django.contrib.auth.signals import user_logged_in
+from django.db import transaction
 from django.db.models.signals import post_save
 from django.dispatch import receiver
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
 from .models import User, UserProfile
+from .search import SEARCHABLE_FIELDS, sync_search_tokens
+from .token_blacklist import remember_blacklisted
 
 
 @receiver(post_save, sender=User)
@@ -16,7 +22,41 @@ def create_user_profile(sender, instance, created, **kwargs):
 
 
 @receiver(post_save, sender=User)
-def save_user_profile(sender, instance, **kwargs):
-    """Save UserProfile when User is saved."""
-    if hasattr(instance, 'profile'):
-        instance.profile.save()
+def save_user_profile(sender, instance, created, **kwargs):
+    """
+    Persist pending UserProfile changes when User is saved.
+    Skips the write when the profile was never loaded or has no changes,
+    so saves like last_login or role updates cost no extra queries.
+    """
+    if created:
+        return
+    
+    profile = User.profile.related.get_cached_value(instance, default=None)
+    if profile is not None:
+        profile.save_if_changed()
+
+
+@receiver(post_save, sender=User)
+def update_user_search_tokens(sender, instance, created, update_fields=None, **kwargs):
+    """Refresh the search index when searchable fields may have changed."""
+    if update_fields is not None and not SEARCHABLE_FIELDS.intersection(update_fields):
+        return
+    sync_search_tokens(instance, created=created)
+
+
+@receiver(post_save, sender=BlacklistedToken)
+def announce_blacklisted_token(sender, instance, created, **kwargs):
+    """Make a new blacklist entry visible to every process's filter."""
+    if created:
+        jti = instance.token.jti
+        transaction.on_commit(lambda: remember_blacklisted(jti))
+
+
+# Django's receiver saves last_login on every login; use the coalesced update
+# instead, for session logins and both JWT login paths alike
+user_logged_in.disconnect(dispatch_uid='update_last_login')
+
+
+@receiver(user_logged_in)
+def record_last_login(sender, user, **kwargs):
+    user.update_last_login()
@@ -0,0 +1,59 @@
+"""
+Celery tasks for User app.
+Periodic maintenance of authentication data and bulk user imports.
+"""
+
+from celery import shared_task
+from django.utils import timezone
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def prune_expired_tokens(batch_size=5000):
+    """
+    Delete expired outstanding and blacklisted JWTs in chunks.
+    Keeps each delete short so refreshes are not blocked by long locks.
+    """
+    try:
+        from rest_framework_simplejwt.token_blacklist.models import (
+            BlacklistedToken,
+            OutstandingToken,
+        )
+        
+        now = timezone.now()
+        deleted_count = 0
+        
+        while True:
+            ids = list(
+                OutstandingToken.objects.filter(
+                    expires_at__lte=now
+                ).values_list('id', flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            
+            BlacklistedToken.objects.filter(token_id__in=ids).delete()
+            deleted, _ = OutstandingToken.objects.filter(id__in=ids).delete()
+            deleted_count += deleted
+        
+        logger.info(f'Pruned {deleted_count} expired tokens')
+        return deleted_count
+        
+    except Exception as exc:
+        logger.error(f'Error pruning expired tokens: {exc}')
+        raise
+
+
+@shared_task
+def import_users_file(path, fmt):
+    """
+    Import users from a file uploaded to default_storage (then deleted).
+    Returns the import report.
+    """
+    from .bulk_import import import_users_upload
+    
+    report = import_users_upload(path, fmt)
+    logger.info(f"Imported {report['created']} of {report['total']} users ({report['failed']} failed)")
+    return report
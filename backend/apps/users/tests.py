@@ -0,0 +1,123 @@
+"""
+Tests for the user API.
+Each list must cost the same number of queries whatever the number of
+users, so a per-row query (an N+1) fails here before it reaches
+production.
+"""
+
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from .models import User, UserRole
+from .tasks import import_users_file
+
+SMALL = 3
+LARGE = SMALL * 10
+
+
+class ListQueryCountTests(APITestCase):
+    """GET each list endpoint with SMALL and LARGE users in the table."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser('admin@example.com', 'admin')
+
+    def create_users(self, count):
+        for index in range(count):
+            User.objects.create_user(
+                f'user{index}@example.com',
+                f'user{index}',
+                first_name=f'User{index}',
+                position='Engineer',
+                role=UserRole.STAFF,
+            )
+
+    def assert_constant_queries(self, url, queries):
+        """url costs queries with SMALL users and again with LARGE users."""
+        rows = []
+        for count in (SMALL, LARGE):
+            User.objects.filter(username__startswith='user').delete()
+            self.create_users(count)
+            with self.assertNumQueries(queries):
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            rows.append(len(response.data['results']))
+        # Otherwise the page size hid the extra users
+        self.assertLess(rows[0], rows[1])
+
+    def test_public_profile_list(self):
+        # COUNT, then the page of users with their profiles and blog counts
+        self.assert_constant_queries(reverse('public-profiles-list'), 2)
+
+    def test_admin_user_list(self):
+        self.client.force_authenticate(self.admin)
+        self.assert_constant_queries(reverse('admin-users-list'), 2)
+
+
+class SearchTests(APITestCase):
+    """?search= matches words by prefix through the token index."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser('admin@example.com', 'admin')
+        for username, first_name in (('zoe', 'Zoë'), ('zed', 'Zed'), ('ann', 'Ann')):
+            User.objects.create_user(f'{username}@example.com', username, first_name=first_name)
+
+    def search(self, term):
+        self.client.force_authenticate(self.admin)
+        response = self.client.get(reverse('admin-users-list'), {'search': term})
+        return sorted(user['username'] for user in response.data['results'])
+
+    def test_prefix_match(self):
+        self.assertEqual(self.search('z'), ['zed', 'zoe'])
+        self.assertEqual(self.search('ZO'), ['zoe'])
+        self.assertEqual(self.search('zoë'), ['zoe'])
+        self.assertEqual(self.search('zz'), [])
+
+
+class BulkImportTests(APITestCase):
+    """POST a CSV to the admin import endpoint."""
+
+    CSV = b'email,username,first_name\nnew@example.com,newuser,New\nbad,x,\n'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser('admin@example.com', 'admin')
+
+    def setUp(self):
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        media_settings = override_settings(MEDIA_ROOT=media_root.name)
+        media_settings.enable()
+        self.addCleanup(media_settings.disable)
+        self.media_root = media_root.name
+        self.client.force_authenticate(self.admin)
+
+    def post_csv(self):
+        upload = SimpleUploadedFile('users.csv', self.CSV, content_type='text/csv')
+        return self.client.post(reverse('admin-users-import'), {'file': upload}, format='multipart')
+
+    def test_queued(self):
+        # Run the task eagerly where a broker would queue it
+        with mock.patch.object(import_users_file, 'delay', side_effect=lambda *args: import_users_file.apply(args)):
+            response = self.post_csv()
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data['status'], 'SUCCESS')
+        self.assertTrue(User.objects.filter(username='newuser').exists())
+        self.assert_upload_deleted()
+
+    def test_without_broker(self):
+        with mock.patch.object(import_users_file, 'delay', side_effect=OSError('no broker')):
+            response = self.post_csv()
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual((response.data['created'], response.data['failed']), (1, 1))
+        self.assert_upload_deleted()
+
+    def assert_upload_deleted(self):
+        self.assertEqual(list(Path(self.media_root).rglob('*.csv')), [])
@@ -0,0 +1,129 @@
+"""
+Sliding-window rate limiting for the REST API.
+Each client key holds two integer counters (current and previous window)
+updated with atomic cache increments, instead of a timestamp list. A
+request is counted before it is checked, so bursts cannot all pass on
+the same stale count.
+"""
+
+import math
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class SlidingWindowRateThrottle(SimpleRateThrottle):
+    """
+    Approximate sliding-window counter.
+    The previous window's count is weighted by how much of it still
+    overlaps the sliding window. Counters live in THROTTLE_CACHE, which
+    should be a shared cache (Redis) for limits to hold across workers.
+    """
+    cache_format = 'throttle:%(scope)s:%(ident)s'
+
+    @property
+    def cache(self):
+        return caches[getattr(settings, 'THROTTLE_CACHE', 'default')]
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        window = int(self.now // self.duration)
+        current_key = f'{self.key}:{window}'
+        previous_key = f'{self.key}:{window - 1}'
+
+        # Count this request first, so concurrent requests each see the
+        # others' increments; two windows of TTL keep the previous bucket readable
+        self.cache.add(current_key, 0, self.duration * 2)
+        try:
+            self.current = self.cache.incr(current_key)
+        except ValueError:
+            # Expired between add and incr
+            self.cache.set(current_key, 1, self.duration * 2)
+            self.current = 1
+        self.previous = self.cache.get(previous_key, 0)
+        self.elapsed = self.now - window * self.duration
+
+        weight = 1 - self.elapsed / self.duration
+        if self.previous * weight + self.current > self.num_requests:
+            # Rejected requests do not count against the client
+            try:
+                self.cache.decr(current_key)
+            except ValueError:
+                pass
+            self.current -= 1
+            return self.throttle_failure()
+        return True
+
+    def wait(self):
+        """Seconds until the weighted count drops below the limit."""
+        remaining = self.duration - self.elapsed
+        if self.current >= self.num_requests:
+            # Wait for the next window, then for this one to decay
+            wait = remaining + self.duration * (1 - self.num_requests / self.current)
+        else:
+            wait = (
+                self.duration * (1 - (self.num_requests - self.current) / self.previous)
+                - self.elapsed
+            )
+        return max(1, math.ceil(wait))
+
+
+class AnonSlidingWindowThrottle(SlidingWindowRateThrottle):
+    """Limits anonymous clients by IP address."""
+    scope = 'anon'
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            return None
+        return self.cache_format % {
+            'scope': self.scope,
+            'ident': self.get_ident(request),
+        }
+
+
+class UserSlidingWindowThrottle(SlidingWindowRateThrottle):
+    """Limits authenticated users by id, anonymous clients by IP address."""
+    scope = 'user'
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            ident = request.user.pk
+        else:
+            ident = self.get_ident(request)
+        return self.cache_format % {'scope': self.scope, 'ident': ident}
+
+
+class ScopedSlidingWindowThrottle(SlidingWindowRateThrottle):
+    """
+    Per-endpoint limits, applied to views that set `throttle_scope`.
+    Views without a scope are not throttled by this class.
+    """
+    scope_attr = 'throttle_scope'
+
+    def __init__(self):
+        # Rate is determined per view in allow_request
+        pass
+
+    def allow_request(self, request, view):
+        self.scope = getattr(view, self.scope_attr, None)
+        if not self.scope:
+            return True
+
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        return super().allow_request(request, view)
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            ident = request.user.pk
+        else:
+            ident = self.get_ident(request)
+        return self.cache_format % {'scope': self.scope, 'ident': ident}
@@ -0,0 +1,168 @@
+"""
+Fast JWT blacklist membership checks.
+A per-process Bloom filter of blacklisted token ids answers the common
+"not blacklisted" case without a database query. Possible hits are
+confirmed against the database.
+
+Entries created since a process last synced its filter are announced
+through short-lived keys in the shared cache. Enable JWT_BLACKLIST_FILTER
+only when CACHES points at a shared cache (Redis); with a per-process
+cache other workers would never see those keys.
+"""
+
+import hashlib
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Max
+from django.utils import timezone
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings."""
+
+    def __init__(self, capacity, error_rate=0.001):
+        self.capacity = capacity
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, value):
+        digest = hashlib.blake2b(value.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.num_bits for i in range(self.num_hashes))
+
+    def add(self, value):
+        for position in self._positions(value):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, value):
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(value)
+        )
+
+
+class BlacklistFilter:
+    """
+    Process-local Bloom filter kept in sync with BlacklistedToken.
+    New rows are pulled every JWT_BLACKLIST_SYNC_INTERVAL seconds and the
+    filter is rebuilt every JWT_BLACKLIST_REBUILD_INTERVAL seconds, which
+    also picks up rows that committed out of id order, or early once new
+    rows have used up the headroom it was sized with.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._bloom = None
+        self._max_id = 0
+        self._built_at = 0
+        self._synced_at = 0
+
+    def _rebuild(self):
+        """
+        Load all unexpired blacklisted jtis into a fresh filter, sized for
+        twice the current rows so it has room to grow until the next rebuild.
+        """
+        max_id = BlacklistedToken.objects.aggregate(max_id=Max('id'))['max_id'] or 0
+        jtis = BlacklistedToken.objects.filter(
+            id__lte=max_id,
+            token__expires_at__gt=timezone.now(),
+        ).values_list('token__jti', flat=True)
+        capacity = max(getattr(settings, 'JWT_BLACKLIST_FILTER_CAPACITY', 1_000_000), 2 * jtis.count())
+        bloom = BloomFilter(capacity)
+        for jti in jtis.iterator(chunk_size=10000):
+            bloom.add(jti)
+
+        # Swap in only when complete so readers never see a partial filter
+        self._bloom, self._max_id = bloom, max_id
+
+    def _load_new(self):
+        """Load entries blacklisted since the last sync."""
+        rows = BlacklistedToken.objects.filter(
+            id__gt=self._max_id
+        ).values_list('id', 'token__jti').order_by('id')
+        for row_id, jti in rows.iterator(chunk_size=10000):
+            self._bloom.add(jti)
+            self._max_id = row_id
+
+    def sync(self):
+        """Pull new blacklist rows when the sync interval has passed."""
+        now = time.monotonic()
+        sync_interval = getattr(settings, 'JWT_BLACKLIST_SYNC_INTERVAL', 30)
+        rebuild_interval = getattr(settings, 'JWT_BLACKLIST_REBUILD_INTERVAL', 600)
+        if self._bloom is not None and now - self._synced_at < sync_interval:
+            return
+
+        with self._lock:
+            if self._bloom is not None and now - self._synced_at < sync_interval:
+                return
+            if (
+                self._bloom is None
+                or now - self._built_at >= rebuild_interval
+                or self._bloom.count > self._bloom.capacity
+            ):
+                self._rebuild()
+                self._built_at = now
+            else:
+                self._load_new()
+            self._synced_at = now
+
+    def might_contain(self, jti):
+        """False means the token is definitely not blacklisted."""
+        self.sync()
+        if jti in self._bloom:
+            return True
+        # Rows newer than the last sync are announced through the cache
+        return bool(cache.get(recent_cache_key(jti)))
+
+    def reset(self):
+        with self._lock:
+            self._bloom = None
+
+
+blacklist_filter = BlacklistFilter()
+
+
+def filter_enabled():
+    return getattr(settings, 'JWT_BLACKLIST_FILTER', False)
+
+
+def recent_cache_key(jti):
+    return f'jwt:blacklisted:{jti}'
+
+
+def remember_blacklisted(jti):
+    """
+    Announce a new blacklist entry to every process until their filters
+    have rebuilt past it.
+    """
+    ttl = 2 * getattr(settings, 'JWT_BLACKLIST_REBUILD_INTERVAL', 600)
+    cache.set(recent_cache_key(jti), True, ttl)
+
+
+class FilteredRefreshToken(RefreshToken):
+    """Refresh token whose blacklist check consults the Bloom filter first."""
+
+    def check_blacklist(self):
+        if filter_enabled():
+            jti = self.payload[api_settings.JTI_CLAIM]
+            if not blacklist_filter.might_contain(jti):
+                return
+        super().check_blacklist()
+
+
+class FilteredTokenRefreshSerializer(TokenRefreshSerializer):
+    """Token refresh serializer using FilteredRefreshToken."""
+    token_class = FilteredRefreshToken
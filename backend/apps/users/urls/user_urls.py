@@ -8,12 +8,14 @@ from ..views import (
     ChangePasswordView,
     PublicProfileView,
     PublicProfileListView,
+    UserAutocompleteView,
     StaffProfileView,
     AdminUserListView,
     AdminUserDetailView,
     AdminUserRoleUpdateView,
     AdminUserStatsView,
 )
+from ..bulk_import import AdminUserBulkImportStatusView, AdminUserBulkImportView
 
 urlpatterns = [
     # Current user endpoints
@@ -23,12 +25,15 @@ urlpatterns = [
     # Public profile endpoints
     path('profiles/', PublicProfileListView.as_view(), name='public-profiles-list'),
     path('profile/', PublicProfileView.as_view(), name='public-profile-detail'),
+    path('autocomplete/', UserAutocompleteView.as_view(), name='user-autocomplete'),
     
     # Staff endpoints
     path('staff/profile/', StaffProfileView.as_view(), name='staff-profile'),
     
     # Admin user management endpoints
     path('admin/users/', AdminUserListView.as_view(), name='admin-users-list'),
+    path('admin/users/import/', AdminUserBulkImportView.as_view(), name='admin-users-import'),
+    path('admin/users/import/<str:task_id>/', AdminUserBulkImportStatusView.as_view(), name='admin-users-import-status'),
     path('admin/users/<int:pk>/', AdminUserDetailView.as_view(), name='admin-user-detail'),
     path('admin/users/<int:pk>/role/', AdminUserRoleUpdateView.as_view(), name='admin-user-role'),
     path('admin/stats/', AdminUserStatsView.as_view(), name='admin-user-stats'),
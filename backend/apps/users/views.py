@@ -11,7 +11,9 @@ from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import get_user_model
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework.filters import SearchFilter, OrderingFilter
+from rest_framework.filters import OrderingFilter
+
+from apps.core.fieldsets import sparse_queryset
 
 from .serializers import (
     UserRegistrationSerializer,
@@ -24,7 +26,9 @@ from .serializers import (
     ChangePasswordSerializer,
 )
 from .permissions import IsAdmin, IsStaffOrAdmin, IsSelfOrAdmin, PublicReadOnly
-from .models import UserRole
+from .models import UserRole, UserSearchField
+from .search import UserSearchFilter, filter_by_prefixes, normalize_words
+from .token_blacklist import FilteredRefreshToken, FilteredTokenRefreshSerializer
 
 User = get_user_model()
 
@@ -41,6 +45,7 @@ class RegisterView(generics.CreateAPIView):
     queryset = User.objects.all()
     permission_classes = [AllowAny]
     serializer_class = UserRegistrationSerializer
+    throttle_scope = 'register'
     
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -67,6 +72,7 @@ class LoginView(TokenObtainPairView):
     """
     permission_classes = [AllowAny]
     serializer_class = CustomTokenObtainPairSerializer
+    throttle_scope = 'login'
 
 
 class RefreshTokenView(TokenRefreshView):
@@ -75,6 +81,7 @@ class RefreshTokenView(TokenRefreshView):
     POST /api/auth/refresh/
     """
     permission_classes = [AllowAny]
+    serializer_class = FilteredTokenRefreshSerializer
 
 
 class LogoutView(views.APIView):
@@ -94,7 +101,7 @@ class LogoutView(views.APIView):
                     status=status.HTTP_400_BAD_REQUEST
                 )
             
-            token = RefreshToken(refresh_token)
+            token = FilteredRefreshToken(refresh_token)
             token.blacklist()
             
             return Response(
@@ -170,8 +177,9 @@ class PublicProfileView(generics.RetrieveAPIView):
             from rest_framework.exceptions import ValidationError
             raise ValidationError({'username': 'Username parameter is required'})
         
+        queryset = User.objects.with_blog_counts().select_related('profile')
         try:
-            return User.objects.get(
+            return sparse_queryset(queryset, self.get_serializer()).get(
                 username=username.lower(),
                 is_active=True,
                 role__in=[UserRole.STAFF, UserRole.ADMIN]
@@ -188,16 +196,58 @@ class PublicProfileListView(generics.ListAPIView):
     """
     permission_classes = [AllowAny]
     serializer_class = UserPublicSerializer
-    filter_backends = [SearchFilter, OrderingFilter]
+    filter_backends = [UserSearchFilter, OrderingFilter]
     search_fields = ['username', 'first_name', 'last_name', 'position']
     ordering_fields = ['username', 'date_joined', 'first_name']
     ordering = ['first_name']
     
     def get_queryset(self):
-        return User.objects.filter(
+        serializer = self.get_serializer()
+        # The counts cost a join and GROUP BY; skip them when ?fields= leaves them out
+        queryset = User.objects.with_blog_counts() if serializer.is_requested('blog_count') else User.objects.all()
+        queryset = queryset.filter(
             is_active=True,
             role__in=[UserRole.STAFF, UserRole.ADMIN]
         ).select_related('profile')
+        return sparse_queryset(queryset, serializer)
+
+
+class UserAutocompleteView(views.APIView):
+    """
+    Lightweight user autocomplete by name, username or position prefix.
+    Admins search all users (and emails); others see public profiles only.
+    GET /api/users/autocomplete/?q=<prefix>
+    """
+    permission_classes = [AllowAny]
+    max_results = 10
+    
+    def get(self, request):
+        words = normalize_words(request.query_params.get('q', ''))
+        if not words:
+            return Response([])
+        
+        fields = [UserSearchField.USERNAME, UserSearchField.NAME, UserSearchField.POSITION]
+        if request.user.is_authenticated and request.user.role == UserRole.ADMIN:
+            queryset = User.objects.all()
+            fields.append(UserSearchField.EMAIL)
+        else:
+            queryset = User.objects.filter(
+                is_active=True,
+                role__in=[UserRole.STAFF, UserRole.ADMIN]
+            )
+        
+        rows = filter_by_prefixes(queryset, words, fields).order_by('username').values(
+            'id', 'username', 'first_name', 'last_name'
+        )[:self.max_results]
+        
+        return Response([
+            {
+                'id': row['id'],
+                'username': row['username'],
+                'full_name': f"{row['first_name']} {row['last_name']}".strip() or row['username'],
+            }
+            for row in rows
+        ])
 
 
 # ============================================================
@@ -232,7 +282,7 @@ class AdminUserListView(generics.ListCreateAPIView):
     POST /api/users/admin/users/
     """
     permission_classes = [IsAuthenticated, IsAdmin]
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, UserSearchFilter, OrderingFilter]
     filterset_fields = ['role', 'is_active', 'is_verified']
     search_fields = ['email', 'username', 'first_name', 'last_name']
     ordering_fields = ['date_joined', 'email', 'username', 'role']
@@ -244,7 +294,7 @@ class AdminUserListView(generics.ListCreateAPIView):
         return AdminUserSerializer
     
     def get_queryset(self):
-        return User.objects.all().select_related('profile')
+        return User.objects.with_blog_counts().select_related('profile')
 
 
 class AdminUserDetailView(generics.RetrieveUpdateDestroyAPIView):
@@ -256,7 +306,7 @@ class AdminUserDetailView(generics.RetrieveUpdateDestroyAPIView):
     """
     permission_classes = [IsAuthenticated, IsAdmin]
     serializer_class = AdminUserSerializer
-    queryset = User.objects.all().select_related('profile')
+    queryset = User.objects.with_blog_counts().select_related('profile')
     
     def destroy(self, request, *args, **kwargs):
         instance = self.get_object()
@@ -284,7 +334,7 @@ class AdminUserRoleUpdateView(views.APIView):
     
     def patch(self, request, pk):
         try:
-            user = User.objects.get(pk=pk)
+            user = User.objects.select_related('profile').get(pk=pk)
         except User.DoesNotExist:
             return Response(
                 {'error': 'User not found'},
@@ -1,10 +1,24 @@
 """
 ASGI config for Project SPD.
+Requests are routed through ASGI_URLCONF, which adds async fast paths
+(such as login) in front of the regular URL configuration.
 """
 
 import os
-from django.core.asgi import get_asgi_application
+import django
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
-application = get_asgi_application()
+
+class ProjectASGIHandler(ASGIHandler):
+    """ASGI handler that resolves requests against ASGI_URLCONF."""
+    
+    async def get_response_async(self, request):
+        request.urlconf = settings.ASGI_URLCONF
+        return await super().get_response_async(request)
+
+
+django.setup(set_prefix=False)
+application = ProjectASGIHandler()
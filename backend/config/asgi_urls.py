@@ -0,0 +1,13 @@
+"""
+URL configuration for the ASGI application.
+Serves async fast paths first and falls through to config.urls.
+"""
+
+from django.urls import path, include
+
+from apps.users.async_auth import async_login
+
+urlpatterns = [
+    path('api/auth/login/', async_login, name='auth-login-async'),
+    path('', include('config.urls')),
+]
@@ -30,6 +30,11 @@ app.conf.beat_schedule = {
         'task': 'apps.analytics.tasks.cleanup_old_analytics',
         'schedule': crontab(hour=1, minute=0, day_of_week='sunday'),  # Weekly cleanup
     },
+    # Prune expired JWT outstanding/blacklisted tokens
+    'prune-expired-tokens': {
+        'task': 'apps.users.tasks.prune_expired_tokens',
+        'schedule': crontab(hour=2, minute=0),  # Run at 02:00 daily
+    },
     # Send weekly engagement report to admins
     'send-weekly-report': {
         'task': 'apps.analytics.tasks.send_weekly_engagement_report',
@@ -0,0 +1,94 @@
+"""
+Database configuration for Project SPD.
+Builds DATABASES from environment variables: SQLite or PostgreSQL,
+persistent connections with health checks, optional connection pooling,
+and read replicas.
+
+Pooling (DB_POOL) is one of:
+- '' (default): Django's persistent connections only, kept for
+  DB_CONN_MAX_AGE seconds and checked before reuse.
+- 'pgbouncer': connections go through PgBouncer in transaction mode, so
+  server-side cursors are disabled (they do not survive a transaction).
+- 'psycopg': a client-side psycopg 3 pool per process. Needs Django 5.1+
+  and psycopg[pool]; persistent connections are then left to the pool.
+"""
+
+import django
+from decouple import config, Csv
+from django.core.exceptions import ImproperlyConfigured
+
+POOL_MODES = ('', 'pgbouncer', 'psycopg')
+
+
+def _sqlite(base_dir):
+    return {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': config('SQLITE_PATH', default=str(base_dir / 'db.sqlite3')),
+    }
+
+
+def _postgres():
+    return {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': config('DB_NAME', default='project_spd'),
+        'USER': config('DB_USER', default='postgres'),
+        'PASSWORD': config('DB_PASSWORD', default='postgres'),
+        'HOST': config('DB_HOST', default='localhost'),
+        'PORT': config('DB_PORT', default='5432'),
+        'OPTIONS': {
+            'connect_timeout': config('DB_CONNECT_TIMEOUT', default=5, cast=int),
+        },
+    }
+
+
+def _apply_pooling(database, pool_mode):
+    if pool_mode == 'pgbouncer':
+        database['DISABLE_SERVER_SIDE_CURSORS'] = True
+    elif pool_mode == 'psycopg':
+        if django.VERSION < (5, 1):
+            raise ImproperlyConfigured('DB_POOL=psycopg needs Django 5.1 or later.')
+        # The pool owns connection lifetime; Django rejects persistent connections with it
+        database['CONN_MAX_AGE'] = 0
+        database['OPTIONS']['pool'] = {
+            'min_size': config('DB_POOL_MIN_SIZE', default=2, cast=int),
+            'max_size': config('DB_POOL_MAX_SIZE', default=10, cast=int),
+            'timeout': config('DB_POOL_TIMEOUT', default=10, cast=int),
+        }
+
+
+def _replica(primary, location, use_sqlite):
+    if use_sqlite:
+        location_settings = {'NAME': location}
+    else:
+        host, _, port = location.partition(':')
+        location_settings = {'HOST': host, 'PORT': port or primary['PORT']}
+    return {
+        **primary,
+        **location_settings,
+        'OPTIONS': dict(primary.get('OPTIONS', {})),
+        # Tests run against the primary's test database
+        'TEST': {'MIRROR': 'default'},
+    }
+
+
+def build_databases(base_dir):
+    """DATABASES for settings, including replicaN aliases for DB_REPLICAS."""
+    use_sqlite = config('USE_SQLITE', default=True, cast=bool)
+    pool_mode = config('DB_POOL', default='')
+    if pool_mode not in POOL_MODES:
+        raise ImproperlyConfigured(f'DB_POOL must be one of {POOL_MODES}, not {pool_mode!r}.')
+    if pool_mode and use_sqlite:
+        raise ImproperlyConfigured('DB_POOL applies to PostgreSQL only.')
+
+    primary = _sqlite(base_dir) if use_sqlite else _postgres()
+    # Reuse connections across requests instead of reconnecting (TLS and
+    # auth on Postgres) every time; health checks drop dead ones first
+    primary['CONN_MAX_AGE'] = config('DB_CONN_MAX_AGE', default=60, cast=int)
+    primary['CONN_HEALTH_CHECKS'] = config('DB_CONN_HEALTH_CHECKS', default=True, cast=bool)
+    _apply_pooling(primary, pool_mode)
+
+    databases = {'default': primary}
+    replicas = config('DB_REPLICAS', default='', cast=Csv())
+    for index, location in enumerate(replicas, start=1):
+        databases[f'replica{index}'] = _replica(primary, location, use_sqlite)
+    return databases
@@ -8,6 +8,8 @@ from pathlib import Path
 from datetime import timedelta
 from decouple import config, Csv
 
+from config.database import build_databases
+
 # Build paths inside the project
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -34,14 +36,19 @@ INSTALLED_APPS = [
     'drf_yasg',
     
     # Local apps
+    'apps.core',
     'apps.users',
     'apps.blogs',
     'apps.analytics',
 ]
 
 MIDDLEWARE = [
+    'apps.core.middleware.RequestMetricsMiddleware',
+    'apps.core.profiling.ProfilingMiddleware',
+    'apps.core.db_router.ReplicaRoutingMiddleware',
+    'apps.core.compression.CompressionMiddleware',
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'apps.core.staticfiles.AsyncWhiteNoiseMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -70,49 +77,104 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'config.wsgi.application'
+ASGI_URLCONF = 'config.asgi_urls'
 
-# Database Configuration
+# Database Configuration (see config/database.py for the DB_* variables)
 USE_SQLITE = config('USE_SQLITE', default=True, cast=bool)
+DATABASES = build_databases(BASE_DIR)
 
-if USE_SQLITE:
-    DATABASES = {
-        'default': {
-            'ENGINE': 'django.db.backends.sqlite3',
-            'NAME': BASE_DIR / 'db.sqlite3',
-        }
-    }
-else:
-    DATABASES = {
-        'default': {
-            'ENGINE': 'django.db.backends.postgresql',
-            'NAME': config('DB_NAME', default='project_spd'),
-            'USER': config('DB_USER', default='postgres'),
-            'PASSWORD': config('DB_PASSWORD', default='postgres'),
-            'HOST': config('DB_HOST', default='localhost'),
-            'PORT': config('DB_PORT', default='5432'),
-        }
-    }
+# Read replicas (DB_REPLICAS): safe-method requests read from them; clients
+# that just wrote stay on the primary for DB_REPLICA_STICKY_SECONDS.
+DB_REPLICA_STICKY_SECONDS = config('DB_REPLICA_STICKY_SECONDS', default=10, cast=int)
+DATABASE_ROUTERS = ['apps.core.db_router.PrimaryReplicaRouter']
+
+# SQLite tuning (ignored on PostgreSQL): WAL and friends on every
+# connection, and optionally a per-process serialized writer for view
+# counters and analytics rows
+SQLITE_PRAGMAS = config('SQLITE_PRAGMAS', default=True, cast=bool)
+SQLITE_BUSY_TIMEOUT_MS = config('SQLITE_BUSY_TIMEOUT_MS', default=5000, cast=int)
+SQLITE_MMAP_SIZE = config('SQLITE_MMAP_SIZE', default=256 * 1024 * 1024, cast=int)
+SQLITE_CACHE_SIZE_KB = config('SQLITE_CACHE_SIZE_KB', default=64 * 1024, cast=int)
+SQLITE_SERIALIZED_WRITES = config('SQLITE_SERIALIZED_WRITES', default=False, cast=bool)
 
 # Redis Cache Configuration
 USE_LOCAL_CACHE = config('USE_LOCAL_CACHE', default=True, cast=bool)
 
+# Hot read endpoints: a short-lived per-process LRU in front of 'default',
+# with versioned namespaces for invalidation and stampede protection
+TIERED_CACHE = {
+    'BACKEND': 'apps.core.cache.TwoTierCache',
+    'LOCATION': 'tiered',
+    'TIMEOUT': config('TIERED_CACHE_TIMEOUT', default=300, cast=int),
+    'OPTIONS': {
+        'SHARED': 'default',
+        'LOCAL_TIMEOUT': config('TIERED_CACHE_LOCAL_TIMEOUT', default=5, cast=int),
+        'LOCAL_MAX_ENTRIES': config('TIERED_CACHE_LOCAL_MAX_ENTRIES', default=1024, cast=int),
+        'NAMESPACE_TIMEOUT': 1,
+    },
+}
+
 if USE_LOCAL_CACHE:
     CACHES = {
         'default': {
-            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-        }
+            'BACKEND': 'apps.core.cache.InstrumentedLocMemCache',
+        },
+        'tiered': TIERED_CACHE,
     }
 else:
     CACHES = {
         'default': {
-            'BACKEND': 'django_redis.cache.RedisCache',
+            'BACKEND': 'apps.core.cache.InstrumentedRedisCache',
             'LOCATION': config('REDIS_URL', default='redis://localhost:6379/0'),
             'OPTIONS': {
                 'CLIENT_CLASS': 'django_redis.client.DefaultClient',
             }
-        }
+        },
+        'tiered': TIERED_CACHE,
     }
 
+# Request coalescing: concurrent cold builds of a blog document share one build.
+# The lock lives in a shared cache so it also spans worker processes
+COALESCE_CACHE = 'default'
+COALESCE_LOCK_TIMEOUT = config('COALESCE_LOCK_TIMEOUT', default=10, cast=int)
+COALESCE_WAIT = config('COALESCE_WAIT', default=5, cast=float)
+
+# HTTP caching of public blog endpoints: browsers revalidate (ETag /
+# Last-Modified, 304s); shared caches may keep responses for S_MAXAGE
+PUBLIC_CACHE_MAX_AGE = config('PUBLIC_CACHE_MAX_AGE', default=0, cast=int)
+PUBLIC_CACHE_S_MAXAGE = config('PUBLIC_CACHE_S_MAXAGE', default=60, cast=int)
+
+# Response compression of JSON. Bodies of cached public responses are
+# compressed once (brotli when installed, else gzip) and kept in
+# COMPRESSION_CACHE; others are gzipped with random padding against BREACH
+COMPRESSION_MIN_SIZE = config('COMPRESSION_MIN_SIZE', default=1024, cast=int)
+COMPRESSION_GZIP_LEVEL = config('COMPRESSION_GZIP_LEVEL', default=6, cast=int)
+COMPRESSION_GZIP_RANDOM_BYTES = config('COMPRESSION_GZIP_RANDOM_BYTES', default=100, cast=int)
+COMPRESSION_BROTLI_QUALITY = config('COMPRESSION_BROTLI_QUALITY', default=5, cast=int)
+COMPRESSION_CACHE = 'tiered'
+COMPRESSION_CACHE_TIMEOUT = config('COMPRESSION_CACHE_TIMEOUT', default=300, cast=int)
+
+# Request metrics (GET /metrics) and per-view query budgets
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+METRICS_SERVER_TIMING = config('METRICS_SERVER_TIMING', default=DEBUG, cast=bool)
+QUERY_BUDGET_DEFAULT = config('QUERY_BUDGET_DEFAULT', default=30, cast=int)
+QUERY_BUDGETS = {
+    # 'apps.blogs.views.BlogListView': 5,
+}
+
+# Request profiler: admins send X-Profile-Request; 1-in-N sampling (0 = off)
+PROFILER_SAMPLE_RATE = config('PROFILER_SAMPLE_RATE', default=0, cast=int)
+PROFILER_ENGINE = config('PROFILER_ENGINE', default='cprofile')  # cprofile or sampling; ASGI always samples
+PROFILER_SAMPLING_INTERVAL = 0.005  # seconds between stack samples
+PROFILER_MAX_PROFILES = config('PROFILER_MAX_PROFILES', default=50, cast=int)
+
+# Slow query log (GET /api/core/admin/slow-queries/)
+SLOW_QUERY_LOG = config('SLOW_QUERY_LOG', default=True, cast=bool)
+SLOW_QUERY_THRESHOLD_MS = config('SLOW_QUERY_THRESHOLD_MS', default=100, cast=int)
+# EXPLAIN costs a second run of the query's planning; off in production by default
+SLOW_QUERY_EXPLAIN = config('SLOW_QUERY_EXPLAIN', default=DEBUG, cast=bool)
+SLOW_QUERY_MAX_FINGERPRINTS = 200
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
@@ -136,6 +198,17 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 STATICFILES_DIRS = [BASE_DIR / 'static']
 STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 
+# Static snapshot of the public blog API (manage.py export_static_api).
+# With SERVE_STATIC_API, StaticAPIMiddleware answers /api/blogs/... from it
+# ahead of the live views; requests with a query string still reach them
+STATIC_API_ROOT = config('STATIC_API_ROOT', default=str(BASE_DIR / 'static_api'))
+SERVE_STATIC_API = config('SERVE_STATIC_API', default=False, cast=bool)
+if SERVE_STATIC_API:
+    MIDDLEWARE.insert(
+        MIDDLEWARE.index('apps.core.staticfiles.AsyncWhiteNoiseMiddleware') + 1,
+        'apps.blogs.middleware.StaticAPIMiddleware',
+    )
+
 # Media files
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
@@ -151,6 +224,16 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
+    # orjson when installed, else DRF's stdlib JSON (apps.core.renderers)
+    'DEFAULT_RENDERER_CLASSES': [
+        'apps.core.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'apps.core.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,
     'DEFAULT_FILTER_BACKENDS': [
@@ -159,22 +242,34 @@ REST_FRAMEWORK = {
         'rest_framework.filters.OrderingFilter',
     ],
     'DEFAULT_THROTTLE_CLASSES': [
-        'rest_framework.throttling.AnonRateThrottle',
-        'rest_framework.throttling.UserRateThrottle'
+        'apps.users.throttling.AnonSlidingWindowThrottle',
+        'apps.users.throttling.UserSlidingWindowThrottle',
+        'apps.users.throttling.ScopedSlidingWindowThrottle',
     ],
+    # Reverse proxies in front of the app; X-Forwarded-For is ignored at 0,
+    # so clients cannot pick the IP the per-IP throttles see
+    'NUM_PROXIES': config('NUM_PROXIES', default=0, cast=int),
     'DEFAULT_THROTTLE_RATES': {
         'anon': '100/hour',
-        'user': '1000/hour'
+        'user': '1000/hour',
+        'login': '10/minute',
+        'register': '5/hour',
+        'contact': '5/hour',
+        'comment': '30/hour',
     },
 }
 
+# Cache alias holding throttle counters (use a shared cache in production)
+THROTTLE_CACHE = 'default'
+
 # JWT Configuration
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=60),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=7),
     'ROTATE_REFRESH_TOKENS': True,
     'BLACKLIST_AFTER_ROTATION': True,
-    'UPDATE_LAST_LOGIN': True,
+    # Handled by User.update_last_login() so writes can be coalesced
+    'UPDATE_LAST_LOGIN': False,
     
     'ALGORITHM': 'HS256',
     'SIGNING_KEY': SECRET_KEY,
@@ -188,6 +283,26 @@ SIMPLE_JWT = {
     'TOKEN_TYPE_CLAIM': 'token_type',
 }
 
+# Bloom filter in front of JWT blacklist checks (requires a shared cache).
+# CAPACITY is the minimum size; rebuilds size it for twice the blacklisted rows
+JWT_BLACKLIST_FILTER = config('JWT_BLACKLIST_FILTER', default=not USE_LOCAL_CACHE, cast=bool)
+JWT_BLACKLIST_FILTER_CAPACITY = config('JWT_BLACKLIST_FILTER_CAPACITY', default=1000000, cast=int)
+JWT_BLACKLIST_SYNC_INTERVAL = 30  # seconds between incremental filter syncs
+JWT_BLACKLIST_REBUILD_INTERVAL = 600  # seconds between full filter rebuilds
+
+# Minimum seconds between last_login writes for the same user
+LAST_LOGIN_UPDATE_INTERVAL = config('LAST_LOGIN_UPDATE_INTERVAL', default=300, cast=int)
+
+# Async login (ASGI): password hashing pool and failed-attempt cache
+LOGIN_HASH_EXECUTOR = config('LOGIN_HASH_EXECUTOR', default='thread')  # thread or process
+LOGIN_HASH_WORKERS = config('LOGIN_HASH_WORKERS', default=0, cast=int)  # 0 = CPU count
+LOGIN_MAX_PENDING = config('LOGIN_MAX_PENDING', default=64, cast=int)
+LOGIN_FAILURE_CACHE_TTL = config('LOGIN_FAILURE_CACHE_TTL', default=300, cast=int)
+
+# Password hashing processes for manage.py import_users (defaults to CPU count);
+# imports through the admin API hash inline in a Celery worker
+BULK_IMPORT_WORKERS = config('BULK_IMPORT_WORKERS', default=0, cast=int)
+
 # CORS Configuration
 CORS_ALLOWED_ORIGINS = config(
     'CORS_ALLOWED_ORIGINS',
@@ -10,6 +10,8 @@ from rest_framework import permissions
 from drf_yasg.views import get_schema_view
 from drf_yasg import openapi
 
+from apps.core.views import metrics_view
+
 # API Documentation Schema
 schema_view = get_schema_view(
     openapi.Info(
@@ -40,6 +42,9 @@ urlpatterns = [
     # Admin
     path('admin/', admin.site.urls),
     
+    # Prometheus metrics
+    path('metrics', metrics_view, name='metrics'),
+    
     # API Documentation
     path('api/docs/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
     path('api/redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
@@ -49,6 +54,7 @@ urlpatterns = [
     path('api/users/', include('apps.users.urls.user_urls')),
     path('api/blogs/', include('apps.blogs.urls')),
     path('api/analytics/', include('apps.analytics.urls')),
+    path('api/core/', include('apps.core.urls')),
 ]
 
 # Serve media files in development